@@ -6,17 +6,42 @@ It uses Streamlit for the UI and integrates with the resume_builder module to cr
 
 import os
 import json
+import time
 from datetime import datetime
 import streamlit as st
 
-from utils.data_parser import extract_text_from_file
-from utils.llm import parse_json
+from utils.editing import edit_resume
+from utils.jobs import DONE, FAILED, JobQueue
+from utils.metrics import metrics, start_metrics_server
+from utils.pipeline import DEFAULT_LLM_CONCURRENCY, MIME_TYPES, OUTPUT_FORMATS, PARSE_MODES, convert_streaming
+from utils.results_archive import output_name, result_format, sync_batch_archive
+from utils.spool import spooled
 from config.prompts import PromptHolder
-from src.resume_builder import resume_builder
+from worker import start_workers
 
 
 st.set_page_config(page_title="Resume Standardization", page_icon="📄", layout="wide")
 
+# Optional Prometheus endpoint; the server is started once per process
+if os.getenv("RESUME_METRICS_PORT"):
+    start_metrics_server(int(os.getenv("RESUME_METRICS_PORT")))
+
+
+@st.cache_resource
+def get_job_queue():
+    """Queue shared by all sessions; local worker processes are started once per server process.
+
+    Set RESUME_EMBEDDED_WORKERS=0 when conversions are handled by separately started ``worker.py`` processes.
+    """
+    queue = JobQueue()
+    processes = int(os.getenv("RESUME_EMBEDDED_WORKERS", "1"))
+    if processes > 0:
+        start_workers(queue.path, processes=processes, threads=DEFAULT_LLM_CONCURRENCY)
+    return queue
+
+
+job_queue = get_job_queue()
+
 # Sidebar: configuration and flags
 with st.sidebar:
     st.header("Settings")
@@ -32,11 +57,42 @@ with st.sidebar:
         value=False,
         help="Optional extra pass to tune phrasing/conciseness",
     )
+    use_cache = st.toggle(
+        "Reuse cached extractions",
+        value=True,
+        help="Skip the LLM call for resumes that were already processed",
+    )
+    parse_mode = st.radio(
+        "Parsing mode",
+        PARSE_MODES,
+        format_func={
+            "full": "Single LLM call",
+            "sectioned": "Parallel sections (long resumes)",
+            "rules": "Rules first, LLM for the rest",
+        }.get,
+        help="Sectioned sends smaller concurrent requests; rules fills confident fields locally and may skip the LLM",
+    )
+    output_format = st.radio(
+        "Output format",
+        OUTPUT_FORMATS,
+        format_func=str.upper,
+        horizontal=True,
+        help="PDF draws the same layout directly, without a DOCX-to-PDF conversion",
+    )
+    stream_sections = st.toggle(
+        "Stream sections (single file)",
+        value=True,
+        help="Show each section as soon as the model produces it when converting one DOCX",
+    )
+    with st.expander("Pipeline metrics"):
+        st.json(metrics.snapshot())
+    with st.expander("Job queue"):
+        st.json(job_queue.counts())
 
 st.title("Resume Standardizer")
 
 st.markdown(
-    "Upload resume files in .pdf or .docx. The app extracts information, standardizes the structure, and produces a new .docx."
+    "Upload resume files in .pdf or .docx. The app extracts information, standardizes the structure, and produces a new .docx or .pdf."
 )
 
 # Uploads allow multiple resumes in a single run
@@ -55,7 +111,7 @@ extra_instructions = st.text_area(
 
 col_run, col_opts = st.columns([1, 3])
 with col_run:
-    run = st.button("Convert to Standardized DOCX", type="primary")
+    run = st.button(f"Convert to Standardized {output_format.upper()}", type="primary")
 
 if "latest_resume" not in st.session_state:
     st.session_state.latest_resume = None
@@ -65,35 +121,110 @@ if run:
         st.warning("Please upload at least one file.")
         st.stop()
 
+    # Uploads are passed as file objects and copied in chunks, never read into one more bytes copy each
     for file in uploaded_files:
-        with st.spinner(f"Processing {file.name}..."):
-            try:
-                file_bytes = file.read()
-                ext = os.path.splitext(file.name)[1].lower().lstrip('.')
-                
-                # Extract and parse
-                raw_text = extract_text_from_file(file_bytes, ext)
-                data = parse_json(PromptHolder.STRUCTURE_SCHEMA_PROMPT, raw_text)
-                
-                resume_bytes = resume_builder(data)
-                dt = datetime.now().strftime("%Y%m%d_%H%M%S")
-                out_name = f"standard_resume_{dt}.docx"
-
-                # Keep only the latest resume
-                st.session_state.latest_resume = {
-                    "file_name": out_name,
-                    "bytes": resume_bytes
-                }
-
-            except Exception as e:
-                st.exception(e)
-
-# Show only the latest download button
+        file.seek(0)
+    files = [(file.name, file) for file in uploaded_files]
+
+    # The section-by-section renderer writes DOCX; PDFs are rendered once the data is complete
+    if stream_sections and parse_mode == "full" and output_format == "docx" and len(files) == 1:
+        name, upload = files[0]
+        with st.status(f"Processing {name}...", expanded=True) as status, \
+                spooled(upload, suffix=os.path.splitext(name)[1]) as source:
+            def on_section(event):
+                label = event.section if event.index is None else f"{event.section} #{event.index + 1}"
+                status.write(f"Received {label}")
+
+            result = convert_streaming(
+                name,
+                source,
+                PromptHolder.STRUCTURE_SCHEMA_PROMPT,
+                on_section=on_section,
+                use_cache=use_cache,
+            )
+            status.update(label=f"Processed {name}", state="complete" if result.ok else "error")
+        if not result.ok:
+            st.error(f"Failed to process {result.file_name}")
+            st.exception(result.error)
+        else:
+            dt = datetime.now().strftime("%Y%m%d_%H%M%S")
+            st.session_state.latest_resume = {
+                "file_name": f"standard_resume_{dt}.docx",
+                "output_format": "docx",
+                "bytes": result.resume_bytes
+            }
+    else:
+        # Queued jobs keep running in the workers; the batch id in the URL survives a browser refresh
+        batch_id = job_queue.submit(files, parse_mode=parse_mode, use_cache=use_cache, output_format=output_format)
+        if st.session_state.get("batch_archive") is not None:
+            st.session_state.batch_archive.close()
+            st.session_state.batch_archive = None
+        st.session_state.batch_id = batch_id
+        st.query_params["batch"] = batch_id
+
+batch_id = st.session_state.get("batch_id") or st.query_params.get("batch")
+if batch_id:
+    jobs = job_queue.list_batch(batch_id)
+    finished = sum(job["status"] in (DONE, FAILED) for job in jobs)
+    st.progress(finished / len(jobs) if jobs else 1.0, text=f"{finished} of {len(jobs)} file(s) finished")
+    for job in jobs:
+        if job["status"] == DONE:
+            st.success(f"{job['file_name']}: done")
+        elif job["status"] == FAILED:
+            st.error(f"Failed to process {job['file_name']}: {job['error']}")
+            if st.button("Retry", key=f"retry_{job['id']}"):
+                job_queue.retry(job["id"])
+                st.rerun()
+        else:
+            st.info(f"{job['file_name']}: {job['status']} (attempt {max(job['attempts'], 1)})")
+
+    # Results are added to the archive as their jobs finish, so no more than one file is held at a time
+    archive = sync_batch_archive(job_queue, batch_id, st.session_state.get("batch_archive"))
+    st.session_state.batch_archive = archive
+    if finished < len(jobs):
+        time.sleep(1.0)
+        st.rerun()
+    elif len(jobs) == 1 and jobs[0]["status"] == DONE:
+        file_name, resume_bytes = job_queue.get_result(jobs[0]["id"])
+        result_ext = result_format(resume_bytes)
+        st.download_button(
+            label=f"Download {output_name(file_name, result_ext)}",
+            data=resume_bytes,
+            file_name=output_name(file_name, result_ext),
+            mime=MIME_TYPES[result_ext],
+        )
+        # Edits skip the LLM and re-render only the regions of the document whose data changed
+        with st.expander("Edit extracted data"):
+            data, _ = job_queue.get_data(jobs[0]["id"])
+            st.json(data, expanded=False)
+            patch_text = st.text_area(
+                "JSON patch (RFC 6902)",
+                value="[]",
+                help='e.g. [{"op": "replace", "path": "/experience/0/title", "value": "Staff Engineer"}]',
+                key=f"patch_{jobs[0]['id']}",
+            )
+            if st.button("Apply edit", key=f"apply_{jobs[0]['id']}"):
+                try:
+                    edit_resume(job_queue, jobs[0]["id"], json.loads(patch_text))
+                except (ValueError, KeyError) as e:
+                    st.error(f"Edit not applied: {e}")
+                else:
+                    st.rerun()
+    elif len(archive):
+        st.download_button(
+            label=f"Download all {len(archive)} resume(s) as .zip",
+            # download_button does not accept a SpooledTemporaryFile and reads file objects whole anyway
+            data=archive.finish().read(),
+            file_name=f"standard_resumes_{batch_id[:8]}.zip",
+            mime="application/zip",
+        )
+
+# Show the latest streamed conversion
 if st.session_state.latest_resume:
     res = st.session_state.latest_resume
     st.download_button(
         label=f"Download {res['file_name']}",
         data=res['bytes'],
         file_name=res['file_name'],
-        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        mime=MIME_TYPES[res['output_format']]
     )
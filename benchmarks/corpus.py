@@ -0,0 +1,162 @@
+"""
+Synthetic resume corpus for benchmarks.
+
+Generates deterministic structured resumes in a few shapes (short, long, many experience entries) and renders
+each one as a PDF and as a DOCX (plain or table-heavy layout), so extraction, parsing and rendering can be
+measured without real candidate data.
+"""
+
+
+import io
+import random
+from dataclasses import dataclass
+
+import fitz  # PyMuPDF
+from docx import Document
+
+FIRST_NAMES = ["Asha", "Ben", "Chen", "Diego", "Elena", "Farah", "Gopal", "Hana", "Ivan", "Jade", "Kofi", "Lena"]
+LAST_NAMES = ["Rao", "Smith", "Li", "Garcia", "Petrova", "Khan", "Iyer", "Sato", "Novak", "Brown", "Mensah"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+TITLES = ["Software Engineer", "Data Engineer", "Analytics Lead", "Platform Engineer", "ML Engineer", "Architect"]
+SKILLS = ["Python", "SQL", "Spark", "Airflow", "Docker", "Kubernetes", "AWS", "Azure", "Power BI", "Tableau",
+          "Go", "Java", "Terraform", "dbt", "Snowflake", "Kafka"]
+VERBS = ["Built", "Led", "Designed", "Migrated", "Optimized", "Automated", "Delivered", "Scaled"]
+OBJECTS = ["a streaming ingestion platform", "the reporting warehouse", "CI/CD pipelines", "customer dashboards",
+           "a feature store", "the billing service", "data quality checks", "an ML scoring API"]
+
+# name -> (experience entries, achievements per entry, layout)
+PROFILES = {
+    "short": (2, 3, "plain"),
+    "long": (6, 8, "plain"),
+    "many_entries": (15, 4, "plain"),
+    "table_heavy": (6, 5, "table"),
+}
+
+
+@dataclass
+class CorpusDocument:
+    name: str
+    profile: str
+    data: dict
+    pdf_bytes: bytes
+    docx_bytes: bytes
+
+
+def make_resume_data(rng, n_experience, n_achievements):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", ".")
+    experience = []
+    for i in range(n_experience):
+        start = 2024 - 2 * (i + 1)
+        experience.append({
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "location": "Remote",
+            "start_date": f"Jan {start}",
+            "end_date": "Present" if i == 0 else f"Dec {start + 1}",
+            "achievements": [
+                f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}, improving throughput by {rng.randint(5, 80)}%"
+                for _ in range(n_achievements)
+            ],
+        })
+    return {
+        "name": name,
+        "contact": {
+            "email": f"{handle}@example.com",
+            "phone": f"+1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+            "location": "Hyderabad, India",
+            "links": [f"https://www.linkedin.com/in/{handle.replace('.', '-')}"],
+        },
+        "summary": "Engineer with a track record of delivering data platforms and analytics products at scale.",
+        "experience": experience,
+        "education": [{
+            "degree": "B.Tech Computer Science",
+            "institution": "State University",
+            "location": "Hyderabad",
+            "start_date": "2010",
+            "end_date": "2014",
+            "gpa": None,
+        }],
+        "skills": {"technical": rng.sample(SKILLS, 6), "tools": rng.sample(SKILLS, 4), "soft": ["Leadership"]},
+        "certifications": ["AWS Certified Solutions Architect"],
+        "projects": [],
+        "awards": [],
+        "languages": ["English"],
+    }
+
+
+def resume_lines(data):
+    contact = data["contact"]
+    lines = [data["name"], f"{contact['email']} | {contact['phone']} | {contact['location']}"]
+    lines += contact["links"]
+    lines += ["", "SUMMARY", data["summary"], "", "EXPERIENCE"]
+    for exp in data["experience"]:
+        lines.append(f"{exp['title']} at {exp['company']} ({exp['start_date']} - {exp['end_date']})")
+        lines += [f"• {a}" for a in exp["achievements"]]
+    lines += ["", "EDUCATION"]
+    for edu in data["education"]:
+        lines.append(f"{edu['degree']}, {edu['institution']} ({edu['start_date']} - {edu['end_date']})")
+    lines += ["", "SKILLS", ", ".join(data["skills"]["technical"] + data["skills"]["tools"])]
+    lines += ["", "CERTIFICATIONS"] + data["certifications"]
+    return lines
+
+
+def render_pdf(data, lines_per_page=48):
+    lines = resume_lines(data)
+    doc = fitz.open()
+    for start in range(0, len(lines), lines_per_page):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, 560, 800), "\n".join(lines[start:start + lines_per_page]),
+                            fontsize=9)
+    out = doc.tobytes()
+    doc.close()
+    return out
+
+
+def render_docx(data, layout="plain"):
+    doc = Document()
+    if layout == "table":
+        # Two-column layout table: contact/skills on the left, experience on the right
+        table = doc.add_table(rows=2, cols=2)
+        left, right = table.cell(0, 0), table.cell(0, 1)
+        left.merge(table.cell(1, 0))
+        left.add_paragraph(data["name"])
+        left.add_paragraph(data["contact"]["email"])
+        left.add_paragraph(data["contact"]["phone"])
+        for skill in data["skills"]["technical"]:
+            left.add_paragraph(skill)
+        right.add_paragraph(data["summary"])
+        for exp in data["experience"]:
+            row = right.add_table(rows=1, cols=2)
+            row.cell(0, 0).text = f"{exp['title']} at {exp['company']}"
+            row.cell(0, 1).text = f"{exp['start_date']} - {exp['end_date']}"
+            for achievement in exp["achievements"]:
+                right.add_paragraph(achievement)
+        edu_cell = table.cell(1, 1)
+        for edu in data["education"]:
+            edu_cell.add_paragraph(f"{edu['degree']}, {edu['institution']}")
+    else:
+        for line in resume_lines(data):
+            doc.add_paragraph(line)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def build_corpus(n_docs=20, seed=7, profiles=None):
+    """Create ``n_docs`` synthetic resumes, cycling through the requested profiles."""
+    rng = random.Random(seed)
+    profiles = list(profiles or PROFILES)
+    corpus = []
+    for i in range(n_docs):
+        profile = profiles[i % len(profiles)]
+        n_experience, n_achievements, layout = PROFILES[profile]
+        data = make_resume_data(rng, n_experience, n_achievements)
+        corpus.append(CorpusDocument(
+            name=f"{profile}_{i:04d}",
+            profile=profile,
+            data=data,
+            pdf_bytes=render_pdf(data),
+            docx_bytes=render_docx(data, layout),
+        ))
+    return corpus
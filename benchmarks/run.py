@@ -0,0 +1,207 @@
+"""
+Benchmark harness for the resume pipeline.
+
+Times PDF extraction, DOCX extraction, parse_json (against the local FakeBackend), resume_builder, the
+direct-XML writer and the PDF renderer separately, plus the end-to-end batch pipeline, over a synthetic corpus. Reports throughput, p50/p95 latency and peak RSS,
+and can write JSON for comparing runs. The import stages time cold starts in fresh interpreters: importing the
+worker entry point, and importing it plus the worker warm-up. The render_xml stage also checks that every
+document it renders is structurally identical to the resume_builder output.
+
+Usage (from the repository root):
+    python -m benchmarks.run --docs 40 --output bench.json
+    python -m benchmarks.run --docs 40 --compare bench.json
+"""
+
+
+import argparse
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.corpus import PROFILES, build_corpus
+from config.prompts import PromptHolder
+from src.docx_writer import render_resume_xml, structural_diff
+from src.pdf_builder import render_resume_pdf
+from src.resume_builder import resume_builder
+from utils.data_parser import extract_text_from_docx, extract_text_from_pdf
+from utils.llm import parse_json, set_backend
+from utils.llm_backends import FakeBackend, rule_based_response
+from utils.pipeline import process_batch
+
+
+def peak_rss_mb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(samples, wall_seconds=None):
+    total = sum(samples)
+    wall = wall_seconds if wall_seconds is not None else total
+    return {
+        "count": len(samples),
+        "total_s": round(wall, 4),
+        "throughput_per_s": round(len(samples) / wall, 2) if wall else None,
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def time_each(fn, items, repeat=1):
+    samples = []
+    for _ in range(repeat):
+        for item in items:
+            start = time.perf_counter()
+            fn(item)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+# Statements timed in a fresh interpreter by the import stages
+IMPORT_STATEMENTS = {
+    "import_worker": "import worker",
+    "import_warm": "import worker; from utils.pipeline import warm_up; warm_up(llm=False)",
+}
+
+
+def time_cold_start(statement, repeat=5):
+    """Wall time of ``python -c statement`` minus an empty interpreter start, per run."""
+    def run(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, stderr=subprocess.DEVNULL)
+        return time.perf_counter() - start
+
+    baseline = min(run("pass") for _ in range(3))
+    return [max(0.0, run(statement) - baseline) for _ in range(repeat)]
+
+
+def make_backend(corpus, latency):
+    by_name = {doc.data["name"]: doc.data for doc in corpus}
+
+    def responder(system_prompt, content):
+        first_line = next((line.strip() for line in content.splitlines() if line.strip()), "")
+        return by_name.get(first_line) or rule_based_response(content)
+
+    return FakeBackend(responder=responder, latency=latency)
+
+
+STAGES = ("extract_pdf", "extract_docx", "parse_json", "render", "render_xml", "render_pdf", "end_to_end",
+          "import_worker", "import_warm")
+
+
+def run_benchmarks(n_docs=20, repeat=1, llm_latency=0.0, llm_concurrency=8, cpu_workers=0, stages=None):
+    stages = set(stages or STAGES)
+    corpus = build_corpus(n_docs)
+    backend = make_backend(corpus, llm_latency)
+    prompt = PromptHolder.STRUCTURE_SCHEMA_PROMPT
+    results = {}
+
+    if "extract_pdf" in stages:
+        results["extract_pdf"] = summarize(time_each(lambda d: extract_text_from_pdf(d.pdf_bytes), corpus, repeat))
+    if "extract_docx" in stages:
+        results["extract_docx"] = summarize(time_each(lambda d: extract_text_from_docx(d.docx_bytes), corpus, repeat))
+    if "parse_json" in stages:
+        texts = [extract_text_from_pdf(d.pdf_bytes) for d in corpus]
+        results["parse_json"] = summarize(time_each(
+            lambda text: parse_json(prompt, text, use_cache=False, backend=backend), texts, repeat))
+    if "render" in stages:
+        results["render"] = summarize(time_each(lambda d: resume_builder(d.data), corpus, repeat))
+    if "render_xml" in stages:
+        for d in corpus:
+            problems = structural_diff(resume_builder(d.data), render_resume_xml(d.data))
+            if problems:
+                raise RuntimeError(f"render_xml output differs from resume_builder for {d.name}: {problems[:3]}")
+        results["render_xml"] = summarize(time_each(lambda d: render_resume_xml(d.data), corpus, repeat))
+    if "render_pdf" in stages:
+        results["render_pdf"] = summarize(time_each(lambda d: render_resume_pdf(d.data), corpus, repeat))
+    if "end_to_end" in stages:
+        set_backend(backend)
+        files = [(f"{d.name}.pdf", d.pdf_bytes) for d in corpus]
+        samples = []
+        start = time.perf_counter()
+        for _ in range(repeat):
+            batch_start = time.perf_counter()
+            batch = process_batch(files, prompt, llm_concurrency=llm_concurrency, cpu_workers=cpu_workers,
+                                  use_cache=False)
+            failed = [r for r in batch if not r.ok]
+            if failed:
+                raise RuntimeError(f"{len(failed)} documents failed, first error: {failed[0].error!r}")
+            # Per-document latency is not observable inside the batch; report the amortized cost
+            samples.extend([(time.perf_counter() - batch_start) / len(files)] * len(files))
+        results["end_to_end"] = summarize(samples, wall_seconds=time.perf_counter() - start)
+    for stage, statement in IMPORT_STATEMENTS.items():
+        if stage in stages:
+            results[stage] = summarize(time_cold_start(statement, repeat=max(3, repeat)))
+
+    return {
+        "meta": {
+            "docs": n_docs,
+            "repeat": repeat,
+            "profiles": list(PROFILES),
+            "llm_latency_s": llm_latency,
+            "llm_concurrency": llm_concurrency,
+            "cpu_workers": cpu_workers,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "stages": results,
+    }
+
+
+def print_report(report, baseline=None):
+    header = f"{'stage':<14}{'docs/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'rss MB':>10}"
+    if baseline:
+        header += f"{'p50 vs base':>14}"
+    print(header)
+    for stage, stats in report["stages"].items():
+        line = (f"{stage:<14}{stats['throughput_per_s'] or 0:>10.1f}{stats['p50_ms']:>10.2f}"
+                f"{stats['p95_ms']:>10.2f}{stats['peak_rss_mb']:>10.1f}")
+        base = (baseline or {}).get("stages", {}).get(stage)
+        if base and base["p50_ms"]:
+            line += f"{(stats['p50_ms'] / base['p50_ms'] - 1) * 100:>+13.1f}%"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark extraction, LLM parsing and DOCX/PDF rendering.")
+    parser.add_argument("--docs", type=int, default=20, help="Number of synthetic resumes")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the corpus per stage")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated seconds per LLM call")
+    parser.add_argument("--llm-concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Process pool size for the end-to-end stage (0 = threads only)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES)
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    parser.add_argument("--compare", help="Baseline JSON report to compare p50 latency against")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.docs, args.repeat, args.llm_latency, args.llm_concurrency, args.workers,
+                            args.stages)
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
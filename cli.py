@@ -0,0 +1,203 @@
+"""
+Command-line entry point for converting resumes without the Streamlit UI.
+
+Example:
+    python cli.py "resumes/*.pdf" resumes/docx_batch --output-dir out --skip-existing --report out/run.jsonl
+    python cli.py resumes --zip standardized.zip --llm-concurrency 8
+    python cli.py resumes --output-dir out_pdf --format pdf
+"""
+
+
+import argparse
+import glob
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+import zipfile
+from collections import Counter
+
+from config.prompts import PromptHolder
+from utils.pipeline import DEFAULT_LLM_CONCURRENCY, OUTPUT_FORMATS, PARSE_MODES, process_batch
+from utils.metrics import metrics
+from utils.text_compactor import PROMPT_TOKEN_BUDGET
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+
+def collect_inputs(patterns):
+    """Expand directories and glob patterns into a sorted, de-duplicated list of resume paths."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, names in os.walk(pattern):
+                paths.extend(os.path.join(root, n) for n in names)
+        else:
+            paths.extend(glob.glob(pattern, recursive=True))
+    seen = set()
+    inputs = []
+    for path in sorted(paths):
+        key = os.path.abspath(path)
+        if key in seen or not path.lower().endswith(SUPPORTED_EXTENSIONS):
+            continue
+        seen.add(key)
+        inputs.append(path)
+    return inputs
+
+
+def _path_tag(path):
+    """Short stable hash of an input path, used to tell apart inputs with the same file name."""
+    return hashlib.sha1(os.path.normpath(path).encode("utf-8")).hexdigest()[:8]
+
+
+def assign_output_names(inputs, output_format="docx"):
+    """Map each input path to a deterministic, unique output file name so re-runs can skip finished work.
+
+    An input keeps its plain name (stem.docx) unless another input has the same stem. Colliding inputs are told
+    apart by their own extension, then by a short hash of their path, never by their position in the input list,
+    so adding or removing an input cannot hand an existing output name to a different input.
+    """
+    by_stem = {}
+    for path in inputs:
+        by_stem.setdefault(os.path.splitext(os.path.basename(path))[0], []).append(path)
+
+    names = {}
+    for stem, paths in by_stem.items():
+        if len(paths) == 1:
+            names[paths[0]] = f"{stem}.{output_format}"
+            continue
+        exts = Counter(os.path.splitext(path)[1].lstrip(".").lower() for path in paths)
+        for path in paths:
+            ext = os.path.splitext(path)[1].lstrip(".").lower()
+            suffix = ext if exts[ext] == 1 else f"{ext}_{_path_tag(path)}"
+            names[path] = f"{stem}_{suffix}.{output_format}"
+
+    # A suffixed name can equal another input's plain name ("cv.pdf" + "cv.docx" vs "cv_pdf.pdf")
+    counts = Counter(names.values())
+    for path, name in names.items():
+        if counts[name] > 1:
+            stem, ext = os.path.splitext(name)
+            names[path] = f"{stem}_{_path_tag(path)}{ext}"
+    return names
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Convert PDF/DOCX resumes into the standardized DOCX or PDF format.")
+    parser.add_argument("inputs", nargs="+", help="Files, directories or glob patterns of .pdf/.docx resumes")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--output-dir", help="Directory to write one .docx (or .pdf) per input")
+    target.add_argument("--zip", dest="zip_path", help="Write all outputs into a single zip archive")
+    parser.add_argument("--llm-concurrency", type=int, default=DEFAULT_LLM_CONCURRENCY,
+                        help="Maximum number of LLM calls in flight")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Process pool size for extraction/rendering (0 = threads only)")
+    parser.add_argument("--chunk-size", type=int, default=32,
+                        help="Number of files processed per batch")
+    parser.add_argument("--skip-existing", action="store_true",
+                        help="Skip inputs whose output already exists (resume an interrupted run)")
+    parser.add_argument("--token-budget", type=int, default=PROMPT_TOKEN_BUDGET,
+                        help="Trim extracted text to roughly this many tokens before the LLM call (0 = no limit)")
+    parser.add_argument("--parse-mode", choices=PARSE_MODES, default="full",
+                        help="full: one LLM call per resume; sectioned: parallel section-level calls for long "
+                             "resumes; rules: local extraction first, LLM only for low-confidence fields")
+    parser.add_argument("--format", dest="output_format", choices=OUTPUT_FORMATS, default="docx",
+                        help="File format of the standardized resumes")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the LLM, ignoring cached results")
+    parser.add_argument("--report", help="Append one JSON line per input to this file")
+    parser.add_argument("--metrics-json", help="Write per-stage timings and counters to this file at the end")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="Logging level; INFO emits one structured JSON record per pipeline stage")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print("No .pdf or .docx files matched.", file=sys.stderr)
+        return 1
+
+    names = assign_output_names(inputs, args.output_format)
+    archive = None
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        existing = set(os.listdir(args.output_dir))
+    else:
+        zip_dir = os.path.dirname(os.path.abspath(args.zip_path))
+        os.makedirs(zip_dir, exist_ok=True)
+        mode = "a" if args.skip_existing and os.path.exists(args.zip_path) else "w"
+        archive = zipfile.ZipFile(args.zip_path, mode, compression=zipfile.ZIP_DEFLATED)
+        existing = set(archive.namelist())
+
+    report = open(args.report, "a", encoding="utf-8") if args.report else None
+
+    def write_report(record):
+        if report is not None:
+            report.write(json.dumps(record, ensure_ascii=False) + "\n")
+            report.flush()
+
+    todo = []
+    for path in inputs:
+        if args.skip_existing and names[path] in existing:
+            write_report({"input": path, "output": names[path], "status": "skipped"})
+        else:
+            todo.append(path)
+
+    counts = {"ok": 0, "failed": 0, "skipped": len(inputs) - len(todo)}
+    started = time.perf_counter()
+    try:
+        for chunk in _chunks(todo, max(1, args.chunk_size)):
+            # Inputs are passed by path: extraction reads them from disk in the worker processes
+            results = process_batch(
+                [(path, path) for path in chunk],
+                PromptHolder.STRUCTURE_SCHEMA_PROMPT,
+                llm_concurrency=args.llm_concurrency,
+                cpu_workers=args.workers,
+                use_cache=not args.no_cache,
+                token_budget=args.token_budget,
+                parse_mode=args.parse_mode,
+                output_format=args.output_format,
+            )
+            for result in results:
+                name = names[result.file_name]
+                record = {"input": result.file_name, "output": name}
+                if result.compaction is not None:
+                    record["prompt"] = result.compaction.as_dict()
+                if result.ok:
+                    if archive is not None:
+                        archive.writestr(name, result.resume_bytes)
+                    else:
+                        with open(os.path.join(args.output_dir, name), "wb") as f:
+                            f.write(result.resume_bytes)
+                    counts["ok"] += 1
+                    record["status"] = "ok"
+                else:
+                    counts["failed"] += 1
+                    record["status"] = "failed"
+                    record["error"] = repr(result.error)
+                    print(f"FAILED {result.file_name}: {result.error!r}", file=sys.stderr)
+                write_report(record)
+    finally:
+        if archive is not None:
+            archive.close()
+        if report is not None:
+            report.close()
+
+    elapsed = time.perf_counter() - started
+    if args.metrics_json:
+        with open(args.metrics_json, "w", encoding="utf-8") as f:
+            json.dump(metrics.snapshot(), f, indent=2)
+    print(f"Converted {counts['ok']}, failed {counts['failed']}, skipped {counts['skipped']} in {elapsed:.1f}s")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
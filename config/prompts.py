@@ -23,3 +23,95 @@ class PromptHolder:
     - Preserve original wording where possible; do minor normalization only.
     - Dates may be free-form (e.g., "Jan 2021", "Present").
     """
+
+    # Section-level prompts used when a long resume is split and parsed in parallel
+    # (see utils.sectioning). Each one returns a subset of the STRUCTURE_SCHEMA_PROMPT keys.
+    HEADER_SECTION_PROMPT : str = """
+    The text below is the top of a resume (name, contact details and summary).
+    Return a strict JSON object with these fields ONLY:
+    - name: string
+    - contact: { email: string|null, phone: string|null, location: string|null, links: string[] }
+    - summary: string|null
+    Constraints:
+    - Output ONLY a single JSON object. No prose, no markdown, no code fences.
+    - If a value is unknown, use null (for scalars) or [] (for arrays). Do NOT fabricate.
+    - contact.links must be fully-qualified URLs when present. Strip trailing punctuation.
+    """
+
+    EXPERIENCE_SECTION_PROMPT : str = """
+    The text below is the work experience section of a resume.
+    Return a strict JSON object with this field ONLY:
+    - experience: [ { title: string, company: string|null, location: string|null, start_date: string|null, end_date: string|null, achievements: string[] } ]
+    Constraints:
+    - Output ONLY a single JSON object. No prose, no markdown, no code fences.
+    - If a value is unknown, use null (for scalars) or [] (for arrays). Do NOT fabricate.
+    - Preserve original wording where possible; do minor normalization only.
+    - Dates may be free-form (e.g., "Jan 2021", "Present").
+    """
+
+    EDUCATION_SECTION_PROMPT : str = """
+    The text below is the education section of a resume.
+    Return a strict JSON object with this field ONLY:
+    - education: [ { degree: string|null, institution: string|null, location: string|null, start_date: string|null, end_date: string|null, gpa: string|null } ]
+    Constraints:
+    - Output ONLY a single JSON object. No prose, no markdown, no code fences.
+    - If a value is unknown, use null (for scalars) or [] (for arrays). Do NOT fabricate.
+    """
+
+    SKILLS_SECTION_PROMPT : str = """
+    The text below is the skills section of a resume.
+    Return a strict JSON object with this field ONLY:
+    - skills: { technical: string[], tools: string[], soft: string[] }
+    Constraints:
+    - Output ONLY a single JSON object. No prose, no markdown, no code fences.
+    - Use [] for empty categories. Do NOT fabricate.
+    """
+
+    PROJECTS_SECTION_PROMPT : str = """
+    The text below is the projects section of a resume.
+    Return a strict JSON object with this field ONLY:
+    - projects: [ { name: string, description: string, technologies: string[] } ]
+    Constraints:
+    - Output ONLY a single JSON object. No prose, no markdown, no code fences.
+    - Preserve original wording where possible; do minor normalization only. Do NOT fabricate.
+    """
+
+    LISTS_SECTION_PROMPT : str = """
+    The text below contains the remaining sections of a resume (certifications, awards, languages and similar).
+    Return a strict JSON object with these fields ONLY:
+    - certifications: string[]
+    - awards: string[]
+    - languages: string[]
+    Constraints:
+    - Output ONLY a single JSON object. No prose, no markdown, no code fences.
+    - Use [] when a list has no entries. Do NOT fabricate.
+    """
+
+    # Used by utils.pre_extractor to ask only for the fields the local rules could not fill.
+    # {fields} is replaced with the matching lines of FIELD_SCHEMAS.
+    PARTIAL_SCHEMA_PROMPT : str = """
+    Return a strict JSON object with these fields ONLY (no additional keys anywhere):
+    {fields}
+    Constraints:
+    - Output ONLY a single JSON object. No prose, no markdown, no code fences.
+    - If a value is unknown, use null (for scalars) or [] (for arrays). Do NOT fabricate.
+    - Use only the keys shown above; do NOT add other keys or nested structures.
+    - contact.links must be fully-qualified URLs when present. Strip trailing punctuation.
+    - Preserve original wording where possible; do minor normalization only.
+    - Dates may be free-form (e.g., "Jan 2021", "Present").
+    """
+
+
+# One schema line per top-level key, matching STRUCTURE_SCHEMA_PROMPT
+FIELD_SCHEMAS = {
+    "name": "- name: string",
+    "contact": "- contact: { email: string|null, phone: string|null, location: string|null, links: string[] }",
+    "summary": "- summary: string|null",
+    "experience": "- experience: [ { title: string, company: string|null, location: string|null, start_date: string|null, end_date: string|null, achievements: string[] } ]",
+    "education": "- education: [ { degree: string|null, institution: string|null, location: string|null, start_date: string|null, end_date: string|null, gpa: string|null } ]",
+    "skills": "- skills: { technical: string[], tools: string[], soft: string[] }",
+    "certifications": "- certifications: string[]",
+    "projects": "- projects: [ { name: string, description: string, technologies: string[] } ]",
+    "awards": "- awards: string[]",
+    "languages": "- languages: string[]",
+}
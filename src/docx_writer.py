@@ -0,0 +1,434 @@
+"""
+Direct-XML DOCX writer for high-volume rendering.
+
+Renders the same standardized layout as src.resume_builder without going through python-docx's paragraph,
+run and table proxies. document.xml is assembled from string templates and packed, together with the
+skeleton's other (static, pre-compressed) parts, into a zip container written here. The templates are
+captured once per process from the python-docx skeleton, so both renderers share one layout definition.
+structural_diff() compares the output of the two renderers part by part.
+
+document.xml is made of independently rendered REGIONS (sidebar, profile box, first-page experience, later
+pages). IncrementalDocument keeps them, so an edit re-renders only the regions whose data changed.
+"""
+
+
+import io
+import logging
+import re
+import struct
+import zipfile
+import zlib
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from lxml import etree
+
+from src import resume_builder as rb
+from utils.xml_helpers import (
+    BULLET_INDENT,
+    EXPERIENCE_COMPANY_RUN,
+    EXPERIENCE_DATE_PARAGRAPH,
+    EXPERIENCE_DATE_RUN,
+    EXPERIENCE_TITLE_PARAGRAPH,
+    EXPERIENCE_TITLE_RUN,
+    HEADER_SPACE_AFTER,
+    SEPARATOR_PARAGRAPH,
+    SEPARATOR_RUN,
+    add_experience_table,
+    bullet_format,
+    bullet_style_name,
+    character_style_name,
+    header_run_format,
+    paragraph_properties,
+    run_properties,
+    separator_text,
+    style_id,
+)
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_PART = "word/document.xml"
+_SLOT = "slot"
+_SLOT_XML = f"<!--{_SLOT}-->"
+_XML_DECLARATION = "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+_NS_DECLARATION_RE = re.compile(r'\s+xmlns:\w+="[^"]*"')
+# Characters lxml refuses in text; python-docx raises ValueError for them, and so does this writer
+_INVALID_XML_CHARS_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+_RUN_BREAK_RE = re.compile(r"(\t|\r|\n)")
+
+# Zip record layouts (no zip64: a resume package is far below 4 GiB)
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_OF_CENTRAL_DIR = struct.Struct("<IHHHHIIH")
+_DOS_DATE = (1 << 5) | 1  # 1980-01-01: fixed timestamps keep the output deterministic
+
+
+def _fragment_xml(element):
+    """Serialize a non-root element without the namespace declarations lxml repeats on it."""
+    xml = etree.tostring(element, encoding="unicode")
+    end = xml.index(">")
+    return _NS_DECLARATION_RE.sub("", xml[:end]) + xml[end:]
+
+
+def _children_xml(parent, start):
+    return "".join(_fragment_xml(child) for child in parent[start:])
+
+
+def _mark(cell):
+    cell._tc.append(etree.Comment(_SLOT))
+
+
+class _Templates:
+    """Layout scaffolding captured from python-docx, split at the points where content goes."""
+
+    def __init__(self):
+        # Page skeleton: content slots at the end of the sidebar, profile and experience cells and the body
+        layout = rb.ResumeLayout()
+        for cell in (layout.blue_sidebar_cell, layout.profile_container_cell, layout.experience_container_cell):
+            _mark(cell)
+        body = layout.doc.element.body
+        body.sectPr.addprevious(etree.Comment(_SLOT))
+        xml = etree.tostring(layout.doc.element, encoding="unicode")
+        self.document = xml.split(_SLOT_XML)
+        sect_pr = _fragment_xml(body.sectPr)
+
+        scratch = rb.ResumeLayout()
+        container = scratch.profile_container_cell._tc
+        start = len(container)
+        _mark(rb.add_profile_box(scratch))
+        self.profile_box = _children_xml(container, start).split(_SLOT_XML)
+
+        container = scratch.experience_container_cell._tc
+        start = len(container)
+        experience_cell = rb.add_experience_box(scratch)
+        _mark(experience_cell)
+        self.experience_box = _children_xml(container, start).split(_SLOT_XML)
+        self.first_entry = self._entry_table(experience_cell)
+
+        body = scratch.doc.element.body
+        start = body.index(body.sectPr)
+        page2_cell = rb.add_page2_container(scratch)
+        self.page2_entry = self._entry_table(page2_cell)
+        _mark(page2_cell)
+        self.page2 = "".join(_fragment_xml(child) for child in body[start:body.index(body.sectPr)]).split(_SLOT_XML)
+        # The page-2 container narrows the left margin of the (only) section
+        self.page2_tail = self.document[-1].replace(sect_pr, _fragment_xml(body.sectPr), 1)
+
+        self.package = _static_entries()
+
+    @staticmethod
+    def _entry_table(cell):
+        start = len(cell._tc)
+        title_cell, date_cell = add_experience_table(cell)
+        _mark(title_cell)
+        _mark(date_cell)
+        xml = _children_xml(cell._tc, start)
+        # Drop the capture from the scratch document so later captures start clean
+        for child in cell._tc[start:]:
+            cell._tc.remove(child)
+        return xml.split(_SLOT_XML)
+
+
+def _deflate(data):
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _zip_entry(name, data):
+    return name.encode("utf-8"), zlib.crc32(data), len(data), _deflate(data)
+
+
+def _static_entries():
+    """Compressed entries of every skeleton part except document.xml, in python-docx's order (None marks it)."""
+    saved = rb.ResumeLayout().to_bytes()
+    entries = []
+    with zipfile.ZipFile(io.BytesIO(saved)) as package:
+        for name in package.namelist():
+            entries.append(None if name == DOCUMENT_PART else _zip_entry(name, package.read(name)))
+    return entries
+
+
+def _write_zip(entries):
+    out, central, offset = [], [], 0
+    for name, crc, size, data in entries:
+        local = _LOCAL_HEADER.pack(0x04034B50, 20, 0, zipfile.ZIP_DEFLATED, 0, _DOS_DATE, crc, len(data), size,
+                                   len(name), 0) + name
+        central.append(_CENTRAL_HEADER.pack(0x02014B50, 20, 20, 0, zipfile.ZIP_DEFLATED, 0, _DOS_DATE, crc,
+                                            len(data), size, len(name), 0, 0, 0, 0, 0, offset) + name)
+        out.append(local)
+        out.append(data)
+        offset += len(local) + len(data)
+    directory = b"".join(central)
+    out.append(directory)
+    out.append(_END_OF_CENTRAL_DIR.pack(0x06054B50, 0, 0, len(entries), len(entries), len(directory), offset, 0))
+    return b"".join(out)
+
+
+@lru_cache(maxsize=1)
+def _templates():
+    return _Templates()
+
+
+@lru_cache(maxsize=None)
+def _character_style(**run_format):
+    return style_id(character_style_name(**run_format))
+
+
+@lru_cache(maxsize=None)
+def _bullet_style(**run_format):
+    return style_id(bullet_style_name(**run_format))
+
+
+@lru_cache(maxsize=None)
+def _ppr_xml(**paragraph_format):
+    return _fragment_xml(paragraph_properties(**paragraph_format))
+
+
+@lru_cache(maxsize=None)
+def _rpr_xml(sid):
+    return _fragment_xml(run_properties(sid))
+
+
+def _text_xml(text):
+    if _INVALID_XML_CHARS_RE.search(text):
+        raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+    parts = []
+    # Same mapping as python-docx's run.text: tabs and line breaks become elements between w:t pieces
+    for piece in _RUN_BREAK_RE.split(text):
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in ("\r", "\n"):
+            parts.append("<w:br/>")
+        elif piece:
+            preserve = ' xml:space="preserve"' if len(piece.strip()) < len(piece) else ""
+            parts.append(f"<w:t{preserve}>{escape(piece)}</w:t>")
+    return "".join(parts)
+
+
+def _paragraph(runs=(), **paragraph_format):
+    """XML string equivalent of xml_helpers.add_styled_paragraph."""
+    parts = [_ppr_xml(**paragraph_format)] if paragraph_format else []
+    for text, sid in runs:
+        content = (_rpr_xml(sid) if sid else "") + (_text_xml(text) if text else "")
+        parts.append(f"<w:r>{content}</w:r>" if content else "<w:r/>")
+    return f"<w:p>{''.join(parts)}</w:p>" if parts else "<w:p/>"
+
+
+def _header(text, color, size, is_bold=True, align=WD_ALIGN_PARAGRAPH.LEFT, font_name="Aptos"):
+    sid = _character_style(**header_run_format(color, size, is_bold, font_name))
+    return _paragraph([(text.upper(), sid)], align=align, space_after=HEADER_SPACE_AFTER)
+
+
+def _separator():
+    return _paragraph([(separator_text(), _character_style(**SEPARATOR_RUN))], **SEPARATOR_PARAGRAPH)
+
+
+def _bullets(items, sid, indent):
+    return [_paragraph([(item, None)], style_id=sid, left_indent=indent) for item in items]
+
+
+def _sidebar(json_data):
+    contact_info = json_data.get("contact", {})
+    out = [
+        _paragraph([(json_data.get("name", "").upper(), _character_style(**rb.NAME_RUN))], **rb.NAME_PARAGRAPH),
+        _paragraph([("✉️ ", _character_style(**rb.EMAIL_ICON_RUN)),
+                    (contact_info.get("email", ""), _character_style(**rb.EMAIL_RUN))], **rb.EMAIL_PARAGRAPH),
+        _separator(),
+        _header("EDUCATION", **rb.SIDEBAR_HEADER),
+    ]
+    edu_style = _character_style(**rb.EDUCATION_RUN)
+    for edu in json_data.get("education", []):
+        out.append(_paragraph([(line, edu_style) for line in rb.education_lines(edu)], **rb.EDUCATION_PARAGRAPH))
+    out.append(_separator())
+
+    skills_data = json_data.get("skills", {})
+    out.append(_header("SKILLS", **rb.SIDEBAR_HEADER))
+    all_skills = skills_data.get("technical", []) + skills_data.get("tools", [])
+    out.extend(_bullets(all_skills[:rb.MAX_SKILLS], _bullet_style(**rb.SKILL_BULLET), rb.SKILL_INDENT))
+    out.append(_paragraph(**rb.SKILLS_END_PARAGRAPH))
+    out.append(_separator())
+
+    certifications = json_data.get("certifications")
+    if certifications:
+        out.append(_header("CERTIFICATIONS", **rb.SIDEBAR_HEADER))
+        cert_style = _character_style(**rb.CERTIFICATION_RUN)
+        out.extend(_paragraph([(cert, cert_style)], **rb.CERTIFICATION_PARAGRAPH) for cert in certifications)
+    return out
+
+
+def _experience_entry(template, exp):
+    opening, middle, closing = template
+    title_runs = [(f'{exp.get("title", "")}', _character_style(**EXPERIENCE_TITLE_RUN)),
+                  (f' at {exp.get("company", "")}', _character_style(**EXPERIENCE_COMPANY_RUN))]
+    date_run = (f'({exp.get("start_date", "")} - {exp.get("end_date", "")})',
+                _character_style(**EXPERIENCE_DATE_RUN))
+    items = [item.replace("\n", " ") for item in exp.get("achievements", [])]
+    return [
+        opening,
+        _paragraph(title_runs, **EXPERIENCE_TITLE_PARAGRAPH),
+        middle,
+        _paragraph([date_run], **EXPERIENCE_DATE_PARAGRAPH),
+        closing,
+        *_bullets(items, _bullet_style(**bullet_format()), BULLET_INDENT),
+    ]
+
+
+def _profile_region(json_data):
+    t = _templates()
+    profile_text = json_data.get("profile") or json_data.get("summary") or rb.DEFAULT_PROFILE
+    return "".join([t.profile_box[0], _paragraph([(profile_text, _character_style(**rb.PROFILE_RUN))],
+                                                 **rb.PROFILE_PARAGRAPH), t.profile_box[1]])
+
+
+def _first_experience_region(json_data):
+    t = _templates()
+    experience_list = json_data.get("experience", [])
+    if not experience_list:
+        return ""
+    return "".join([t.experience_box[0], *_experience_entry(t.first_entry, experience_list[0]),
+                    t.experience_box[1]])
+
+
+def _more_experience_region(json_data):
+    t = _templates()
+    experience_list = json_data.get("experience", [])
+    if not experience_list[1:]:
+        return ""
+    out = [t.page2[0]]
+    for exp in experience_list[1:]:
+        out.extend(_experience_entry(t.page2_entry, exp))
+    out.append(t.page2[1])
+    return "".join(out)
+
+
+# Independently rendered parts of document.xml, in document order
+REGIONS = {
+    "sidebar": lambda json_data: "".join(_sidebar(json_data)),
+    "profile": _profile_region,
+    "first_experience": _first_experience_region,
+    "more_experience": _more_experience_region,
+}
+
+
+def region_inputs(json_data):
+    """The values each region is rendered from; a region only changes when its inputs do."""
+    experience_list = json_data.get("experience", [])
+    skills_data = json_data.get("skills", {})
+    return {
+        "sidebar": (json_data.get("name", ""), json_data.get("contact", {}).get("email", ""),
+                    json_data.get("education", []),
+                    (skills_data.get("technical", []) + skills_data.get("tools", []))[:rb.MAX_SKILLS],
+                    json_data.get("certifications")),
+        "profile": json_data.get("profile") or json_data.get("summary"),
+        "first_experience": experience_list[:1],
+        "more_experience": experience_list[1:],
+    }
+
+
+def changed_regions(old_data, new_data):
+    """Names of the REGIONS whose inputs differ between two versions of the resume data."""
+    old, new = region_inputs(old_data), region_inputs(new_data)
+    return [name for name in REGIONS if old[name] != new[name]]
+
+
+def _assemble(regions):
+    t = _templates()
+    head, after_sidebar, after_profile, after_experience, tail = t.document
+    if regions["more_experience"]:
+        tail = t.page2_tail
+    return "".join([head, regions["sidebar"], after_sidebar, regions["profile"], after_profile,
+                    regions["first_experience"], after_experience, regions["more_experience"], tail])
+
+
+def render_document_xml(json_data):
+    """document.xml of the standardized resume for ``json_data``, as a str."""
+    return _assemble({name: render(json_data) for name, render in REGIONS.items()})
+
+
+def _package(document_xml):
+    document = (_XML_DECLARATION + document_xml).encode("utf-8")
+    entries = [entry or _zip_entry(DOCUMENT_PART, document) for entry in _templates().package]
+    return _write_zip(entries)
+
+
+def render_resume_xml(json_data):
+    """Drop-in replacement for resume_builder(json_data): the same layout, written without python-docx.
+
+    Returns
+    - bytes: The DOCX file
+    """
+    docx_bytes = _package(render_document_xml(json_data))
+    logger.debug("Resume document for %r has been created.", json_data.get("name"))
+    return docx_bytes
+
+
+class IncrementalDocument:
+    """A rendered resume that keeps its regions, so an edit only re-renders the regions whose data changed.
+
+    Parameters
+    - json_data: Resume data of the initial render
+    """
+
+    def __init__(self, json_data):
+        self.data = json_data
+        self.regions = {name: render(json_data) for name, render in REGIONS.items()}
+
+    def update(self, json_data):
+        """Switch to new resume data, re-rendering the changed regions only.
+
+        Returns
+        - list[str]: The names of the re-rendered regions
+        """
+        changed = changed_regions(self.data, json_data)
+        for name in changed:
+            self.regions[name] = REGIONS[name](json_data)
+        self.data = json_data
+        return changed
+
+    def to_bytes(self):
+        """The DOCX file for the current data."""
+        return _package(_assemble(self.regions))
+
+
+def warm_up():
+    """Capture the templates and compress the static parts ahead of the first render."""
+    _templates()
+
+
+def _canonical(data):
+    return etree.tostring(etree.fromstring(data), method="c14n")
+
+
+def _first_difference(expected, actual):
+    a, b = etree.fromstring(expected), etree.fromstring(actual)
+    for x, y in zip(a.iter(), b.iter()):
+        if (x.tag, x.text, x.tail, dict(x.attrib)) != (y.tag, y.text, y.tail, dict(y.attrib)) or len(x) != len(y):
+            return a.getroottree().getpath(x)
+    return "element count"
+
+
+def structural_diff(expected, actual):
+    """Compare two DOCX packages part by part; XML parts are compared in canonical form.
+
+    Returns
+    - list[str]: Human-readable differences; empty when the packages are equivalent
+    """
+    problems = []
+    with zipfile.ZipFile(io.BytesIO(expected)) as a, zipfile.ZipFile(io.BytesIO(actual)) as b:
+        bad = b.testzip()
+        if bad is not None:
+            problems.append(f"corrupt member {bad}")
+        names_a, names_b = set(a.namelist()), set(b.namelist())
+        problems.extend(f"missing part {name}" for name in sorted(names_a - names_b))
+        problems.extend(f"unexpected part {name}" for name in sorted(names_b - names_a))
+        for name in sorted(names_a & names_b):
+            data_a, data_b = a.read(name), b.read(name)
+            if data_a == data_b:
+                continue
+            if name.endswith((".xml", ".rels")):
+                if _canonical(data_a) != _canonical(data_b):
+                    problems.append(f"{name} differs at {_first_difference(data_a, data_b)}")
+            else:
+                problems.append(f"{name} differs")
+    return problems
@@ -0,0 +1,610 @@
+"""
+PDF rendering of the standardized resume.
+
+Draws the layout of src.resume_builder (logo and blue sidebar, PROFILE box, bordered PROFESSIONAL EXPERIENCE
+boxes) directly with PyMuPDF, so a PDF does not need a DOCX-to-PDF conversion through an office suite. Fonts,
+sizes, colors and spacing come from the format constants the DOCX renderers share, and the geometry follows the
+skeleton's table layout (Word's default cell padding, line spacing and paragraph spacing included). Aptos and
+Roboto are drawn with the built-in Helvetica family, whose glyph widths are tabulated once per process.
+
+The logo and the font resources live in a template built once per process and copied into every document, and
+text is written straight into the page content streams. A run with characters outside the WinAnsi encoding of
+the built-in fonts is drawn whole through a TextWriter with embedded, subsetted fonts, in its place in the content
+stream order, so text extraction reads it in sequence. The e-mail icon is marked as an artifact with an empty
+ActualText, which keeps it out of the extracted text.
+"""
+
+
+import logging
+import os
+import re
+import threading
+from collections import namedtuple
+from functools import lru_cache
+
+import fitz  # PyMuPDF
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Inches, Length
+
+from src import resume_builder as rb
+from utils.xml_helpers import (
+    BULLET_INDENT,
+    EXPERIENCE_COMPANY_RUN,
+    EXPERIENCE_DATE_PARAGRAPH,
+    EXPERIENCE_DATE_RUN,
+    EXPERIENCE_TITLE_PARAGRAPH,
+    EXPERIENCE_TITLE_RUN,
+    HEADER_SPACE_AFTER,
+    SEPARATOR_PARAGRAPH,
+    SEPARATOR_RUN,
+    bullet_format,
+    header_run_format,
+    separator_text,
+)
+
+logger = logging.getLogger(__name__)
+
+# Page geometry of the skeleton (US Letter, see resume_builder._build_skeleton), in points
+PAGE_WIDTH = Inches(8.5).pt
+PAGE_HEIGHT = Inches(11).pt
+TOP_MARGIN = BOTTOM_MARGIN = Inches(0.5).pt
+SIDE_MARGIN = Inches(0.25).pt
+# add_page2_container() widens the left margin of the (single) section, which moves page 1 as well
+PAGE2_LEFT_MARGIN = Inches(0.35).pt
+SIDEBAR_WIDTH = Inches(2.4).pt
+SPACER_WIDTH = Inches(0.15).pt
+MAIN_WIDTH = Inches(5.2).pt
+EXPERIENCE_TABLE_WIDTHS = (Inches(3.5).pt, Inches(2.5).pt)
+PAGE2_BOX_PADDING = (5, 8, 5, 8)
+PROFILE_BOX_PADDING = (5, 5, 5, 5)
+EXPERIENCE_BOX_PADDING = (0, 5, 0, 0)
+BOX_BORDER_WIDTH = 1
+
+# Word defaults of the python-docx template: 11pt text, 10pt after each paragraph, 1.15 line spacing, 0.075in
+# left/right cell padding and a 0.25in hanging indent for List Bullet
+DEFAULT_SIZE = 11
+DEFAULT_SPACE_AFTER = 10
+LINE_SPACING = 1.15
+LINE_HEIGHT = 1.2
+DESCENT = 0.25
+CELL_PADDING = Inches(0.075).pt
+HANGING_INDENT = Inches(0.25).pt
+BULLET = "•"
+TAB_STOP = Inches(0.5).pt
+UNDERLINE_OFFSET = 0.12
+UNDERLINE_WIDTH = 0.06
+
+# Built-in (not embedded) fonts by (bold, italic), plus ZapfDingbats for the e-mail icon
+_FONTS = {(False, False): "helv", (True, False): "hebo", (False, True): "heit", (True, True): "hebi"}
+_DINGBATS = {"✉": ")"}
+_DINGBAT_FONT = "zadb"
+_ARTIFACT = "/Artifact <</ActualText ()>> BDC {} EMC"
+# Fonts tried, after the run's own Helvetica variant, for characters the built-in encoding lacks
+_FALLBACK_FONTS = ("cjk", "symb")
+_WINANSI = frozenset(bytes(range(0x20, 0x100)).decode("cp1252", errors="ignore")) - {"\x7f", "\xa0", "\xad"}
+_TOKEN_RE = re.compile(r"[\r\n]|[^\S\r\n]+|\S+")
+_PDF_STRING_ESCAPES = str.maketrans({"\\": "\\\\", "(": "\\(", ")": "\\)"})
+
+_template_lock = threading.Lock()
+
+RunStyle = namedtuple("RunStyle", "font size color underline")
+
+
+def _pt(value, default=0.0):
+    if value is None:
+        return default
+    return value.pt if isinstance(value, Length) else float(value)
+
+
+@lru_cache(maxsize=None)
+def _color_op(color, op):
+    r, g, b = (0, 0, 0) if color is None else color
+    return f"{r / 255:.3g} {g / 255:.3g} {b / 255:.3g} {op}"
+
+
+@lru_cache(maxsize=None)
+def run_style(font_name=None, size=None, color=None, bold=False, italic=False, underline=False):
+    """Map a character_style() format to the font, size, color and underline the PDF is drawn with."""
+    return RunStyle(_FONTS[bool(bold), bool(italic)], size or DEFAULT_SIZE, color, bool(underline))
+
+
+def _bullet_run(font_name='Roboto', size=None, color=None, space_before=0, space_after=0):
+    return run_style(font_name, size, color), dict(space_before=space_before, space_after=space_after)
+
+
+@lru_cache(maxsize=None)
+def _font(name):
+    return fitz.Font(name)
+
+
+@lru_cache(maxsize=None)
+def _glyph_widths(font):
+    """Advance widths (in em) of every WinAnsi character in the built-in ``font``."""
+    glyphs = _font(font)
+    return {char: glyphs.glyph_advance(ord(char)) for char in _WINANSI}
+
+
+@lru_cache(maxsize=None)
+def _fallback_font(char, font):
+    for name in (font, *_FALLBACK_FONTS):
+        if _font(name).has_glyph(ord(char)):
+            return name
+    return None
+
+
+@lru_cache(maxsize=16384)
+def _segments(text, font):
+    """Split ``text`` into (font, native, text, em width) pieces.
+
+    Native pieces are encoded for the page's built-in fonts; the others go through a TextWriter. Characters no
+    font has a glyph for (e.g. emoji variation selectors) are dropped.
+    """
+    widths = _glyph_widths(font)
+    pieces = []
+    for char in text:
+        if char in widths:
+            piece = [font, True, char, widths[char]]
+        elif char in _DINGBATS:
+            piece = [_DINGBAT_FONT, True, _DINGBATS[char], _font(_DINGBAT_FONT).glyph_advance(ord(char))]
+        else:
+            fallback = _fallback_font(char, font)
+            if fallback is None:
+                continue
+            piece = [fallback, False, char, _font(fallback).glyph_advance(ord(char))]
+        if pieces and pieces[-1][:2] == piece[:2]:
+            pieces[-1][2] += piece[2]
+            pieces[-1][3] += piece[3]
+        else:
+            pieces.append(piece)
+    return tuple(tuple(piece) for piece in pieces)
+
+
+@lru_cache(maxsize=16384)
+def _em_width(text, font):
+    return sum(piece[3] for piece in _segments(text, font))
+
+
+def text_width(text, style):
+    """Width of ``text`` drawn in RunStyle ``style``, in points."""
+    return _em_width(text, style.font) * style.size
+
+
+def _line_height(size):
+    return size * LINE_HEIGHT * LINE_SPACING
+
+
+@lru_cache(maxsize=1024)
+def _split_word(word, style, width):
+    """Break a word wider than ``width`` between characters, as Word does; returns (chunk, width) pairs."""
+    chunks, chunk, chunk_width = [], "", 0.0
+    for char in word:
+        char_width = text_width(char, style)
+        if chunk and chunk_width + char_width > width:
+            chunks.append((chunk, chunk_width))
+            chunk, chunk_width = "", 0.0
+        chunk += char
+        chunk_width += char_width
+    if chunk:
+        chunks.append((chunk, chunk_width))
+    return tuple(chunks)
+
+
+def _merge_pieces(line):
+    """Join neighbouring pieces of one style into a single text operator (tabs stay separate gaps)."""
+    merged = []
+    for text, style, width in line:
+        if merged and merged[-1][1] is style and "\t" not in text and "\t" not in merged[-1][0]:
+            merged[-1][0] += text
+            merged[-1][2] += width
+        else:
+            merged.append([text, style, width])
+    return merged
+
+
+def wrap_runs(runs, width):
+    """Greedy line breaking of (text, RunStyle) runs.
+
+    Returns
+    - list[list[tuple[str, RunStyle, float]]]: Lines of (text, style, width) pieces; a line's whitespace pieces
+      are kept in place but dropped at the end of wrapped lines
+    """
+    lines, line, x = [], [], 0.0
+
+    def end_line():
+        while line and line[-1][0].isspace():
+            line.pop()
+        lines.append(line)
+
+    for text, style in runs:
+        # Missing values (e.g. a null e-mail) render as empty runs, as in python-docx
+        for token in _TOKEN_RE.findall(text or ""):
+            if token in "\r\n":
+                end_line()
+                line, x = [], 0.0
+            elif token.isspace():
+                if "\t" in token:
+                    token_width = TAB_STOP - x % TAB_STOP
+                else:
+                    token_width = text_width(token, style)
+                line.append((token, style, token_width))
+                x += token_width
+            else:
+                token_width = text_width(token, style)
+                if x + token_width > width and line:
+                    end_line()
+                    line, x = [], 0.0
+                for chunk, chunk_width in _split_word(token, style, width) if token_width > width else \
+                        [(token, token_width)]:
+                    if x + chunk_width > width and line:
+                        end_line()
+                        line, x = [], 0.0
+                    line.append((chunk, style, chunk_width))
+                    x += chunk_width
+    end_line()
+    return lines
+
+
+@lru_cache(maxsize=1)
+def _logo():
+    """(image bytes, height/width ratio) of resume_builder.HEADER_IMAGE, or None when the file is missing."""
+    if not os.path.exists(rb.HEADER_IMAGE):
+        return None
+    with open(rb.HEADER_IMAGE, "rb") as f:
+        image = f.read()
+    with fitz.open(stream=image) as img:
+        rect = img[0].rect
+    return image, rect.height / rect.width
+
+
+def _logo_rect(left_margin):
+    # The logo paragraph follows the sidebar cell's empty first paragraph; like any inline picture it sits on
+    # the baseline of its line, which line spacing makes taller than the picture
+    _, ratio = _logo()
+    height = SIDEBAR_WIDTH * ratio
+    bottom = TOP_MARGIN + _line_height(DEFAULT_SIZE) + DEFAULT_SPACE_AFTER + height * LINE_SPACING
+    x0 = left_margin + CELL_PADDING
+    return fitz.Rect(x0, bottom - height, x0 + SIDEBAR_WIDTH, bottom)
+
+
+@lru_cache(maxsize=None)
+def _template(left_margin):
+    """Two pages carrying the font resources: the first page with the logo, and a blank continuation page."""
+    template = fitz.open()
+    for number in range(2):
+        page = template.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        if number == 0 and _logo() is not None:
+            page.insert_image(_logo_rect(left_margin), stream=_logo()[0])
+        for font in (*_FONTS.values(), _DINGBAT_FONT):
+            page.insert_font(fontname=font)
+    # Reopen compressed, so documents copy the logo's deflated stream instead of compressing it on every save
+    return fitz.open("pdf", template.tobytes(deflate=True))
+
+
+class _PageOps:
+    """Content of one page: fills, written below everything else, then operator lists and (color, TextWriter)
+    layers in drawing order."""
+
+    __slots__ = ("back", "layers")
+
+    def __init__(self):
+        self.back = []
+        self.layers = []
+
+    def op(self, operator):
+        if not self.layers or not isinstance(self.layers[-1], list):
+            self.layers.append([])
+        self.layers[-1].append(operator)
+
+    def writer(self, color):
+        """TextWriter for the next text in ``color``; consecutive runs of one color share a writer."""
+        if not self.layers or isinstance(self.layers[-1], list) or self.layers[-1][0] != color:
+            self.layers.append((color, fitz.TextWriter(fitz.Rect(0, 0, PAGE_WIDTH, PAGE_HEIGHT))))
+        return self.layers[-1][1]
+
+
+class Canvas:
+    """Pages of one resume; positions are in points from the top-left corner, like PyMuPDF's."""
+
+    def __init__(self, left_margin=SIDE_MARGIN):
+        self.left_margin = left_margin
+        self.top = TOP_MARGIN
+        self.bottom = PAGE_HEIGHT - BOTTOM_MARGIN
+        self.pages = []
+
+    def page(self, number):
+        while len(self.pages) <= number:
+            self.pages.append(_PageOps())
+        return self.pages[number]
+
+    def text(self, page, x, baseline, text, style):
+        ops = self.page(page)
+        y = PAGE_HEIGHT - baseline
+        segments = _segments(text, style.font)
+        writer = None
+        if not all(native for _, native, _, _ in segments):
+            writer = ops.writer(style.color)
+        for font, native, chunk, em_width in segments:
+            if font == _DINGBAT_FONT:
+                ops.op(_ARTIFACT.format(f"BT /{font} {style.size:g} Tf {_color_op(style.color, 'rg')} {x:.2f} "
+                                        f"{y:.2f} Td ({chunk.translate(_PDF_STRING_ESCAPES)}) Tj ET"))
+            elif writer is not None:
+                # The built-in fonts' glyph widths match the embedded ones, so native pieces keep their positions
+                writer.append((x, baseline), chunk, font=_font(font), fontsize=style.size)
+            else:
+                ops.op(f"BT /{font} {style.size:g} Tf {_color_op(style.color, 'rg')} {x:.2f} {y:.2f} Td "
+                       f"({chunk.translate(_PDF_STRING_ESCAPES)}) Tj ET")
+            x += em_width * style.size
+
+    def line(self, page, x0, y0, x1, y1, color=None, width=1):
+        self.page(page).op(f"{_color_op(color, 'RG')} {width:.2f} w {x0:.2f} {PAGE_HEIGHT - y0:.2f} m "
+                           f"{x1:.2f} {PAGE_HEIGHT - y1:.2f} l S")
+
+    def fill(self, page, x0, y0, x1, y1, color):
+        self.page(page).back.append(f"{_color_op(color, 'rg')} {x0:.2f} {PAGE_HEIGHT - y1:.2f} {x1 - x0:.2f} "
+                                    f"{y1 - y0:.2f} re f")
+
+    def box(self, page, x0, y0, x1, y1, color=rb.BLACK, width=BOX_BORDER_WIDTH):
+        self.page(page).op(f"{_color_op(color, 'RG')} {width:.2f} w {x0:.2f} {PAGE_HEIGHT - y1:.2f} "
+                           f"{x1 - x0:.2f} {y1 - y0:.2f} re S")
+
+    def to_bytes(self):
+        """Copy the template pages and add this canvas's content to them; returns the PDF file."""
+        doc = fitz.open()
+        template = _template(self.left_margin)
+        with _template_lock:
+            doc.insert_pdf(template, from_page=0, to_page=0)
+            for _ in self.pages[1:]:
+                doc.insert_pdf(template, from_page=1, to_page=1)
+        embedded = False
+        for page, ops in zip(doc, self.pages):
+            contents = page.get_contents()
+            layers = list(ops.layers)
+            if layers and isinstance(layers[0], list):
+                layers[0] = ops.back + layers[0]
+            elif ops.back:
+                layers.insert(0, ops.back)
+            for layer in layers:
+                if isinstance(layer, list):
+                    xref = doc.get_new_xref()
+                    doc.update_object(xref, "<<>>")
+                    doc.update_stream(xref, "\n".join(layer).encode("cp1252"), compress=True)
+                    contents.append(xref)
+                    doc.xref_set_key(page.xref, "Contents", "[%s]" % " ".join(f"{x} 0 R" for x in contents))
+                else:
+                    color, writer = layer
+                    writer.write_text(page, color=tuple(c / 255 for c in color or (0, 0, 0)))
+                    contents = page.get_contents()
+                    embedded = True
+        if not embedded:
+            # A fixed /ID keeps the output reproducible
+            return doc.tobytes(no_new_id=True)
+        # Subsetting leaves the full fonts behind as unreferenced objects and writes the subsets uncompressed
+        doc.subset_fonts()
+        return doc.tobytes(garbage=1, deflate=True, no_new_id=True)
+
+
+class Column:
+    """Paragraphs stacked between x0 and x1, continuing at the top of the next page when the bottom is reached.
+
+    A nested() column is a table cell: its edges are the cell's, x0/x1 its padded content area.
+    """
+
+    def __init__(self, canvas, page, x0, x1, y, edges=None, padding_bottom=0):
+        self.canvas = canvas
+        self.page = page
+        self.x0, self.x1 = x0, x1
+        self.y = y
+        self.edges = edges or (x0, x1)
+        self.padding_bottom = padding_bottom
+        self.starts = [(page, y)]
+
+    def advance(self, height):
+        """Reserve ``height`` points and return their top, moving to the next page when they do not fit."""
+        if self.y + height > self.canvas.bottom and self.y > self.canvas.top:
+            self.page += 1
+            self.y = self.canvas.top
+            self.starts.append((self.page, self.y))
+        top = self.y
+        self.y += height
+        return top
+
+    def paragraph(self, runs=(), align=None, space_before=None, space_after=None, left_indent=None,
+                  right_indent=None, first_line_indent=None, bullet=None):
+        """Lay out and draw one paragraph of (text, RunStyle) runs.
+
+        ``bullet`` is the RunStyle of a List Bullet glyph, hung HANGING_INDENT left of ``left_indent``.
+        """
+        left = self.x0 + _pt(left_indent)
+        right = self.x1 - _pt(right_indent)
+        first = _pt(first_line_indent)
+        self.y += _pt(space_before)
+        default_size = bullet.size if bullet else DEFAULT_SIZE
+        for number, line in enumerate(wrap_runs(runs, max(right - left - first, 1))):
+            size = max((style.size for _, style, _ in line), default=default_size)
+            height = _line_height(size)
+            baseline = self.advance(height) + height - DESCENT * size
+            x = left + (first if number == 0 else 0)
+            if align == WD_ALIGN_PARAGRAPH.CENTER:
+                x += (right - x - sum(width for _, _, width in line)) / 2
+            elif align == WD_ALIGN_PARAGRAPH.RIGHT:
+                x = right - sum(width for _, _, width in line)
+            if bullet is not None and number == 0:
+                self.canvas.text(self.page, left - HANGING_INDENT, baseline, BULLET, bullet)
+            for text, style, width in _merge_pieces(line):
+                if not text.isspace():
+                    self.canvas.text(self.page, x, baseline, text, style)
+                if style.underline:
+                    y = baseline + UNDERLINE_OFFSET * style.size
+                    self.canvas.line(self.page, x, y, x + width, y, style.color, UNDERLINE_WIDTH * style.size)
+                x += width
+        self.y += _pt(space_after, DEFAULT_SPACE_AFTER)
+
+    def picture(self, height, space_after=DEFAULT_SPACE_AFTER):
+        """Reserve the line of an inline picture (drawn by the page template)."""
+        self.advance(height * LINE_SPACING)
+        self.y += space_after
+
+    def nested(self, x0, x1, padding=(0, CELL_PADDING, 0, CELL_PADDING)):
+        """Start a table cell spanning x0..x1 at the current position."""
+        top, start, bottom, end = padding
+        return Column(self.canvas, self.page, x0 + start, x1 - end, self.y + top, edges=(x0, x1),
+                      padding_bottom=bottom)
+
+    def resume(self, *cells, min_height=0):
+        """Continue below the row of ``cells``; returns the (page, top, bottom) rectangles of the first cell."""
+        top = self.y
+        page, y = max((cell.page, cell.y + cell.padding_bottom) for cell in cells)
+        if page == self.page:
+            y = min(max(y, top + min_height), self.canvas.bottom)
+        self.page, self.y = page, y
+        starts = list(cells[0].starts)
+        starts[0] = (starts[0][0], top)
+        return [(p, t, y if p == page else self.canvas.bottom) for p, t in starts]
+
+    def row(self, widths):
+        """Start a row of cells with the given widths; the table is shifted left by the cell padding as in Word."""
+        cells, x = [], self.x0 - CELL_PADDING
+        for width in widths:
+            cells.append(self.nested(x, x + width))
+            x += width
+        return cells
+
+
+def _header(column, text, color, size, is_bold=True, align=WD_ALIGN_PARAGRAPH.LEFT, font_name="Aptos"):
+    column.paragraph([(text.upper(), run_style(**header_run_format(color, size, is_bold, font_name)))],
+                     align=align, space_after=HEADER_SPACE_AFTER)
+
+
+def _separator(column):
+    column.paragraph([(separator_text(), run_style(**SEPARATOR_RUN))], **SEPARATOR_PARAGRAPH)
+
+
+def _bullets(column, items, bullet, indent):
+    style, spacing = _bullet_run(**bullet)
+    for item in items:
+        column.paragraph([(item, style)], left_indent=indent, bullet=style, **spacing)
+
+
+def _sidebar(column, json_data):
+    contact_info = json_data.get("contact", {})
+    column.paragraph()
+    column.paragraph([(json_data.get("name", "").upper(), run_style(**rb.NAME_RUN))], **rb.NAME_PARAGRAPH)
+    column.paragraph([("✉️ ", run_style(**rb.EMAIL_ICON_RUN)),
+                      (contact_info.get("email", ""), run_style(**rb.EMAIL_RUN))], **rb.EMAIL_PARAGRAPH)
+    _separator(column)
+
+    _header(column, "EDUCATION", **rb.SIDEBAR_HEADER)
+    edu_style = run_style(**rb.EDUCATION_RUN)
+    for edu in json_data.get("education", []):
+        column.paragraph([(line, edu_style) for line in rb.education_lines(edu)], **rb.EDUCATION_PARAGRAPH)
+    _separator(column)
+
+    skills_data = json_data.get("skills", {})
+    _header(column, "SKILLS", **rb.SIDEBAR_HEADER)
+    all_skills = skills_data.get("technical", []) + skills_data.get("tools", [])
+    _bullets(column, all_skills[:rb.MAX_SKILLS], rb.SKILL_BULLET, rb.SKILL_INDENT)
+    column.paragraph(**rb.SKILLS_END_PARAGRAPH)
+    _separator(column)
+
+    certifications = json_data.get("certifications")
+    if certifications:
+        _header(column, "CERTIFICATIONS", **rb.SIDEBAR_HEADER)
+        cert_style = run_style(**rb.CERTIFICATION_RUN)
+        for cert in certifications:
+            column.paragraph([(cert, cert_style)], **rb.CERTIFICATION_PARAGRAPH)
+
+
+def _experience_entry(column, exp):
+    # Two-column title/date table; autofit shrinks its preferred widths to the space available
+    available = column.x1 - column.x0 + CELL_PADDING
+    scale = min(1.0, available / sum(EXPERIENCE_TABLE_WIDTHS))
+    title_cell, date_cell = column.row([width * scale for width in EXPERIENCE_TABLE_WIDTHS])
+    title_cell.paragraph()
+    title_cell.paragraph([(f'{exp.get("title", "")}', run_style(**EXPERIENCE_TITLE_RUN)),
+                          (f' at {exp.get("company", "")}', run_style(**EXPERIENCE_COMPANY_RUN))],
+                         **EXPERIENCE_TITLE_PARAGRAPH)
+    date_cell.paragraph()
+    date_cell.paragraph([(f'({exp.get("start_date", "")} - {exp.get("end_date", "")})',
+                          run_style(**EXPERIENCE_DATE_RUN))], **EXPERIENCE_DATE_PARAGRAPH)
+    column.resume(title_cell, date_cell)
+    column.paragraph()
+
+    items = [item.replace("\n", " ") for item in exp.get("achievements", [])]
+    _bullets(column, items, bullet_format(), BULLET_INDENT)
+
+
+def _bordered(canvas, column, cell, min_height=0):
+    x0, x1 = cell.edges
+    for page, top, bottom in column.resume(cell, min_height=min_height):
+        canvas.box(page, x0, top, x1, bottom)
+
+
+def render_resume_pdf(json_data):
+    """Render the standardized resume for ``json_data`` as a PDF.
+
+    Returns
+    - bytes: The PDF file
+    """
+    experience_list = json_data.get("experience", [])
+    canvas = Canvas(PAGE2_LEFT_MARGIN if experience_list[1:] else SIDE_MARGIN)
+    left = canvas.left_margin
+
+    # FIRST PAGE: sidebar cell spanning both rows of the layout table
+    sidebar = Column(canvas, 0, left + CELL_PADDING, left + SIDEBAR_WIDTH - CELL_PADDING, canvas.top)
+    sidebar.paragraph()
+    if _logo() is not None:
+        sidebar.picture(SIDEBAR_WIDTH * _logo()[1])
+    else:
+        sidebar.paragraph([("KANERIKA", run_style(size=14))], align=WD_ALIGN_PARAGRAPH.LEFT)
+    blue_sidebar = sidebar.nested(left, left + SIDEBAR_WIDTH)
+    _sidebar(blue_sidebar, json_data)
+    for page, top, bottom in sidebar.resume(blue_sidebar):
+        canvas.fill(page, left, top, left + SIDEBAR_WIDTH, bottom, rb.BLUE)
+    sidebar.paragraph()
+
+    # Main content: PROFILE row, then the PROFESSIONAL EXPERIENCE row below it
+    main_x0 = left + SIDEBAR_WIDTH + SPACER_WIDTH
+    main_x1 = main_x0 + MAIN_WIDTH
+    profile = Column(canvas, 0, main_x0 + CELL_PADDING, main_x1 - CELL_PADDING, canvas.top)
+    profile.paragraph()
+    _header(profile, "PROFILE", **rb.MAIN_HEADER)
+    profile_text = json_data.get("profile") or json_data.get("summary") or rb.DEFAULT_PROFILE
+    box = profile.nested(main_x0, main_x1, PROFILE_BOX_PADDING)
+    box.paragraph()
+    box.paragraph([(profile_text, run_style(**rb.PROFILE_RUN))], **rb.PROFILE_PARAGRAPH)
+    _bordered(canvas, profile, box)
+    profile.paragraph()
+
+    experience = Column(canvas, profile.page, profile.x0, profile.x1, profile.y)
+    experience.paragraph()
+    _header(experience, "PROFESSIONAL EXPERIENCE", **rb.MAIN_HEADER)
+    if experience_list:
+        box = experience.nested(main_x0, main_x1, EXPERIENCE_BOX_PADDING)
+        box.paragraph()
+        _experience_entry(box, experience_list[0])
+        _bordered(canvas, experience, box)
+        experience.paragraph()
+
+    # Second page onwards: one full-width box holding the remaining entries
+    if experience_list[1:]:
+        last_page = max(sidebar.page, experience.page)
+        body = Column(canvas, last_page + 1, left, PAGE_WIDTH - SIDE_MARGIN, canvas.top)
+        body.paragraph()
+        _header(body, "PROFESSIONAL EXPERIENCE", **rb.MAIN_HEADER)
+        box = body.nested(left - CELL_PADDING, PAGE_WIDTH - SIDE_MARGIN - CELL_PADDING, PAGE2_BOX_PADDING)
+        box.paragraph()
+        for exp in experience_list[1:]:
+            _experience_entry(box, exp)
+        usable_height = PAGE_HEIGHT - TOP_MARGIN - BOTTOM_MARGIN
+        _bordered(canvas, body, box, min_height=usable_height - Inches(0.8).pt)
+
+    logger.debug("Resume PDF for %r has been created.", json_data.get("name"))
+    return canvas.to_bytes()
+
+
+def warm_up():
+    """Build the page templates and glyph width tables before the first resume."""
+    for left_margin in (SIDE_MARGIN, PAGE2_LEFT_MARGIN):
+        _template(left_margin)
+    for font in _FONTS.values():
+        _glyph_widths(font)
@@ -11,8 +11,13 @@ from docx.oxml.ns import qn
 from docx.enum.table import WD_ALIGN_VERTICAL, WD_ROW_HEIGHT_RULE
 import os
 import io
+import copy
+import logging
+from functools import lru_cache
 
 from utils.xml_helpers import *
+logger = logging.getLogger(__name__)
+
 # === CONFIGURATION ===
 HEADER_IMAGE = 'logo.png'
 OUTPUT_FILENAME = "Generated_Resume.docx"
@@ -22,8 +27,46 @@ BLUE = RGBColor(0, 102, 204)
 WHITE = RGBColor(0xFF, 0xFF, 0xFF)
 BLACK = RGBColor(0, 0, 0)
 
-
-def resume_builder(json_data):
+# Formatting of the layout's text elements: *_RUN go to character_style/bullet_style, *_PARAGRAPH to
+# add_styled_paragraph. src.docx_writer renders the same layout from these.
+SIDEBAR_HEADER = dict(color=WHITE, size=12, font_name='Aptos', align=WD_ALIGN_PARAGRAPH.CENTER)
+MAIN_HEADER = dict(color=BLUE, size=22, font_name='Aptos')
+NAME_RUN = dict(font_name='Aptos', size=14, color=WHITE, bold=True, underline=True)
+NAME_PARAGRAPH = dict(align=WD_ALIGN_PARAGRAPH.CENTER, space_after=Pt(6))
+EMAIL_ICON_RUN = dict(color=WHITE)
+EMAIL_RUN = dict(font_name='Aptos', size=9, color=WHITE)
+EMAIL_PARAGRAPH = dict(align=WD_ALIGN_PARAGRAPH.CENTER, space_after=Pt(20))
+EDUCATION_RUN = dict(font_name='Aptos', size=10, color=WHITE)
+EDUCATION_PARAGRAPH = dict(space_after=Pt(12))
+SKILL_BULLET = dict(font_name='Aptos', size=10, color=WHITE, space_before=2, space_after=2)
+SKILL_INDENT = Inches(0.45)
+MAX_SKILLS = 9
+SKILLS_END_PARAGRAPH = dict(space_after=Pt(12))
+CERTIFICATION_RUN = dict(font_name='Aptos', size=9, color=WHITE)
+CERTIFICATION_PARAGRAPH = dict(align=WD_ALIGN_PARAGRAPH.LEFT, space_after=Pt(1))
+PROFILE_RUN = dict(font_name='Aptos', size=11)
+PROFILE_PARAGRAPH = dict(space_after=Pt(0))
+DEFAULT_PROFILE = "No profile information provided."
+
+
+def _header_run(header):
+    return header_run_format(header["color"], header["size"], font_name=header["font_name"])
+
+
+def define_layout_styles(doc):
+    """Add every style the layout uses to ``doc``, so copies of the skeleton share one styles part."""
+    for run_format in (_header_run(SIDEBAR_HEADER), _header_run(MAIN_HEADER), NAME_RUN, EMAIL_ICON_RUN, EMAIL_RUN,
+                       EDUCATION_RUN, CERTIFICATION_RUN, PROFILE_RUN, SEPARATOR_RUN, EXPERIENCE_TITLE_RUN,
+                       EXPERIENCE_COMPANY_RUN, EXPERIENCE_DATE_RUN):
+        character_style(doc, **run_format)
+    bullet_style(doc, **SKILL_BULLET)
+    bullet_style(doc, **bullet_format())
+    box_table_style(doc, BLACK)
+
+
+@lru_cache(maxsize=1)
+def _build_skeleton():
+    """Build the static part of the layout that is identical for every resume."""
     doc = Document()
     for section in doc.sections:
         section.top_margin = Inches(0.5)
@@ -73,160 +116,291 @@ def resume_builder(json_data):
     set_cell_background(blue_sidebar_cell, BLUE)
     blue_sidebar_cell.width = Inches(2.4)
 
-    # ... (rest of the sidebar code is unchanged) ...
-    name_para = blue_sidebar_cell.add_paragraph()
-    name_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    name_run = name_para.add_run(json_data.get("name", "").upper())
-    name_run.font.name = 'Aptos'
-    name_run.font.color.rgb = WHITE
-    name_run.font.size = Pt(14)
-    name_run.bold = True
-    name_run.underline = True
-    name_para.paragraph_format.space_after = Pt(6)
-
-    contact_info = json_data.get("contact", {})
-    email_para = blue_sidebar_cell.add_paragraph()
-    email_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    email_para.add_run('✉️ ').font.color.rgb = WHITE
-    email_run = email_para.add_run(contact_info.get("email", ""))
-    email_run.font.name = 'Aptos'
-    email_run.font.color.rgb = WHITE
-    email_run.font.size = Pt(9)
-    email_para.paragraph_format.space_after = Pt(20)
+    ### CHANGE 2: Set the height for the second row to expand the container ###
+    experience_row = main_table.rows[1]
+    experience_row.height_rule = WD_ROW_HEIGHT_RULE.AT_LEAST
+    # experience_row.height = Inches(7)
+
+    define_layout_styles(doc)
+
+    # Static section headers of the main content column
+    add_header(profile_container_cell, "PROFILE", **MAIN_HEADER)
+    add_header(experience_container_cell, "PROFESSIONAL EXPERIENCE", **MAIN_HEADER)
+    return doc
+
+
+def new_resume_document():
+    """Return a fresh copy of the cached skeleton.
+
+    The layout table, logo image part and static shading are built once per process; each resume only
+    pays for a deep copy of the skeleton and the candidate-specific content.
+    """
+    # Copy the part (and through it the whole package) rather than the Document proxy: lxml elements
+    # ignore the deepcopy memo, so copying the proxy would detach it from the part that gets saved.
+    return copy.deepcopy(_build_skeleton().part).document
+
+
+class ResumeLayout:
+    """Handles to the regions of a fresh document copy that candidate content is written into."""
+
+    def __init__(self, doc=None):
+        self.doc = doc or new_resume_document()
+        self.main_table = self.doc.tables[0]
+        self.sidebar_cell = self.main_table.cell(0, 0)
+        self.profile_container_cell = self.main_table.cell(0, 2)
+        self.experience_container_cell = self.main_table.cell(1, 2)
+        self.blue_sidebar_cell = self.sidebar_cell.tables[0].cell(0, 0)
+        self.experience_row = self.main_table.rows[1]
+        self.page2_cell = None
+
+    def to_bytes(self):
+        # Save to BytesIO
+        file_stream = io.BytesIO()
+        self.doc.save(file_stream)
+        file_stream.seek(0)  # Move pointer to the beginning
+        return file_stream.getvalue()
+
+
+def render_identity(layout, name, contact_info):
+    blue_sidebar_cell = layout.blue_sidebar_cell
+    add_styled_paragraph(blue_sidebar_cell, [(name.upper(), character_style(blue_sidebar_cell, **NAME_RUN))],
+                         **NAME_PARAGRAPH)
+
+    add_styled_paragraph(
+        blue_sidebar_cell,
+        [('✉️ ', character_style(blue_sidebar_cell, **EMAIL_ICON_RUN)),
+         (contact_info.get("email", ""), character_style(blue_sidebar_cell, **EMAIL_RUN))],
+        **EMAIL_PARAGRAPH,
+    )
 
     add_sidebar_separator(blue_sidebar_cell)
 
-    add_header(blue_sidebar_cell, "EDUCATION", WHITE, 12, font_name='Aptos', align=WD_ALIGN_PARAGRAPH.CENTER)
-    for edu in json_data.get("education", []):
-        edu_para = blue_sidebar_cell.add_paragraph()
-        edu_para.add_run(f'{edu.get("degree", "")}\n').font.color.rgb = WHITE
-        edu_para.add_run(f'{edu.get("institution", "")}\n').font.color.rgb = WHITE
-        edu_para.add_run(f'{edu.get("location", "")}\n').font.color.rgb = WHITE
-        edu_para.add_run(f'{edu.get("start_date", "")} - {edu.get("end_date", "")}').font.color.rgb = WHITE
-        for run in edu_para.runs:
-            run.font.name = 'Aptos'
-            run.font.size = Pt(10)
-        edu_para.paragraph_format.space_after = Pt(12)
+
+def education_lines(edu):
+    return [
+        f'{edu.get("degree", "")}\n',
+        f'{edu.get("institution", "")}\n',
+        f'{edu.get("location", "")}\n',
+        f'{edu.get("start_date", "")} - {edu.get("end_date", "")}',
+    ]
+
+
+def render_education(layout, education):
+    blue_sidebar_cell = layout.blue_sidebar_cell
+    add_header(blue_sidebar_cell, "EDUCATION", **SIDEBAR_HEADER)
+    edu_style = character_style(blue_sidebar_cell, **EDUCATION_RUN)
+    for edu in education:
+        add_styled_paragraph(blue_sidebar_cell, [(line, edu_style) for line in education_lines(edu)],
+                             **EDUCATION_PARAGRAPH)
 
     add_sidebar_separator(blue_sidebar_cell)
 
-    add_header(blue_sidebar_cell, "SKILLS", WHITE, 12, font_name='Aptos', align=WD_ALIGN_PARAGRAPH.CENTER)
-    skills_data = json_data.get("skills", {})
+
+def render_skills(layout, skills_data):
+    blue_sidebar_cell = layout.blue_sidebar_cell
+    add_header(blue_sidebar_cell, "SKILLS", **SIDEBAR_HEADER)
     all_skills = skills_data.get("technical", []) + skills_data.get("tools", [])
     if all_skills:
-        for skill in all_skills[:9]:
-            ps = blue_sidebar_cell.add_paragraph(skill, style='List Bullet')
-            ps.runs[0].font.name = 'Aptos'
-            ps.runs[0].font.size = Pt(10)
-            ps.runs[0].font.color.rgb = WHITE
-            ps.paragraph_format.left_indent = Inches(0.45)
-            ps.paragraph_format.space_after = Pt(2)
-            ps.paragraph_format.space_before = Pt(2)
+        skill_style = bullet_style(blue_sidebar_cell, **SKILL_BULLET)
+        for skill in all_skills[:MAX_SKILLS]:
+            add_styled_paragraph(blue_sidebar_cell, [(skill, None)], style_id=skill_style, left_indent=SKILL_INDENT)
 
-    blue_sidebar_cell.add_paragraph().paragraph_format.space_after = Pt(12)
+    add_styled_paragraph(blue_sidebar_cell, **SKILLS_END_PARAGRAPH)
 
     add_sidebar_separator(blue_sidebar_cell)
 
-    if json_data.get("certifications"):
-        add_header(blue_sidebar_cell, "CERTIFICATIONS", WHITE, 12, font_name='Aptos', align=WD_ALIGN_PARAGRAPH.CENTER)
-        for cert in json_data.get("certifications"):
-            pc = blue_sidebar_cell.add_paragraph(cert)
-            pc.alignment = WD_ALIGN_PARAGRAPH.LEFT
-            pc.runs[0].font.name = 'Aptos'
-            pc.runs[0].font.size = Pt(9)
-            pc.runs[0].font.color.rgb = WHITE
-            pc.paragraph_format.space_after = Pt(1)
-
-    # Main content: Profile
-    add_header(profile_container_cell, "PROFILE", BLUE, 22, font_name='Aptos')
-    profile_text = json_data.get("profile") or json_data.get("summary")
+
+def render_certifications(layout, certifications):
+    blue_sidebar_cell = layout.blue_sidebar_cell
+    if certifications:
+        add_header(blue_sidebar_cell, "CERTIFICATIONS", **SIDEBAR_HEADER)
+        cert_style = character_style(blue_sidebar_cell, **CERTIFICATION_RUN)
+        for cert in certifications:
+            add_styled_paragraph(blue_sidebar_cell, [(cert, cert_style)], **CERTIFICATION_PARAGRAPH)
+
+
+def add_profile_box(layout):
+    """Add the bordered single-cell table below the PROFILE header and return its cell."""
+    profile_container_cell = layout.profile_container_cell
+    profile_content_table = profile_container_cell.add_table(rows=1, cols=1)
+    profile_content_table.autofit = False
+    profile_content_table.columns[0].width = profile_container_cell.width
+    set_table_box_style(profile_content_table, BLACK)
+    profile_content_cell = profile_content_table.cell(0, 0)
+    set_cell_margins(profile_content_cell, top=5, start=5, bottom=5, end=5)
+    return profile_content_cell
+
+
+def render_profile(layout, profile_text):
+    # Main content: Profile (the header itself is part of the skeleton)
     if not profile_text:
-        profile_text = "No profile information provided."
+        profile_text = DEFAULT_PROFILE
     if profile_text:
-        profile_content_table = profile_container_cell.add_table(rows=1, cols=1)
-        profile_content_table.autofit = False
-        profile_content_table.columns[0].width = profile_container_cell.width
-        profile_content_cell = profile_content_table.cell(0, 0)
-        set_cell_borders(profile_content_cell, BLACK)
-        set_cell_margins(profile_content_cell, top=5, start=5, bottom=5, end=5)
-        p = profile_content_cell.add_paragraph()
-        p.add_run(profile_text).font.size = Pt(11)
-        p.runs[0].font.name = 'Aptos'
-        p.paragraph_format.space_after = Pt(0)
+        profile_content_cell = add_profile_box(layout)
+        add_styled_paragraph(profile_content_cell, [(profile_text, character_style(profile_content_cell, **PROFILE_RUN))],
+                             **PROFILE_PARAGRAPH)
 
-    ### CHANGE 2: Set the height for the second row to expand the container ###
-    experience_row = main_table.rows[1]
-    experience_row.height_rule = WD_ROW_HEIGHT_RULE.AT_LEAST
-    # experience_row.height = Inches(7)
 
-    # Main content: Professional Experience
-    add_header(experience_container_cell, "PROFESSIONAL EXPERIENCE", BLUE, 22, font_name='Aptos')
-    experience_list = json_data.get("experience", [])
-    first_page_exp = experience_list[:1]
-    if first_page_exp:
-        # Create a nested table for the bordered content
-        exp_content_table = experience_container_cell.add_table(rows=1, cols=1)
-        
-        exp_content_table.autofit = False
-        exp_content_table.columns[0].width = experience_container_cell.width
-
-        # ### CHANGE 3: Make the nested table's row fill the new container height ###
-        exp_content_row = exp_content_table.rows[0]
-        exp_content_row.height_rule = WD_ROW_HEIGHT_RULE.AT_LEAST
-        exp_content_row.height = experience_row.height
-        
-        exp_content_cell = exp_content_table.cell(0, 0)
-        exp_content_cell.vertical_alignment = WD_ALIGN_VERTICAL.TOP
-        set_cell_borders(exp_content_cell, BLACK)
-        set_cell_margins(exp_content_cell, top=0, start=5, bottom=0, end=0)
-        add_experience_entry(exp_content_cell, first_page_exp[0])
-
-    # Second page onwards
-    remaining_exp = experience_list[1:]
-    if remaining_exp:
-        doc.add_page_break()
-        add_header(doc, "PROFESSIONAL EXPERIENCE", BLUE, 22, font_name='Aptos')
-
-        page2_table = doc.add_table(rows=1, cols=1)
-        page2_table.autofit = False
-        section = doc.sections[-1]
-        section.left_margin = Inches(0.35) 
-        usable_width = section.page_width - section.left_margin - section.right_margin
-        page2_table.columns[0].width = usable_width
-        
-        # ### CHANGE 1: Calculate the available height on the page ###
-        # We subtract an estimated height for the header above. You can adjust Inches(0.8).
-        usable_height = section.page_height - section.top_margin - section.bottom_margin
-        table_height = usable_height - Inches(0.8) 
-        
-        # ### CHANGE 2: Apply the calculated height to the table row ###
-        row = page2_table.rows[0]
-        row.height_rule = WD_ROW_HEIGHT_RULE.AT_LEAST
-        row.height = table_height
-
-        container_cell = page2_table.cell(0, 0)
-        # ### CHANGE 3: Align content to the top of the now-tall cell ###
-        container_cell.vertical_alignment = WD_ALIGN_VERTICAL.TOP
-        
-        set_cell_borders(container_cell, BLACK)
-        set_cell_margins(container_cell, top=5, start=8, bottom=5, end=8)
-
-        for exp in remaining_exp:
-            add_experience_entry(container_cell, exp)
-
-     # Save to BytesIO
-    file_stream = io.BytesIO()
-    doc.save(file_stream)
-    file_stream.seek(0)  # Move pointer to the beginning
+def add_experience_box(layout):
+    """Add the bordered table below the first-page PROFESSIONAL EXPERIENCE header and return its cell."""
+    experience_container_cell = layout.experience_container_cell
+    # Create a nested table for the bordered content
+    exp_content_table = experience_container_cell.add_table(rows=1, cols=1)
+
+    exp_content_table.autofit = False
+    exp_content_table.columns[0].width = experience_container_cell.width
+    set_table_box_style(exp_content_table, BLACK)
+
+    # ### CHANGE 3: Make the nested table's row fill the new container height ###
+    exp_content_row = exp_content_table.rows[0]
+    exp_content_row.height_rule = WD_ROW_HEIGHT_RULE.AT_LEAST
+    exp_content_row.height = layout.experience_row.height
+
+    exp_content_cell = exp_content_table.cell(0, 0)
+    exp_content_cell.vertical_alignment = WD_ALIGN_VERTICAL.TOP
+    set_cell_margins(exp_content_cell, top=0, start=5, bottom=0, end=0)
+    return exp_content_cell
+
+
+def render_first_experience(layout, exp):
+    # Main content: Professional Experience (the header itself is part of the skeleton)
+    add_experience_entry(add_experience_box(layout), exp)
+
+
+def add_page2_container(layout):
+    doc = layout.doc
+    doc.add_page_break()
+    add_header(doc, "PROFESSIONAL EXPERIENCE", **MAIN_HEADER)
+
+    page2_table = doc.add_table(rows=1, cols=1)
+    page2_table.autofit = False
+    set_table_box_style(page2_table, BLACK)
+    section = doc.sections[-1]
+    section.left_margin = Inches(0.35) 
+    usable_width = section.page_width - section.left_margin - section.right_margin
+    page2_table.columns[0].width = usable_width
+    
+    # ### CHANGE 1: Calculate the available height on the page ###
+    # We subtract an estimated height for the header above. You can adjust Inches(0.8).
+    usable_height = section.page_height - section.top_margin - section.bottom_margin
+    table_height = usable_height - Inches(0.8) 
     
-    print(f"Resume document '{OUTPUT_FILENAME}' has been created.")
-    return file_stream.getvalue()
+    # ### CHANGE 2: Apply the calculated height to the table row ###
+    row = page2_table.rows[0]
+    row.height_rule = WD_ROW_HEIGHT_RULE.AT_LEAST
+    row.height = table_height
+
+    container_cell = page2_table.cell(0, 0)
+    # ### CHANGE 3: Align content to the top of the now-tall cell ###
+    container_cell.vertical_alignment = WD_ALIGN_VERTICAL.TOP
+
+    set_cell_margins(container_cell, top=5, start=8, bottom=5, end=8)
+    return container_cell
+
+
+def render_more_experience(layout, exp):
+    # Second page onwards; the page-2 container is created with the first entry that needs it
+    if layout.page2_cell is None:
+        layout.page2_cell = add_page2_container(layout)
+    add_experience_entry(layout.page2_cell, exp)
+
+
+def resume_builder(json_data):
+    layout = ResumeLayout()
+
+    render_identity(layout, json_data.get("name", ""), json_data.get("contact", {}))
+    render_education(layout, json_data.get("education", []))
+    render_skills(layout, json_data.get("skills", {}))
+    render_certifications(layout, json_data.get("certifications"))
+    render_profile(layout, json_data.get("profile") or json_data.get("summary"))
+
+    experience_list = json_data.get("experience", [])
+    if experience_list:
+        render_first_experience(layout, experience_list[0])
+    for exp in experience_list[1:]:
+        render_more_experience(layout, exp)
+
+    logger.debug("Resume document for %r has been created.", json_data.get("name"))
+    return layout.to_bytes()
+
+class StreamingResumeBuilder:
+    """Render a resume section by section while the structured data is still arriving.
+
+    Feed it utils.json_stream.SectionEvent objects in arrival order. Sidebar blocks are rendered in their fixed
+    order (name/contact, education, skills, certifications) as soon as each one and its predecessors are
+    known; the profile and every experience entry are rendered the moment they arrive. finish() fills in
+    whatever is still missing and returns the same bytes resume_builder would produce.
+    """
+
+    SIDEBAR_ORDER = ("identity", "education", "skills", "certifications")
+
+    def __init__(self):
+        self.layout = ResumeLayout()
+        self._data = {}
+        self._sidebar_next = 0
+        self._profile_done = False
+        self._experience_done = 0
+
+    def _sidebar_ready(self, step, final):
+        if step == "identity":
+            return final or ("name" in self._data and "contact" in self._data)
+        return final or step in self._data
+
+    def _advance_sidebar(self, final=False):
+        while self._sidebar_next < len(self.SIDEBAR_ORDER):
+            step = self.SIDEBAR_ORDER[self._sidebar_next]
+            if not self._sidebar_ready(step, final):
+                return
+            if step == "identity":
+                render_identity(self.layout, self._data.get("name", ""), self._data.get("contact", {}))
+            elif step == "education":
+                render_education(self.layout, self._data.get("education", []))
+            elif step == "skills":
+                render_skills(self.layout, self._data.get("skills", {}))
+            else:
+                render_certifications(self.layout, self._data.get("certifications"))
+            self._sidebar_next += 1
+
+    def _render_experience(self, exp):
+        if self._experience_done == 0:
+            render_first_experience(self.layout, exp)
+        else:
+            render_more_experience(self.layout, exp)
+        self._experience_done += 1
+
+    def feed(self, event):
+        """Render whatever blocks the event completes."""
+        if event.index is not None:
+            if event.section == "experience" and event.index == self._experience_done:
+                self._render_experience(event.value)
+            return
+        self._data[event.section] = event.value
+        if event.section in ("profile", "summary") and not self._profile_done:
+            render_profile(self.layout, self._data.get("profile") or self._data.get("summary"))
+            self._profile_done = True
+        self._advance_sidebar()
+
+    def finish(self, json_data=None):
+        """Complete the document (optionally from the full dict) and return the DOCX bytes."""
+        for key, value in (json_data or {}).items():
+            self._data.setdefault(key, value)
+        self._advance_sidebar(final=True)
+        if not self._profile_done:
+            render_profile(self.layout, self._data.get("profile") or self._data.get("summary"))
+            self._profile_done = True
+        for exp in self._data.get("experience", [])[self._experience_done:]:
+            self._render_experience(exp)
+        logger.debug("Resume document for %r has been created.", self._data.get("name"))
+        return self.layout.to_bytes()
+
 
 if __name__ == '__main__':
     try:
         with open('resume_data.json', 'r') as f:
             json_data = json.load(f)
-        resume_builder(json_data)
+        with open(OUTPUT_FILENAME, 'wb') as out:
+            out.write(resume_builder(json_data))
+        print(f"Resume document '{OUTPUT_FILENAME}' has been created.")
     except FileNotFoundError:
         print("Error: 'resume_data.json' not found.")
     except json.JSONDecodeError:
@@ -0,0 +1,86 @@
+"""
+The direct-XML writer (src.docx_writer) must produce the same document structure as resume_builder.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+
+import copy
+
+import pytest
+
+from benchmarks.corpus import build_corpus
+from src.docx_writer import IncrementalDocument, render_resume_xml, structural_diff
+from src.resume_builder import resume_builder
+
+BASE = {
+    "name": "Asha Rao",
+    "contact": {"email": "asha@example.com", "phone": "+1 555 123 4567", "location": "Austin, TX",
+                "links": ["https://github.com/asha"]},
+    "summary": "Data engineer with eight years of experience.",
+    "experience": [
+        {"title": "Data Engineer", "company": "Acme Corp", "location": "Remote", "start_date": "Jan 2020",
+         "end_date": "Present", "achievements": ["Built a streaming platform", "Cut costs by 30%"]},
+        {"title": "Analyst", "company": "Globex", "location": None, "start_date": "2017", "end_date": "2019",
+         "achievements": []},
+    ],
+    "education": [{"degree": "BSc Computer Science", "institution": "UT Austin", "location": None,
+                   "start_date": "2013", "end_date": "2017", "gpa": None}],
+    "skills": {"technical": ["Python", "SQL"], "tools": ["Airflow"], "soft": ["Mentoring"]},
+    "certifications": ["AWS Data Analytics"],
+    "projects": [],
+    "awards": [],
+    "languages": ["English"],
+}
+
+
+def variant(**changes):
+    data = copy.deepcopy(BASE)
+    data.update(changes)
+    return data
+
+
+def without_summary():
+    data = variant(profile="Profile text given under the alternative key.")
+    del data["summary"]
+    return data
+
+
+EDGE_CASES = {
+    "base": BASE,
+    "empty_experience": variant(experience=[]),
+    "missing_title": variant(experience=[{**BASE["experience"][0], "title": ""}]),
+    "summary_and_profile": variant(profile="The profile key wins over summary."),
+    "profile_only": without_summary(),
+    "no_summary": variant(summary=None),
+    "tabs_and_newlines": variant(
+        summary="Line one\nLine two\tafter a tab",
+        experience=[{**BASE["experience"][0], "achievements": ["Tab\tinside", "Break\ninside", "  padded  "]}],
+    ),
+    "twelve_skills": variant(skills={"technical": [f"Skill {i}" for i in range(12)], "tools": [], "soft": []}),
+    "unicode": variant(name="Zoë Łukasiewicz", summary="Café — naïve “quotes” & <xml> entities"),
+    "empty_contact": variant(contact={"email": None, "phone": None, "location": None, "links": []}),
+}
+
+
+def assert_same_structure(data):
+    problems = structural_diff(resume_builder(data), render_resume_xml(data))
+    assert problems == [], problems[:5]
+
+
+@pytest.mark.parametrize("doc", build_corpus(8), ids=lambda doc: doc.name)
+def test_corpus_matches_resume_builder(doc):
+    assert_same_structure(doc.data)
+
+
+@pytest.mark.parametrize("name", sorted(EDGE_CASES))
+def test_edge_cases_match_resume_builder(name):
+    assert_same_structure(EDGE_CASES[name])
+
+
+def test_incremental_update_matches_full_render():
+    document = IncrementalDocument(BASE)
+    edited = variant(summary="Edited summary", experience=BASE["experience"][:1])
+    document.update(edited)
+    assert document.to_bytes() == render_resume_xml(edited)
@@ -0,0 +1,167 @@
+"""
+Content-addressed cache for LLM extraction results.
+
+Entries are keyed on a hash of everything that influences the model output (resume text, system prompt,
+model name and generation config), so the same resume uploaded again is served without an LLM round-trip.
+A small in-memory LRU sits in front of a SQLite file that persists across app restarts.
+"""
+
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.getenv("RESUME_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite3"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "20000"))
+DEFAULT_TTL_SECONDS = int(os.getenv("RESUME_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+DEFAULT_MEMORY_ENTRIES = 256
+
+
+def make_cache_key(text, system_prompt, model, config) -> str:
+    """Build a stable SHA-256 key for one LLM request.
+
+    Parameters
+    - text: Extracted resume content sent to the model
+    - system_prompt: Prompt prepended to the content
+    - model: Model name
+    - config: Generation config dict
+
+    Returns
+    - str: Hex digest identifying the request
+    """
+    payload = json.dumps(
+        {"text": text, "prompt": system_prompt, "model": model, "config": config},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Two-tier (memory LRU + SQLite) cache with TTL and size based eviction."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES,
+                 ttl_seconds=DEFAULT_TTL_SECONDS, memory_entries=DEFAULT_MEMORY_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)")
+        self._conn.commit()
+
+    def _expired(self, created_at, now):
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _remember(self, key, created_at, value):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Return the cached dict for ``key`` or None on a miss / expired entry."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return json.loads(value)
+                del self._memory[key]
+
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or self._expired(row[1], now):
+                if row is not None:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self.stats["evictions"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            value, created_at = row
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self._remember(key, created_at, value)
+            self.stats["disk_hits"] += 1
+            return json.loads(value)
+
+    def set(self, key, data):
+        """Store ``data`` (JSON-serialisable) under ``key`` and evict if over capacity."""
+        now = time.time()
+        value = json.dumps(data, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._remember(key, now, value)
+            self.stats["writes"] += 1
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        if self.ttl_seconds is not None:
+            cur = self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+            self.stats["evictions"] += max(cur.rowcount, 0)
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            # Least recently used entries go first
+            stale = [row[0] for row in self._conn.execute(
+                "SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?", (overflow,)
+            )]
+            self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", [(k,) for k in stale])
+            self.stats["evictions"] += len(stale)
+            for key in stale:
+                self._memory.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> LLMCache:
+    """Return the process-wide cache, creating it on first use."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache()
+        return _default_cache
@@ -1,58 +1,231 @@
 """
-This module provides functions to extract text from PDF and DOCX files in memory.
+This module provides functions to extract text from PDF and DOCX files, given as bytes or as a path on disk.
 It supports both plain text extraction and basic table cell content.
+PDF pages are read lazily and extraction stops at a configurable page/character budget.
+PyMuPDF and python-docx are imported on first use, so importing this module is cheap.
+Scanned PDF pages without a text layer are OCRed when Tesseract is available (utils.ocr).
 """
 
 
-import fitz  # PyMuPDF
-from docx import Document
 from io import BytesIO
+from contextlib import contextmanager
+import mmap
+import os
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
-    """Extract plain text from a PDF file in memory.
+# Extraction budget for PDFs. Resumes rarely exceed a few pages; anything past this is usually an attached
+# portfolio that only inflates the prompt. Set to 0 to disable a limit.
+PDF_MAX_PAGES = int(os.getenv("RESUME_PDF_MAX_PAGES", "10"))
+PDF_MAX_CHARS = int(os.getenv("RESUME_PDF_MAX_CHARS", "40000"))
+
+
+class NoTextError(ValueError):
+    """No usable text could be extracted from a file (e.g. a scanned PDF while OCR is not available)."""
+
+
+@contextmanager
+def open_pdf(source):
+    """Open a PDF from raw bytes or from a file path.
+
+    Paths are memory-mapped so the file is never copied into a Python ``bytes`` object.
+    """
+    import fitz  # PyMuPDF
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        with fitz.open(stream=source, filetype="pdf") as doc:
+            yield doc
+        return
+
+    with open(source, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            with fitz.open(stream=view, filetype="pdf") as doc:
+                yield doc
+        finally:
+            view.release()
+
+
+def iter_pdf_pages(source, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS):
+    """Lazily yield the text of each PDF page, stopping once the budget is reached.
 
     Parameters
-    - file_bytes: Raw PDF bytes
+    - source: Raw PDF bytes or a path to a PDF file
+    - max_pages: Maximum number of pages to read (0/None for no limit)
+    - max_chars: Maximum number of characters to yield in total (0/None for no limit);
+      the last page is truncated to fit
+
+    Yields
+    - str: Text of one page
+    """
+    remaining = max_chars or None
+    with open_pdf(source) as doc:
+        for page_no, page in enumerate(doc):
+            if max_pages and page_no >= max_pages:
+                break
+            text = page.get_text("text")
+            if remaining is not None:
+                if len(text) >= remaining:
+                    yield text[:remaining]
+                    break
+                remaining -= len(text)
+            yield text
+
+
+def extract_pages_from_pdf(file_bytes, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, ocr=None) -> list:
+    """Extract the plain text of each PDF page within budget.
+
+    Parameters
+    - file_bytes: Raw PDF bytes, or a path to the PDF
+    - max_pages: Page budget, see iter_pdf_pages
+    - max_chars: Character budget, see iter_pdf_pages
+    - ocr: Recognize scanned pages (utils.ocr); None follows RESUME_OCR
 
     Returns
-    - str: Combined text content for all pages
+    - list[str]: One text per page
     """
-    text_parts = []
-    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
-        for page in doc:
-            text_parts.append(page.get_text("text"))
-    return "\n".join(text_parts)
+    from utils.ocr import OCR_ENABLED, recognize, scan_pdf
 
-def extract_text_from_docx(file_bytes: bytes) -> str:
-    """Extract text from a DOCX file in memory.
+    if ocr is None:
+        ocr = OCR_ENABLED
+    if not ocr:
+        return list(iter_pdf_pages(file_bytes, max_pages=max_pages, max_chars=max_chars))
+    return recognize(file_bytes, scan_pdf(file_bytes, max_pages, max_chars)).pages()
+
+
+def extract_text_from_pdf(file_bytes, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, ocr=None) -> str:
+    """Extract plain text from a PDF file in memory or on disk.
 
     Parameters
-    - file_bytes: Raw docx bytes
+    - file_bytes: Raw PDF bytes, or a path to the PDF
+    - max_pages / max_chars / ocr: See extract_pages_from_pdf
 
     Returns
-    - str: Combined text content from paragraphs and basic table cells
+    - str: Combined text content for the pages within budget
     """
-    buffer = BytesIO(file_bytes)
-    doc = Document(buffer)
-    texts = []
-    for para in doc.paragraphs:
-
-        if para.text and para.text.strip():
-            texts.append(para.text.strip())
-    # Tables (optional)
-    for table in doc.tables:
-        for row in table.rows:
-            row_text = [cell.text.strip() for cell in row.cells if cell.text and cell.text.strip()]
-            if row_text:
-                texts.append(" | ".join(row_text))
+    return "\n".join(extract_pages_from_pdf(file_bytes, max_pages, max_chars, ocr))
+
+# Clark-notation tag names; spelled out instead of docx.oxml.ns.qn so python-docx is not needed at import time
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = f"{_W}p"
+_W_T = f"{_W}t"
+_W_TAB = f"{_W}tab"
+_W_BR = f"{_W}br"
+_W_CR = f"{_W}cr"
+_W_TBL = f"{_W}tbl"
+_W_TR = f"{_W}tr"
+_W_TC = f"{_W}tc"
+_W_SDT = f"{_W}sdt"
+_W_SDT_CONTENT = f"{_W}sdtContent"
+_W_TXBX_CONTENT = f"{_W}txbxContent"
+_W_TC_VMERGE = f"{_W}tcPr/{_W}vMerge"
+_W_VAL = f"{_W}val"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+
+def _collect_runs(element, parts, text_boxes):
+    """Gather run text below ``element``, setting text box contents aside to be walked as blocks."""
+    for child in element:
+        tag = child.tag
+        if tag == _W_T:
+            parts.append(child.text or "")
+        elif tag == _W_TAB:
+            parts.append("\t")
+        elif tag in (_W_BR, _W_CR):
+            parts.append("\n")
+        elif tag == _W_TXBX_CONTENT:
+            text_boxes.append(child)
+        elif tag == _MC_FALLBACK:
+            # Legacy VML copy of a drawing already covered by mc:Choice
+            continue
+        else:
+            _collect_runs(child, parts, text_boxes)
+
+
+def _walk_blocks(container, lines):
+    """Append the text of every paragraph/table directly inside ``container`` in document order."""
+    for child in container:
+        tag = child.tag
+        if tag == _W_P:
+            parts, text_boxes = [], []
+            _collect_runs(child, parts, text_boxes)
+            text = "".join(parts).strip()
+            if text:
+                lines.append(text)
+            for box in text_boxes:
+                _walk_blocks(box, lines)
+        elif tag == _W_TBL:
+            _walk_table(child, lines)
+        elif tag == _W_SDT:
+            content = child.find(_W_SDT_CONTENT)
+            if content is not None:
+                _walk_blocks(content, lines)
+
+
+def _walk_table(tbl, lines):
+    for tr in tbl.iterchildren(_W_TR):
+        cells = []
+        for tc in tr.iterchildren(_W_TC):
+            # Continuation of a vertically merged cell: its content lives in the first cell
+            vmerge = tc.find(_W_TC_VMERGE)
+            if vmerge is not None and vmerge.get(_W_VAL) != "restart":
+                continue
+            cell_lines = []
+            _walk_blocks(tc, cell_lines)
+            if cell_lines:
+                cells.append(cell_lines)
+        if not cells:
+            continue
+        if all(len(c) == 1 for c in cells):
+            lines.append(" | ".join(c[0] for c in cells))
+        else:
+            # Layout tables hold whole sections per cell; keep each cell's lines together
+            for cell_lines in cells:
+                lines.extend(cell_lines)
+
+
+def _header_footer_lines(doc, attr):
+    lines = []
+    seen = set()
+    for section in doc.sections:
+        part = getattr(section, attr)
+        if part.is_linked_to_previous:
+            continue
+        part_lines = []
+        _walk_blocks(part._element, part_lines)
+        for line in part_lines:
+            if line not in seen:
+                seen.add(line)
+                lines.append(line)
+    return lines
+
+
+def extract_text_from_docx(file_bytes) -> str:
+    """Extract text from a DOCX file in memory or on disk.
+
+    The body is walked once in document order, so paragraphs and tables keep their relative position.
+    Merged cells are emitted once, and nested tables, text boxes, content controls and headers/footers
+    are included.
+
+    Parameters
+    - file_bytes: Raw docx bytes, or a path to the DOCX (its zip members are then read from the file as needed)
+
+    Returns
+    - str: Combined text content of the document
+    """
+    from docx import Document
+
+    is_bytes = isinstance(file_bytes, (bytes, bytearray, memoryview))
+    doc = Document(BytesIO(file_bytes) if is_bytes else os.fspath(file_bytes))
+    texts = _header_footer_lines(doc, "header")
+    _walk_blocks(doc.element.body, texts)
+    texts.extend(_header_footer_lines(doc, "footer"))
     return "\n".join(texts)
 
 
-def extract_text_from_file(file_bytes: bytes, ext: str) -> str:
+def extract_text_from_file(file_bytes, ext: str) -> str:
     """Route text extraction based on file extension.
 
     Parameters
-    - file_bytes: Original file bytes
+    - file_bytes: Original file bytes, or a path to the file (see utils.spool)
     - ext: Lowercased extension without dot (e.g., "pdf", "docx")
 
     Returns
@@ -66,4 +239,14 @@ def extract_text_from_file(file_bytes: bytes, ext: str) -> str:
     elif ext.lower() == "docx":
         return extract_text_from_docx(file_bytes)
     else:
-        raise ValueError(f"Unsupported file type: {ext}")
\ No newline at end of file
+        raise ValueError(f"Unsupported file type: {ext}")
+
+def extract_pages_from_file(file_bytes, ext: str) -> list:
+    """Like extract_text_from_file, but PDFs keep one text per page (DOCX has no pages and gives one text).
+
+    Returns
+    - list[str]
+    """
+    if ext.lower() == "pdf":
+        return extract_pages_from_pdf(file_bytes)
+    return [extract_text_from_file(file_bytes, ext)]
@@ -0,0 +1,251 @@
+"""
+Near-duplicate resume index.
+
+The same resume often comes back with trivial edits (a new phone number, a re-exported PDF), which the
+exact-hash LLM cache misses. Each stored resume gets a MinHash signature over word shingles of its text, and
+the signature is split into LSH bands kept in an indexed SQLite table, so a lookup costs a handful of index
+probes regardless of how many resumes are stored. When a near-duplicate is found, its structured result is
+reused and only the fields whose sections changed are sent to the LLM.
+"""
+
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+
+from utils.llm import parse_json
+from utils.metrics import metrics
+from utils.pre_extractor import (EMAIL_RE, FIELD_SECTIONS, URL_RE, build_partial_prompt, fields_source_text,
+                                 find_phone, is_title_line)
+from utils.sectioning import segment_resume
+
+logger = logging.getLogger(__name__)
+
+DEDUP_ENABLED = os.getenv("RESUME_DEDUP", "1") != "0"
+DEFAULT_INDEX_PATH = os.getenv("RESUME_DEDUP_PATH", os.path.join(".cache", "dedup_index.sqlite3"))
+DEFAULT_THRESHOLD = float(os.getenv("RESUME_DEDUP_THRESHOLD", "0.8"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("RESUME_DEDUP_MAX_ENTRIES", "500000"))
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands of 4 rows: pairs above ~0.5 Jaccard similarity become candidates
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 3
+# Reusing a stored result only pays off if most fields are unchanged
+MAX_CHANGED_FIELDS = 5
+# With fewer recognised sections, text under unknown headings piles up in the neighbouring sections and a
+# section-level diff can no longer tell which fields changed
+MIN_RECOGNISED_SECTIONS = 3
+
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(1729)
+_PERMS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+_WORD_RE = re.compile(r"\w+")
+
+
+def shingles(text):
+    """Return the set of hashed word shingles of ``text`` (case- and whitespace-insensitive)."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        words = words + [""] * (SHINGLE_WORDS - len(words))
+    return {
+        int.from_bytes(hashlib.blake2b(" ".join(words[i:i + SHINGLE_WORDS]).encode("utf-8"),
+                                       digest_size=8).digest(), "little")
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+
+
+def minhash_signature(text):
+    """MinHash signature of ``text`` as an array of NUM_PERM 64-bit values."""
+    hashes = shingles(text)
+    return array("Q", (min((a * h + b) % _MERSENNE for h in hashes) for a, b in _PERMS))
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def band_keys(signature):
+    """One 63-bit LSH key per band."""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8, person=band.to_bytes(2, "little")).digest()
+        keys.append(int.from_bytes(digest, "little") >> 1)
+    return keys
+
+
+def _normalized(text):
+    return " ".join(text.lower().split())
+
+
+def _header_extras(header):
+    """Header lines other than the name and the contact lines, normalized."""
+    lines = [line for line in header.splitlines() if line.strip() and not is_title_line(line)]
+    return [_normalized(line) for line in lines[1:]
+            if not (EMAIL_RE.search(line) or find_phone(line) or URL_RE.search(line))]
+
+
+def changed_fields(old_text, new_text):
+    """Top-level schema fields whose source sections differ between two versions of a resume.
+
+    Returns None when the diff cannot be trusted: fewer than MIN_RECOGNISED_SECTIONS sections besides the
+    header are recognised in either version, or the header changed beyond the name and contact lines (so
+    text under an unrecognised heading may have changed).
+    """
+    old_sections = segment_resume(old_text)
+    new_sections = segment_resume(new_text)
+    for sections in (old_sections, new_sections):
+        if len([name for name in sections if name != "header"]) < MIN_RECOGNISED_SECTIONS:
+            return None
+    if _header_extras(old_sections.get("header", "")) != _header_extras(new_sections.get("header", "")):
+        return None
+    changed = {name for name in set(old_sections) | set(new_sections)
+               if _normalized(old_sections.get(name, "")) != _normalized(new_sections.get(name, ""))}
+    return [key for key, names in FIELD_SECTIONS.items() if changed.intersection(names)]
+
+
+class NearDuplicateIndex:
+    """SQLite-backed MinHash/LSH index of processed resumes and their structured results."""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, threshold=DEFAULT_THRESHOLD, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            " id INTEGER PRIMARY KEY,"
+            " text_hash TEXT UNIQUE NOT NULL,"
+            " text BLOB NOT NULL,"
+            " signature BLOB NOT NULL,"
+            " data TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS lsh (key INTEGER NOT NULL, resume_id INTEGER NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_lsh_key ON lsh(key)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_lsh_resume ON lsh(resume_id)")
+        self._conn.commit()
+
+    def add(self, text, data):
+        """Store ``text`` with its structured ``data``; replaces an earlier entry with the same text."""
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        signature = minhash_signature(text)
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM resumes WHERE text_hash = ?", (text_hash,)).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM lsh WHERE resume_id = ?", (row[0],))
+                self._conn.execute("DELETE FROM resumes WHERE id = ?", (row[0],))
+            cur = self._conn.execute(
+                "INSERT INTO resumes (text_hash, text, signature, data, created_at) VALUES (?, ?, ?, ?, ?)",
+                (text_hash, zlib.compress(text.encode("utf-8")), signature.tobytes(),
+                 json.dumps(data, ensure_ascii=False), time.time()),
+            )
+            self._conn.executemany("INSERT INTO lsh (key, resume_id) VALUES (?, ?)",
+                                   [(key, cur.lastrowid) for key in band_keys(signature)])
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        overflow = self._conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            stale = [(row[0],) for row in self._conn.execute(
+                "SELECT id FROM resumes ORDER BY created_at ASC LIMIT ?", (overflow,)
+            )]
+            self._conn.executemany("DELETE FROM lsh WHERE resume_id = ?", stale)
+            self._conn.executemany("DELETE FROM resumes WHERE id = ?", stale)
+
+    def query(self, text):
+        """Find the most similar stored resume at or above the threshold.
+
+        Returns
+        - tuple[float, str, dict] | None: (estimated similarity, stored text, stored data)
+        """
+        signature = minhash_signature(text)
+        keys = band_keys(signature)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, signature FROM resumes WHERE id IN "
+                f"(SELECT DISTINCT resume_id FROM lsh WHERE key IN ({','.join('?' * len(keys))}))",
+                keys,
+            ).fetchall()
+            best_id, best = None, 0.0
+            for resume_id, blob in rows:
+                similarity = estimate_similarity(signature, array("Q", blob))
+                if similarity > best:
+                    best_id, best = resume_id, similarity
+            if best_id is None or best < self.threshold:
+                return None
+            stored_text, data = self._conn.execute(
+                "SELECT text, data FROM resumes WHERE id = ?", (best_id,)
+            ).fetchone()
+        return best, zlib.decompress(stored_text).decode("utf-8"), json.loads(data)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM lsh")
+            self._conn.execute("DELETE FROM resumes")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def reuse_near_duplicate(text, index, use_cache=True, backend=None):
+    """Build the structured result for ``text`` from a near-duplicate in ``index``, if there is one.
+
+    Fields whose sections are unchanged are copied from the stored result; the changed ones are requested
+    from the LLM with a partial schema prompt and only their sections as input.
+
+    Returns
+    - dict | None: Resume data, or None when no usable near-duplicate exists (the caller then does a full parse)
+    """
+    match = index.query(text)
+    if match is None:
+        return None
+    similarity, stored_text, data = match
+    changed = changed_fields(stored_text, text)
+    if changed is None or len(changed) > MAX_CHANGED_FIELDS:
+        metrics.inc("dedup_rejected_total")
+        return None
+
+    metrics.inc("dedup_hits_total")
+    logger.info("Near-duplicate found (similarity %.2f), re-parsing %s", similarity, changed or "nothing")
+    if changed:
+        partial = parse_json(build_partial_prompt(changed), fields_source_text(changed, text),
+                             use_cache=use_cache, backend=backend)
+        for key in changed:
+            if key in partial:
+                data[key] = partial[key]
+    return data
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_default_index() -> NearDuplicateIndex:
+    """Return the process-wide index, creating it on first use."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = NearDuplicateIndex()
+        return _default_index
@@ -0,0 +1,200 @@
+"""
+Edits to already converted resumes.
+
+An edit is a JSON patch (RFC 6902: add, remove, replace, move, copy and test operations) against a finished
+job's stored structured data. The patched data is re-validated locally (utils.schema, without the source text,
+so there is no LLM call); an edit that makes a field invalid is rejected rather than stored with that field
+emptied. The document is updated from a cached src.docx_writer.IncrementalDocument that
+re-renders only the layout regions whose data changed. Cached documents are kept per job in a small
+in-process LRU (RESUME_EDIT_CACHE_SIZE). PDF results are re-rendered whole, which is already fast.
+"""
+
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from utils.metrics import metrics
+from utils.results_archive import result_format
+from utils.schema import validate_resume
+
+DEFAULT_EDIT_CACHE_SIZE = int(os.getenv("RESUME_EDIT_CACHE_SIZE", "64"))
+
+_documents = OrderedDict()
+_documents_lock = threading.Lock()
+
+
+class PatchError(ValueError):
+    """The patch is malformed, does not apply to the data, or one of its ``test`` operations failed."""
+
+
+def _tokens(pointer):
+    """Split a JSON pointer ("/experience/0/title") into unescaped reference tokens."""
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+        raise PatchError(f"Invalid JSON pointer {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer.split("/")[1:]]
+
+
+def _index(container, token, pointer, append=False):
+    if append and token == "-":
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise PatchError(f"Invalid list index {token!r} in {pointer!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not append):
+        raise PatchError(f"List index {index} out of range in {pointer!r}")
+    return index
+
+
+def _resolve(doc, tokens, pointer):
+    """Return the value the tokens point to."""
+    for token in tokens:
+        if isinstance(doc, dict):
+            if token not in doc:
+                raise PatchError(f"Path {pointer!r} does not exist")
+            doc = doc[token]
+        elif isinstance(doc, list):
+            doc = doc[_index(doc, token, pointer)]
+        else:
+            raise PatchError(f"Path {pointer!r} does not exist")
+    return doc
+
+
+def _add(doc, tokens, value, pointer):
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1], pointer)
+    if isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, tokens[-1], pointer, append=True), value)
+    else:
+        raise PatchError(f"Cannot add to {pointer!r}")
+    return doc
+
+
+def _remove(doc, tokens, pointer):
+    if not tokens:
+        raise PatchError("Cannot remove the whole document")
+    parent = _resolve(doc, tokens[:-1], pointer)
+    if isinstance(parent, dict):
+        if tokens[-1] not in parent:
+            raise PatchError(f"Path {pointer!r} does not exist")
+        return parent.pop(tokens[-1])
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, tokens[-1], pointer))
+    raise PatchError(f"Path {pointer!r} does not exist")
+
+
+def apply_patch(data, patch):
+    """Apply a JSON patch to a copy of ``data``; ``data`` itself is left untouched.
+
+    Parameters
+    - data: The structured resume dict
+    - patch: List of operation dicts, e.g. [{"op": "replace", "path": "/skills/technical/0", "value": "Go"}]
+
+    Returns
+    - dict: The patched copy
+
+    Raises
+    - PatchError: When an operation is malformed or does not apply; no partial result is returned
+    """
+    if not isinstance(patch, list):
+        raise PatchError("A JSON patch is a list of operations")
+    doc = copy.deepcopy(data)
+    for operation in patch:
+        if not isinstance(operation, dict) or "path" not in operation:
+            raise PatchError(f"Invalid patch operation {operation!r}")
+        op, pointer = operation.get("op"), operation["path"]
+        tokens = _tokens(pointer)
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise PatchError(f"{op!r} operation on {pointer!r} needs a value")
+        if op == "add":
+            doc = _add(doc, tokens, copy.deepcopy(operation["value"]), pointer)
+        elif op == "remove":
+            _remove(doc, tokens, pointer)
+        elif op == "replace":
+            if tokens:
+                _remove(doc, tokens, pointer)
+            doc = _add(doc, tokens, copy.deepcopy(operation["value"]), pointer)
+        elif op in ("move", "copy"):
+            source = operation.get("from")
+            source_tokens = _tokens(source)
+            if op == "move" and tokens[:len(source_tokens)] == source_tokens and tokens != source_tokens:
+                raise PatchError(f"Cannot move {source!r} into its own child {pointer!r}")
+            if op == "move":
+                value = _remove(doc, source_tokens, source)
+            else:
+                value = copy.deepcopy(_resolve(doc, source_tokens, source))
+            doc = _add(doc, tokens, value, pointer)
+        elif op == "test":
+            if _resolve(doc, tokens, pointer) != operation["value"]:
+                raise PatchError(f"Test failed at {pointer!r}")
+        else:
+            raise PatchError(f"Unknown patch operation {op!r}")
+    return doc
+
+
+def _cached_document(job_id, data):
+    """The job's IncrementalDocument, rebuilt when the cached one is missing or stale (edited elsewhere)."""
+    from src.docx_writer import IncrementalDocument
+
+    with _documents_lock:
+        document = _documents.pop(job_id, None)
+    if document is None or document.data != data:
+        document = IncrementalDocument(data)
+    return document
+
+
+def _store_document(job_id, document, max_entries=DEFAULT_EDIT_CACHE_SIZE):
+    with _documents_lock:
+        _documents[job_id] = document
+        while len(_documents) > max_entries:
+            _documents.popitem(last=False)
+
+
+def edit_resume(queue, job_id, patch):
+    """Apply a JSON patch to a finished job's data and update its stored result without calling the LLM.
+
+    Parameters
+    - queue: utils.jobs.JobQueue holding the job
+    - job_id: A job in the DONE state
+    - patch: JSON patch against the job's structured data (see apply_patch)
+
+    Returns
+    - tuple[dict, bytes]: The new data and the re-rendered DOCX/PDF
+
+    Raises
+    - KeyError: When the job does not exist or has not finished
+    - PatchError: When the patch does not apply or leaves fields invalid that were valid before
+    """
+    started = time.perf_counter()
+    row = queue.get_data(job_id)
+    if row is None:
+        raise KeyError(f"No finished job {job_id!r}")
+    data, previous = row
+    resume, invalid = validate_resume(apply_patch(data, patch))
+    # Fields that were already invalid in the stored data (e.g. a title the LLM never returned) do not block edits
+    broken = sorted(set(invalid) - set(validate_resume(data)[1]))
+    if broken:
+        raise PatchError(f"Patch leaves invalid fields: {', '.join(broken)}")
+    new_data = resume.to_dict()
+
+    if result_format(previous) == "pdf":
+        from utils.pipeline import render_resume
+
+        regions = "all"
+        resume_bytes = render_resume(new_data, output_format="pdf")
+    else:
+        document = _cached_document(job_id, data)
+        regions = ",".join(document.update(new_data)) or "none"
+        resume_bytes = document.to_bytes()
+        _store_document(job_id, document)
+
+    if not queue.update_result(job_id, new_data, resume_bytes):
+        raise KeyError(f"No finished job {job_id!r}")
+    metrics.inc("edits_total")
+    metrics.observe("edit_seconds", time.perf_counter() - started, job=job_id, regions=regions)
+    return new_data, resume_bytes
@@ -0,0 +1,428 @@
+"""
+Persistent job queue and worker loop for resume conversions.
+
+Jobs (one uploaded file each, grouped by batch) are stored in a SQLite file together with their status, attempt
+count and result, so they survive browser refreshes and app restarts. Worker processes claim jobs with a lease,
+run extract -> parse -> render and store the DOCX or PDF. Failed attempts are retried with backoff, and jobs whose
+worker died are picked up again once the lease expires. While a job runs, its worker process renews the lease
+every third of RESUME_JOB_LEASE_SECONDS, so a slow job is not handed to a second worker; only a dead worker lets its
+lease run out. Workers also delete finished jobs older than RESUME_JOB_RETENTION_SECONDS (0 keeps them forever).
+Throughput scales by starting more workers (``python worker.py``) against the same queue file.
+
+Input files are copied into and out of the queue in chunks (SQLite incremental blob I/O), and workers hand inputs
+larger than RESUME_SPOOL_BYTES to the pipeline as temporary files rather than bytes (utils.spool).
+"""
+
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from config.prompts import PromptHolder
+from utils.llm_client import is_retryable
+from utils.metrics import metrics
+from utils.pipeline import convert_file, warm_up as warm_up_pipeline
+from utils.spool import CHUNK_SIZE, SPOOL_THRESHOLD_BYTES, stream_size, temporary_copy
+from utils.text_compactor import PROMPT_TOKEN_BUDGET
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = os.getenv("RESUME_QUEUE_PATH", os.path.join(".cache", "jobs.sqlite3"))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("RESUME_JOB_MAX_ATTEMPTS", "3"))
+DEFAULT_LEASE_SECONDS = int(os.getenv("RESUME_JOB_LEASE_SECONDS", "600"))
+DEFAULT_RETENTION_SECONDS = int(os.getenv("RESUME_JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+RETRY_DELAY_SECONDS = 5.0
+PURGE_INTERVAL_SECONDS = 3600.0
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+# Incremental blob I/O needs Python 3.11+; older interpreters read and write inputs whole
+_BLOB_IO = hasattr(sqlite3.Connection, "blobopen")
+_INSERT_JOB = ("INSERT INTO jobs (id, batch_id, position, file_name, input, options, status, available_at,"
+               " created_at, updated_at) VALUES (?, ?, ?, ?, {input}, ?, ?, ?, ?, ?)")
+
+
+class JobQueue:
+    """SQLite-backed queue; safe to share between threads and processes on one machine."""
+
+    def __init__(self, path=DEFAULT_QUEUE_PATH, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 lease_seconds=DEFAULT_LEASE_SECONDS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Autocommit mode so claim() can take the write lock explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " batch_id TEXT NOT NULL,"
+            " position INTEGER NOT NULL,"
+            " file_name TEXT NOT NULL,"
+            " input BLOB NOT NULL,"
+            " options TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " error TEXT,"
+            " data TEXT,"
+            " result BLOB,"
+            " worker TEXT,"
+            " available_at REAL NOT NULL,"
+            " lease_until REAL,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, available_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_batch ON jobs(batch_id, position)")
+
+    def submit(self, files, batch_id=None, **options):
+        """Queue one job per (file_name, source) pair.
+
+        Parameters
+        - files: Sequence of (file_name, source) tuples, where source is the file's bytes, a path or a readable
+          binary file object (e.g. an upload). Paths and file objects are copied into the queue in chunks
+        - batch_id: Groups the jobs for list_batch(); a new id is generated when omitted
+        - options: parse_mode, use_cache, token_budget and output_format forwarded to the pipeline
+
+        Returns
+        - str: The batch id
+        """
+        batch_id = batch_id or uuid.uuid4().hex
+        now = time.time()
+        fields = json.dumps(options), QUEUED, now, now, now
+        count = 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for position, (name, source) in enumerate(files):
+                    self._insert_job((uuid.uuid4().hex, batch_id, position, name), source, fields)
+                    count += 1
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        metrics.inc("jobs_submitted_total", count)
+        return batch_id
+
+    def _insert_job(self, key, source, fields):
+        """Insert one job row; called by submit() with the lock held and a transaction open."""
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as f:
+                return self._insert_job(key, f, fields)
+        if not isinstance(source, (bytes, bytearray, memoryview)):
+            size = stream_size(source)
+            if size is not None and _BLOB_IO:
+                cur = self._conn.execute(_INSERT_JOB.format(input="zeroblob(?)"), (*key, size, *fields))
+                with self._conn.blobopen("jobs", "input", cur.lastrowid) as blob:
+                    while chunk := source.read(min(CHUNK_SIZE, size - blob.tell())):
+                        blob.write(chunk)
+                return
+            source = source.read()
+        self._conn.execute(_INSERT_JOB.format(input="?"), (*key, source, *fields))
+
+    def claim(self, worker_id):
+        """Lease the oldest runnable job to ``worker_id``.
+
+        Returns
+        - dict | None: id, file_name, size (of the input file), options and attempts of the claimed job. The
+          input itself is read with get_input() or copy_input()
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs whose worker died on the last allowed attempt are not run again
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, lease_until = NULL, updated_at = ?"
+                    " WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                    (FAILED, "worker lease expired", now, RUNNING, now, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    "SELECT id, file_name, length(input), options, attempts FROM jobs"
+                    " WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_until < ?)"
+                    " ORDER BY created_at, position LIMIT 1",
+                    (QUEUED, now, RUNNING, now),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, lease_until = ?,"
+                        " updated_at = ? WHERE id = ?",
+                        (RUNNING, worker_id, now + self.lease_seconds, now, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return {"id": row[0], "file_name": row[1], "size": row[2], "options": json.loads(row[3]),
+                "attempts": row[4] + 1}
+
+    def get_input(self, job_id):
+        """Return the uploaded file of one job as bytes."""
+        with self._lock:
+            row = self._conn.execute("SELECT input FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No job {job_id!r}")
+        return row[0]
+
+    def copy_input(self, job_id, out):
+        """Write the uploaded file of one job to the binary file object ``out`` in chunks."""
+        if not _BLOB_IO:
+            out.write(self.get_input(job_id))
+            return
+        with self._lock:
+            row = self._conn.execute("SELECT rowid FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"No job {job_id!r}")
+            with self._conn.blobopen("jobs", "input", row[0], readonly=True) as blob:
+                while chunk := blob.read(CHUNK_SIZE):
+                    out.write(chunk)
+
+    def complete(self, job_id, worker_id, data, resume_bytes):
+        """Store the result; ignored if the lease was lost to another worker."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, data = ?, result = ?, error = NULL, lease_until = NULL,"
+                " updated_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                (DONE, json.dumps(data, ensure_ascii=False), resume_bytes, time.time(), job_id, worker_id, RUNNING),
+            )
+
+    def renew(self, leases):
+        """Extend the leases of running jobs.
+
+        Parameters
+        - leases: (job id, worker id) pairs; jobs whose lease was lost to another worker are left alone
+        """
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = ?",
+                [(time.time() + self.lease_seconds, job_id, worker_id, RUNNING) for job_id, worker_id in leases],
+            )
+
+    def fail(self, job_id, worker_id, error, retry):
+        """Record a failed attempt, re-queueing the job with backoff while attempts remain and ``retry`` is set."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            attempts = row[0] if row else self.max_attempts
+            if retry and attempts < self.max_attempts:
+                status, available_at = QUEUED, now + RETRY_DELAY_SECONDS * 2 ** (attempts - 1)
+            else:
+                status, available_at = FAILED, now
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_until = NULL, updated_at = ?"
+                " WHERE id = ? AND worker = ? AND status = ?",
+                (status, error, available_at, now, job_id, worker_id, RUNNING),
+            )
+        return status
+
+    def retry(self, job_id):
+        """Put a failed job back in the queue with a fresh attempt budget."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, error = NULL, available_at = ?, updated_at = ?"
+                " WHERE id = ? AND status = ?",
+                (QUEUED, now, now, job_id, FAILED),
+            )
+
+    def list_batch(self, batch_id, with_results=False):
+        """Jobs of one batch in upload order; ``result`` (DOCX/PDF bytes) and ``data`` only when requested."""
+        columns = "id, file_name, status, attempts, error, updated_at"
+        if with_results:
+            columns += ", data, result"
+        with self._lock:
+            cur = self._conn.execute(
+                f"SELECT {columns} FROM jobs WHERE batch_id = ? ORDER BY position", (batch_id,)
+            )
+            names = [d[0] for d in cur.description]
+            jobs = [dict(zip(names, row)) for row in cur.fetchall()]
+        for job in jobs:
+            if job.get("data"):
+                job["data"] = json.loads(job["data"])
+        return jobs
+
+    def done_job_ids(self, batch_id):
+        """Ids of the finished jobs of a batch, in upload order."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT id FROM jobs WHERE batch_id = ? AND status = ? ORDER BY position", (batch_id, DONE)
+            )]
+
+    def get_result(self, job_id):
+        """Return (file_name, DOCX/PDF bytes) of one finished job, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_name, result FROM jobs WHERE id = ? AND status = ?", (job_id, DONE)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def get_data(self, job_id):
+        """Return (structured data, DOCX/PDF bytes) of one finished job, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, result FROM jobs WHERE id = ? AND status = ?", (job_id, DONE)
+            ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def update_result(self, job_id, data, resume_bytes):
+        """Replace the data and result of a finished job (an edit); returns False if the job is not done."""
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE jobs SET data = ?, result = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (json.dumps(data, ensure_ascii=False), resume_bytes, time.time(), job_id, DONE),
+            )
+        return cur.rowcount == 1
+
+    def counts(self):
+        """Number of jobs per status."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def purge(self, older_than_seconds):
+        """Delete finished jobs last updated more than ``older_than_seconds`` ago."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cur = self._conn.execute(
+                    "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                    (DONE, FAILED, time.time() - older_than_seconds),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return cur.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+@contextmanager
+def _job_input(queue, job):
+    """A claimed job's input as bytes, or as the path of a temporary copy when it exceeds RESUME_SPOOL_BYTES."""
+    if job["size"] <= SPOOL_THRESHOLD_BYTES:
+        yield queue.get_input(job["id"])
+        return
+    suffix = os.path.splitext(job["file_name"])[1]
+    with temporary_copy(lambda out: queue.copy_input(job["id"], out), suffix) as path:
+        yield path
+
+
+def process_job(queue, job, worker_id):
+    """Run one claimed job through the pipeline and record the outcome."""
+    options = job["options"]
+    with _job_input(queue, job) as source:
+        result = convert_file(
+            job["file_name"],
+            source,
+            PromptHolder.STRUCTURE_SCHEMA_PROMPT,
+            parse_mode=options.get("parse_mode", "full"),
+            use_cache=options.get("use_cache", True),
+            token_budget=options.get("token_budget", PROMPT_TOKEN_BUDGET),
+            output_format=options.get("output_format", "docx"),
+        )
+    if result.ok:
+        queue.complete(job["id"], worker_id, result.data, result.resume_bytes)
+        metrics.inc("jobs_done_total")
+        return DONE
+    # Bad input files fail the same way every time; only transient errors are worth another attempt
+    retry = is_retryable(result.error) or isinstance(result.error, json.JSONDecodeError)
+    status = queue.fail(job["id"], worker_id, repr(result.error), retry)
+    metrics.inc("jobs_failed_total" if status == FAILED else "jobs_retried_total")
+    logger.warning("Job %s (%s) attempt %d failed: %r", job["id"], job["file_name"], job["attempts"], result.error)
+    return status
+
+
+def _maintain(queue, running, retention_seconds, done):
+    """Renew the leases in ``running`` (worker id -> job id) and purge old jobs until ``done`` is set."""
+    next_purge = 0.0
+    while True:
+        if retention_seconds and time.time() >= next_purge:
+            try:
+                purged = queue.purge(retention_seconds)
+                if purged:
+                    logger.info("Purged %d finished jobs", purged)
+            except sqlite3.Error:
+                logger.exception("Purging finished jobs failed")
+            next_purge = time.time() + PURGE_INTERVAL_SECONDS
+        if done.wait(queue.lease_seconds / 3):
+            return
+        leases = [(job_id, worker_id) for worker_id, job_id in list(running.items())]
+        if leases:
+            try:
+                queue.renew(leases)
+            except sqlite3.Error:
+                logger.exception("Renewing job leases failed")
+
+
+def run_worker(path=DEFAULT_QUEUE_PATH, threads=4, poll_interval=0.5, burst=False, stop_event=None,
+               warm_up=True, retention_seconds=DEFAULT_RETENTION_SECONDS):
+    """Process jobs from the queue at ``path`` until stopped.
+
+    Parameters
+    - path: Queue database file
+    - threads: Jobs processed concurrently by this process (the LLM stage is network-bound)
+    - poll_interval: Seconds to sleep when the queue is empty
+    - burst: Return once no jobs are queued or running instead of polling forever
+    - stop_event: Optional threading/multiprocessing Event that ends the loop
+    - warm_up: Load dependencies and create the LLM client before claiming the first job
+    - retention_seconds: Age after which finished jobs are deleted (0 = keep them)
+
+    Returns
+    - int: Number of jobs processed by this process
+    """
+    if warm_up:
+        try:
+            warm_up_pipeline()
+        except Exception:
+            # e.g. missing credentials; the first job will report the real error
+            logger.exception("Worker warm-up failed, continuing cold")
+    queue = JobQueue(path)
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    processed = []
+    running = {}
+
+    def loop(n):
+        worker_id = f"{prefix}:{n}"
+        while stop_event is None or not stop_event.is_set():
+            job = queue.claim(worker_id)
+            if job is None:
+                counts = queue.counts() if burst else {}
+                if burst and not counts.get(QUEUED) and not counts.get(RUNNING):
+                    return
+                time.sleep(poll_interval)
+                continue
+            running[worker_id] = job["id"]
+            try:
+                process_job(queue, job, worker_id)
+            finally:
+                del running[worker_id]
+            processed.append(job["id"])
+
+    workers = [threading.Thread(target=loop, args=(n,), name=f"job-worker-{n}", daemon=True)
+               for n in range(max(1, threads))]
+    done = threading.Event()
+    maintainer = threading.Thread(target=_maintain, args=(queue, running, retention_seconds, done),
+                                  name="job-maintainer", daemon=True)
+    maintainer.start()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    done.set()
+    maintainer.join()
+    queue.close()
+    return len(processed)
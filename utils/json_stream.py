@@ -0,0 +1,149 @@
+"""
+Incremental parser for a streamed top-level JSON object.
+
+The LLM streams its answer in arbitrary text chunks. IncrementalJSONObjectParser scans each chunk once and
+emits an event as soon as a top-level field is complete, and for list fields such as ``experience`` as soon as
+each item is complete, so sections can be shown and rendered before the response has finished.
+"""
+
+
+import json
+from dataclasses import dataclass
+
+# Top-level list fields whose items are emitted one by one
+ITEM_SECTIONS = ("experience", "education", "projects")
+
+
+@dataclass
+class SectionEvent:
+    """A completed piece of the streamed object.
+
+    ``index`` is None for a whole top-level field and the item position for items of ITEM_SECTIONS.
+    """
+    section: str
+    value: object
+    index: int = None
+
+
+class IncrementalJSONObjectParser:
+    def __init__(self, item_sections=ITEM_SECTIONS):
+        self.item_sections = set(item_sections)
+        self._text = ""
+        self._pos = 0
+        self._start = None
+        self._end = None
+        self._depth = 0
+        self._in_str = False
+        self._esc = False
+        self._expect = "key"  # "key", "value" or "after" (container value closed, waiting for , or })
+        self._key_start = None
+        self._key = None
+        self._value_start = None
+        self._item_mode = False
+        self._item_start = None
+        self._item_index = 0
+        self.complete = False
+
+    def _value_event(self, end):
+        value = json.loads(self._text[self._value_start:end])
+        self._value_start = None
+        return SectionEvent(self._key, value)
+
+    def _item_event(self, end):
+        value = json.loads(self._text[self._item_start:end])
+        event = SectionEvent(self._key, value, self._item_index)
+        self._item_start = None
+        self._item_index += 1
+        return event
+
+    def feed(self, chunk):
+        """Consume the next chunk of text and return the list of events it completed."""
+        self._text += chunk
+        text = self._text
+        events = []
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif c == "\\":
+                    self._esc = True
+                elif c == '"':
+                    self._in_str = False
+                    if self._depth == 1 and self._expect == "key":
+                        self._key = json.loads(text[self._key_start:i + 1])
+                continue
+            if self._depth == 0:
+                # Skip anything before the opening brace (whitespace, stray prefixes)
+                if c == "{" and not self.complete:
+                    self._depth = 1
+                    self._start = i
+                continue
+            if c.isspace():
+                continue
+
+            top = self._depth == 1
+            in_items = self._depth == 2 and self._item_mode
+            if c == '"':
+                self._in_str = True
+                if top and self._expect == "key":
+                    self._key_start = i
+                elif top and self._expect == "value" and self._value_start is None:
+                    self._value_start = i
+                elif in_items and self._item_start is None:
+                    self._item_start = i
+            elif c in "{[":
+                if top and self._expect == "value" and self._value_start is None:
+                    self._value_start = i
+                    self._item_mode = c == "[" and self._key in self.item_sections
+                    self._item_index = 0
+                elif in_items and self._item_start is None:
+                    self._item_start = i
+                self._depth += 1
+            elif c in "}]":
+                if in_items and self._item_start is not None:
+                    events.append(self._item_event(i))
+                if top:
+                    # Closing the object itself; flush a pending scalar value
+                    if self._expect == "value" and self._value_start is not None:
+                        events.append(self._value_event(i))
+                    self._depth = 0
+                    self._end = i + 1
+                    self.complete = True
+                    continue
+                self._depth -= 1
+                if self._depth == 1 and self._expect == "value":
+                    events.append(self._value_event(i + 1))
+                    self._item_mode = False
+                    self._expect = "after"
+            elif c == ",":
+                if top:
+                    if self._expect == "value" and self._value_start is not None:
+                        events.append(self._value_event(i))
+                    self._expect = "key"
+                elif in_items and self._item_start is not None:
+                    events.append(self._item_event(i))
+            elif c == ":":
+                if top and self._expect == "key":
+                    self._expect = "value"
+            else:
+                # Start of a number / true / false / null literal
+                if top and self._expect == "value" and self._value_start is None:
+                    self._value_start = i
+                elif in_items and self._item_start is None:
+                    self._item_start = i
+        self._pos = len(text)
+        return events
+
+    def result(self):
+        """Parse the complete text received so far as one JSON document."""
+        return json.loads(self._text[self._start or 0:self._end])
+
+
+def iter_section_events(data, item_sections=ITEM_SECTIONS):
+    """Produce the same events the streaming parser would, for an already complete dict (e.g. a cache hit)."""
+    for key, value in data.items():
+        if key in item_sections and isinstance(value, list):
+            for index, item in enumerate(value):
+                yield SectionEvent(key, item, index)
+        yield SectionEvent(key, value)
@@ -1,43 +1,122 @@
 """
 LLM (Large Language Model) utility module for generating structured JSON content from a system prompt and extracted resume content.
-It uses the Google Gemini API to parse the input and return structured data.
+It uses the Google Gemini API by default to parse the input and return structured data; other backends
+(see utils.llm_backends) can be swapped in with set_backend or the RESUME_LLM_BACKEND environment variable.
 """
 
 
-from google import genai
-from dotenv import load_dotenv
-import os
 import json
+import threading
+import time
 
-# Load variables from .env into environment
-load_dotenv()
-
-api_key = os.getenv("GEMINI_API_KEY ")
-
-client = genai.Client(api_key=api_key)
-
-
-def parse_json(system_prompt ,extracted_resume_content):
-    
-    resp = client.models.generate_content(
-        model="gemini-1.5-flash",
-        contents=[
-        {
-            "role": "user",
-            "parts": [
-                {
-                    "text": f"{system_prompt}\n\n{extracted_resume_content}"
-                }
-            ]
-        }
-    ],
-        config={
-            "temperature": 0.7,  # same as OpenAI's temperature
-            "response_mime_type": "application/json"  # ensures valid JSON
-        }
-    )
+from utils.cache import get_default_cache, make_cache_key
+from utils.llm_backends import backend_from_env
+from utils.llm_client import resilient_from_env
+from utils.json_stream import IncrementalJSONObjectParser, SectionEvent, iter_section_events
+from utils.metrics import metrics
+from utils.text_compactor import estimate_tokens
+
+MODEL_NAME = "gemini-1.5-flash"
+GENERATION_CONFIG = {
+    "temperature": 0.7,  # same as OpenAI's temperature
+    "response_mime_type": "application/json"  # ensures valid JSON
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the active LLM backend, creating it from the environment on first use.
+
+    The default backend is wrapped in a ResilientBackend (rate limits, retries, deadlines, hedging).
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = resilient_from_env(backend_from_env(model=MODEL_NAME, config=GENERATION_CONFIG))
+        return _backend
+
+
+def set_backend(backend):
+    """Replace the process-wide LLM backend (e.g. with a FakeBackend for tests and benchmarks)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def parse_json(system_prompt ,extracted_resume_content, use_cache=True, backend=None):
+    """Turn extracted resume text into structured JSON via the LLM backend.
+
+    Results are cached on (content, prompt, model, config) so re-uploads of the same resume skip the LLM call.
+    """
+    backend = backend or get_backend()
+    cache = get_default_cache() if use_cache else None
+    key = make_cache_key(extracted_resume_content, system_prompt, backend.model, backend.config)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            metrics.inc("cache_hits_total")
+            return cached
+        metrics.inc("cache_misses_total")
+
+    metrics.inc("llm_calls_total")
+    metrics.inc("input_chars_total", len(extracted_resume_content))
+    metrics.inc("prompt_tokens_total", estimate_tokens(system_prompt) + estimate_tokens(extracted_resume_content))
+    with metrics.span("llm_call_seconds", backend=backend.name, model=backend.model):
+        text = backend.generate(system_prompt, extracted_resume_content)
 
     # Convert to Python dict
-    data = json.loads(resp.text)
+    with metrics.span("json_decode_seconds", chars=len(text)):
+        data = json.loads(text)
     # print(json.dumps(data, indent=2))
-    return data
\ No newline at end of file
+    if cache is not None:
+        cache.set(key, data)
+    return data
+
+
+async def parse_json_async(system_prompt, extracted_resume_content, use_cache=True, backend=None):
+    """Async wrapper around parse_json for callers running inside an event loop."""
+    import asyncio  # already loaded whenever an event loop is running
+
+    return await asyncio.to_thread(parse_json, system_prompt, extracted_resume_content, use_cache, backend)
+
+
+def parse_json_stream(system_prompt, extracted_resume_content, use_cache=True, backend=None):
+    """Streaming variant of parse_json.
+
+    Yields utils.json_stream.SectionEvent objects as soon as each top-level field (and each experience,
+    education or project item) of the model output is complete. The last event has section ``"__complete__"``
+    and carries the full dict, which is cached like parse_json results.
+    """
+    backend = backend or get_backend()
+    cache = get_default_cache() if use_cache else None
+    key = make_cache_key(extracted_resume_content, system_prompt, backend.model, backend.config)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            metrics.inc("cache_hits_total")
+            yield from iter_section_events(cached)
+            yield SectionEvent("__complete__", cached)
+            return
+        metrics.inc("cache_misses_total")
+
+    metrics.inc("llm_calls_total")
+    metrics.inc("input_chars_total", len(extracted_resume_content))
+    metrics.inc("prompt_tokens_total", estimate_tokens(system_prompt) + estimate_tokens(extracted_resume_content))
+    parser = IncrementalJSONObjectParser()
+    first_event = True
+    started = time.perf_counter()
+    with metrics.span("llm_call_seconds", backend=backend.name, model=backend.model, streaming=True) as span:
+        for chunk in backend.stream(system_prompt, extracted_resume_content):
+            for event in parser.feed(chunk):
+                if first_event:
+                    span["first_section_ms"] = round((time.perf_counter() - started) * 1000, 3)
+                    first_event = False
+                yield event
+
+    with metrics.span("json_decode_seconds"):
+        data = parser.result()
+    if cache is not None:
+        cache.set(key, data)
+    yield SectionEvent("__complete__", data)
@@ -0,0 +1,261 @@
+"""
+LLM backends used by utils.llm.parse_json.
+
+A backend turns (system prompt, resume text) into the raw JSON text returned by the model. GeminiBackend talks
+to the Google Gemini API; FakeBackend is a local, deterministic stand-in that replays recorded responses or
+builds a rule-based answer, with optional simulated latency and failures, so the rest of the pipeline can be
+tested and benchmarked offline.
+"""
+
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+
+class LLMBackendError(RuntimeError):
+    """Raised when a backend fails to produce a response."""
+
+
+class LLMBackend:
+    """Interface for LLM backends."""
+
+    name = "base"
+    model = None
+    config = None
+
+    def generate(self, system_prompt: str, content: str) -> str:
+        """Return the raw model output (a JSON document as text)."""
+        raise NotImplementedError
+
+    def stream(self, system_prompt: str, content: str):
+        """Yield the raw model output in chunks as it is produced. Defaults to a single chunk."""
+        yield self.generate(system_prompt, content)
+
+    def warm_up(self):
+        """Create clients and load SDKs ahead of the first call. No-op by default."""
+
+
+class GeminiBackend(LLMBackend):
+    name = "gemini"
+
+    def __init__(self, model="gemini-1.5-flash", config=None, api_key=None, timeout=None):
+        self.model = model
+        self.config = config or {
+            "temperature": 0.7,  # same as OpenAI's temperature
+            "response_mime_type": "application/json"  # ensures valid JSON
+        }
+        self._api_key = api_key
+        self.timeout = timeout
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        # Created on first use so importing the module never needs credentials or network
+        with self._lock:
+            if self._client is None:
+                from google import genai
+                from google.genai import types
+                from dotenv import load_dotenv
+
+                load_dotenv()
+                # HTTP-level timeout so abandoned attempts do not hold a worker thread forever
+                http_options = types.HttpOptions(timeout=int(self.timeout * 1000)) if self.timeout else None
+                self._client = genai.Client(api_key=self._api_key or os.getenv("GEMINI_API_KEY"),
+                                            http_options=http_options)
+            return self._client
+
+    def warm_up(self):
+        self.client
+
+    def _contents(self, system_prompt, content):
+        return [
+            {
+                "role": "user",
+                "parts": [
+                    {
+                        "text": f"{system_prompt}\n\n{content}"
+                    }
+                ]
+            }
+        ]
+
+    def generate(self, system_prompt, content):
+        resp = self.client.models.generate_content(
+            model=self.model,
+            contents=self._contents(system_prompt, content),
+            config=self.config,
+        )
+        return resp.text
+
+    def stream(self, system_prompt, content):
+        for chunk in self.client.models.generate_content_stream(
+            model=self.model,
+            contents=self._contents(system_prompt, content),
+            config=self.config,
+        ):
+            if chunk.text:
+                yield chunk.text
+
+
+def prompt_digest(system_prompt, content):
+    """Key used to file recorded responses."""
+    return hashlib.sha256(f"{system_prompt}\n\n{content}".encode("utf-8")).hexdigest()
+
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_URL_RE = re.compile(r"(?:https?://|www\.)[^\s,;|)]+", re.IGNORECASE)
+
+
+def rule_based_response(content):
+    """Build a schema-shaped dict from resume text with simple regexes (no model involved)."""
+    lines = [line.strip() for line in content.splitlines() if line.strip()]
+    email = _EMAIL_RE.search(content)
+    # Imported here: utils.pre_extractor depends on utils.llm, which imports this module
+    from utils.pre_extractor import find_phone
+
+    phone = find_phone(content)
+    links = []
+    for url in _URL_RE.findall(content):
+        url = url.rstrip(".")
+        links.append(url if url.lower().startswith("http") else f"https://{url}")
+    return {
+        "name": lines[0] if lines else "",
+        "contact": {
+            "email": email.group(0) if email else None,
+            "phone": phone.strip() if phone else None,
+            "location": None,
+            "links": links,
+        },
+        "summary": None,
+        "experience": [],
+        "education": [],
+        "skills": {"technical": [], "tools": [], "soft": []},
+        "certifications": [],
+        "projects": [],
+        "awards": [],
+        "languages": [],
+    }
+
+
+class FakeBackend(LLMBackend):
+    """Deterministic offline backend.
+
+    Parameters
+    - recordings: Optional directory of ``<prompt_digest>.json`` files, or a dict mapping digests to
+      responses (dict or JSON text). Unknown prompts fall back to ``responder``
+    - responder: Callable ``(system_prompt, content) -> dict``; defaults to rule_based_response
+    - latency: Simulated seconds per call
+    - jitter: Extra uniformly distributed seconds added to each call
+    - failure_rate: Probability in [0, 1] that a call raises LLMBackendError
+    - seed: Seed for the latency/failure random generator
+    - chunk_size: Characters per chunk when streaming; the simulated latency is spread over the chunks
+    """
+
+    name = "fake"
+
+    def __init__(self, recordings=None, responder=None, latency=0.0, jitter=0.0, failure_rate=0.0, seed=0,
+                 model="fake-model", chunk_size=64):
+        self.model = model
+        self.config = {"latency": latency, "jitter": jitter, "failure_rate": failure_rate}
+        self.recordings = recordings
+        self.responder = responder or (lambda system_prompt, content: rule_based_response(content))
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _recorded(self, digest):
+        if self.recordings is None:
+            return None
+        if isinstance(self.recordings, dict):
+            value = self.recordings.get(digest)
+        else:
+            path = os.path.join(self.recordings, f"{digest}.json")
+            if not os.path.exists(path):
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        if value is None or isinstance(value, str):
+            return value
+        return json.dumps(value, ensure_ascii=False)
+
+    def _plan_call(self):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.failure_rate and self._random.random() < self.failure_rate
+        return delay, fail
+
+    def _response(self, system_prompt, content):
+        recorded = self._recorded(prompt_digest(system_prompt, content))
+        if recorded is not None:
+            return recorded
+        return json.dumps(self.responder(system_prompt, content), ensure_ascii=False)
+
+    def generate(self, system_prompt, content):
+        delay, fail = self._plan_call()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise LLMBackendError("Simulated LLM failure")
+        return self._response(system_prompt, content)
+
+    def stream(self, system_prompt, content):
+        delay, fail = self._plan_call()
+        if fail:
+            raise LLMBackendError("Simulated LLM failure")
+        text = self._response(system_prompt, content)
+        n_chunks = max(1, -(-len(text) // self.chunk_size))
+        for start in range(0, len(text), self.chunk_size):
+            if delay:
+                time.sleep(delay / n_chunks)
+            yield text[start:start + self.chunk_size]
+
+
+class RecordingBackend(LLMBackend):
+    """Wrap another backend and save each response so it can be replayed later with FakeBackend."""
+
+    def __init__(self, inner, directory):
+        self.inner = inner
+        self.directory = directory
+        self.name = inner.name
+        self.model = inner.model
+        self.config = inner.config
+        os.makedirs(directory, exist_ok=True)
+
+    def generate(self, system_prompt, content):
+        text = self.inner.generate(system_prompt, content)
+        path = os.path.join(self.directory, f"{prompt_digest(system_prompt, content)}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return text
+
+    def warm_up(self):
+        self.inner.warm_up()
+
+
+def backend_from_env(model="gemini-1.5-flash", config=None):
+    """Create the backend selected by RESUME_LLM_BACKEND (``gemini`` by default, or ``fake``).
+
+    ``model`` and ``config`` are used for the Gemini backend.
+    """
+    kind = os.getenv("RESUME_LLM_BACKEND", "gemini").lower()
+    if kind == "gemini":
+        timeout = float(os.getenv("RESUME_LLM_TIMEOUT", "60")) or None
+        return GeminiBackend(model=model, config=config, timeout=timeout)
+    if kind == "fake":
+        return FakeBackend(
+            recordings=os.getenv("RESUME_LLM_RECORDINGS") or None,
+            latency=float(os.getenv("RESUME_FAKE_LLM_LATENCY", "0")),
+            failure_rate=float(os.getenv("RESUME_FAKE_LLM_FAILURE_RATE", "0")),
+        )
+    raise ValueError(f"Unsupported LLM backend: {kind}")
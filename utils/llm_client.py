@@ -0,0 +1,232 @@
+"""
+Resilient client layer for LLM backends.
+
+ResilientBackend wraps any backend from utils.llm_backends and adds what a single blocking call lacks:
+- a process-wide token-bucket limit on requests and tokens per minute,
+- retries with jittered exponential backoff for rate-limit (429), server and timeout errors,
+- a per-attempt deadline,
+- hedged requests: if an attempt is slower than the hedge delay, a duplicate is sent and the first answer wins.
+
+All attempts run on one shared thread pool, so the underlying client (and its HTTP connections) is reused.
+"""
+
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from utils.llm_backends import LLMBackend, LLMBackendError
+from utils.metrics import metrics
+from utils.text_compactor import estimate_tokens
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class LLMTimeoutError(LLMBackendError):
+    """Raised when an attempt exceeds its deadline."""
+
+
+class RateLimiter:
+    """Token buckets for requests per minute and tokens per minute (0 disables a limit)."""
+
+    def __init__(self, requests_per_minute=0, tokens_per_minute=0):
+        self.rpm = requests_per_minute
+        self.tpm = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def _wait_time(self, tokens):
+        wait_s = 0.0
+        if self.rpm and self._requests < 1:
+            wait_s = max(wait_s, (1 - self._requests) * 60 / self.rpm)
+        if self.tpm and self._tokens < tokens:
+            wait_s = max(wait_s, (tokens - self._tokens) * 60 / self.tpm)
+        return wait_s
+
+    def try_acquire(self, tokens=0):
+        """Take capacity for one request of ``tokens`` tokens if available right now."""
+        with self._lock:
+            self._refill(time.monotonic())
+            tokens = min(tokens, self.tpm) if self.tpm else tokens
+            if self._wait_time(tokens) > 0:
+                return False
+            if self.rpm:
+                self._requests -= 1
+            if self.tpm:
+                self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens=0):
+        """Block until one request of ``tokens`` tokens fits in the budget; returns the seconds waited."""
+        waited = 0.0
+        tokens = min(tokens, self.tpm) if self.tpm else tokens
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                wait_s = self._wait_time(tokens)
+                if wait_s <= 0:
+                    if self.rpm:
+                        self._requests -= 1
+                    if self.tpm:
+                        self._tokens -= tokens
+                    return waited
+            time.sleep(wait_s)
+            waited += wait_s
+
+
+def is_retryable(error):
+    """True for errors worth retrying: timeouts, connection problems, rate limits and server errors."""
+    if isinstance(error, (TimeoutError, ConnectionError, LLMBackendError)):
+        return True
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return code in RETRYABLE_STATUS_CODES
+
+
+class ResilientBackend(LLMBackend):
+    """Wrap ``inner`` with rate limiting, retries, deadlines and hedging.
+
+    Parameters
+    - inner: Backend that performs the actual call
+    - limiter: Shared RateLimiter (None for no limit)
+    - max_attempts: Total attempts per call, including the first
+    - base_delay / max_delay: Backoff bounds in seconds; each retry sleeps uniformly in [0, min(max, base*2^n)]
+    - attempt_timeout: Seconds before an attempt is abandoned (None for no deadline)
+    - hedge_after: Seconds after which a duplicate request is sent (None disables hedging)
+    - max_workers: Size of the shared thread pool used for attempts
+    """
+
+    def __init__(self, inner, limiter=None, max_attempts=4, base_delay=1.0, max_delay=30.0, attempt_timeout=60.0,
+                 hedge_after=None, max_workers=32, seed=None):
+        self.inner = inner
+        self.name = inner.name
+        self.model = inner.model
+        self.config = inner.config
+        self.limiter = limiter
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempt_timeout = attempt_timeout
+        self.hedge_after = hedge_after
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+        self._random = random.Random(seed)
+
+    def _backoff(self, attempt):
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def _acquire(self, tokens):
+        if self.limiter is not None:
+            waited = self.limiter.acquire(tokens)
+            if waited:
+                metrics.observe("rate_limit_wait_seconds", waited)
+
+    def _attempt(self, system_prompt, content, tokens):
+        start = time.monotonic()
+        futures = [self._executor.submit(self.inner.generate, system_prompt, content)]
+        if self.hedge_after is not None:
+            done, _ = wait(futures, timeout=self.hedge_after)
+            # Hedges only go out when they fit in the rate budget, so they never delay other requests
+            if not done and (self.limiter is None or self.limiter.try_acquire(tokens)):
+                metrics.inc("llm_hedges_total")
+                futures.append(self._executor.submit(self.inner.generate, system_prompt, content))
+
+        error = None
+        pending = set(futures)
+        while pending:
+            remaining = None
+            if self.attempt_timeout is not None:
+                remaining = self.attempt_timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    return fut.result()
+                error = fut.exception()
+            if not done:
+                break
+        if pending:
+            metrics.inc("llm_timeouts_total")
+            raise LLMTimeoutError(f"LLM call exceeded {self.attempt_timeout}s")
+        raise error
+
+    def generate(self, system_prompt, content):
+        tokens = estimate_tokens(system_prompt) + estimate_tokens(content)
+        attempt = 0
+        while True:
+            attempt += 1
+            self._acquire(tokens)
+            try:
+                return self._attempt(system_prompt, content, tokens)
+            except Exception as e:
+                if attempt >= self.max_attempts or not is_retryable(e):
+                    raise
+                metrics.inc("llm_retries_total")
+                time.sleep(self._backoff(attempt))
+
+    def stream(self, system_prompt, content):
+        """Stream from the inner backend, retrying only failures that happen before the first chunk.
+
+        Deadlines and hedging do not apply to streams; the backend's own HTTP timeout bounds them.
+        """
+        tokens = estimate_tokens(system_prompt) + estimate_tokens(content)
+        attempt = 0
+        while True:
+            attempt += 1
+            self._acquire(tokens)
+            started = False
+            try:
+                for chunk in self.inner.stream(system_prompt, content):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started or attempt >= self.max_attempts or not is_retryable(e):
+                    raise
+                metrics.inc("llm_retries_total")
+                time.sleep(self._backoff(attempt))
+
+    def warm_up(self):
+        self.inner.warm_up()
+
+    async def agenerate(self, system_prompt, content):
+        """Async variant; runs the blocking retry loop in the event loop's default executor."""
+        import asyncio  # already loaded whenever an event loop is running
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.generate, system_prompt, content)
+
+
+def _env_float(name, default):
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def resilient_from_env(inner):
+    """Wrap ``inner`` using the RESUME_LLM_* environment settings."""
+    limiter = RateLimiter(
+        requests_per_minute=int(os.getenv("RESUME_LLM_RPM", "0")),
+        tokens_per_minute=int(os.getenv("RESUME_LLM_TPM", "0")),
+    )
+    return ResilientBackend(
+        inner,
+        limiter=limiter if (limiter.rpm or limiter.tpm) else None,
+        max_attempts=int(os.getenv("RESUME_LLM_MAX_ATTEMPTS", "4")),
+        base_delay=_env_float("RESUME_LLM_BACKOFF_BASE", 1.0),
+        max_delay=_env_float("RESUME_LLM_BACKOFF_MAX", 30.0),
+        attempt_timeout=_env_float("RESUME_LLM_TIMEOUT", 60.0) or None,
+        hedge_after=_env_float("RESUME_LLM_HEDGE_AFTER", 0.0) or None,
+    )
@@ -0,0 +1,159 @@
+"""
+Lightweight in-process metrics for the resume pipeline.
+
+Timers (spans) and counters are kept in a thread-safe registry that can be queried with snapshot(), rendered in
+Prometheus text format, or served over HTTP (on the loopback interface unless RESUME_METRICS_HOST says otherwise).
+Every span is also emitted as a structured JSON log record on the ``resume_formatter.metrics`` logger, so slow
+conversions can be traced to extraction, the LLM or rendering.
+"""
+
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger("resume_formatter.metrics")
+
+# Number of recent observations kept per timer for percentile estimates
+RESERVOIR_SIZE = 2048
+# The metrics endpoint has no authentication; set e.g. "0.0.0.0" to let a scraper on another host reach it
+DEFAULT_METRICS_HOST = os.getenv("RESUME_METRICS_HOST", "127.0.0.1")
+
+
+class _Timer:
+    __slots__ = ("count", "total", "max", "recent")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def quantile(self, q):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._timers = {}
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name, seconds, **fields):
+        """Record one duration for timer ``name`` and log it as a structured event."""
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = _Timer()
+            timer.observe(seconds)
+        if logger.isEnabledFor(logging.INFO):
+            record = {"event": name, "duration_ms": round(seconds * 1000, 3)}
+            record.update(fields)
+            logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+    @contextmanager
+    def span(self, name, **fields):
+        """Time the enclosed block under timer ``name``; ``fields`` are added to the log record.
+
+        The record's ``status`` ("ok" or "error") is set by the span and overrides a ``status`` field.
+        """
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield fields
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, **{**fields, "status": status})
+
+    def snapshot(self):
+        """Return current counters and timer summaries as plain dicts."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "timers": {
+                    name: {
+                        "count": t.count,
+                        "sum_s": round(t.total, 6),
+                        "mean_ms": round(t.total / t.count * 1000, 3) if t.count else 0.0,
+                        "p50_ms": round(t.quantile(0.5) * 1000, 3),
+                        "p95_ms": round(t.quantile(0.95) * 1000, 3),
+                        "max_ms": round(t.max * 1000, 3),
+                    }
+                    for name, t in self._timers.items()
+                },
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+    def render_prometheus(self, prefix="resume_formatter_"):
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, value in sorted(self._counters.items()):
+                metric = f"{prefix}{name}"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+            for name, t in sorted(self._timers.items()):
+                metric = f"{prefix}{name}"
+                lines.append(f"# TYPE {metric} summary")
+                for q in (0.5, 0.95, 0.99):
+                    lines.append(f'{metric}{{quantile="{q}"}} {t.quantile(q):.6f}')
+                lines.append(f"{metric}_sum {t.total:.6f}")
+                lines.append(f"{metric}_count {t.count}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port, host=DEFAULT_METRICS_HOST, registry=metrics):
+    """Serve ``/metrics`` in Prometheus text format from a daemon thread. Safe to call more than once."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    global _server
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), Handler)
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
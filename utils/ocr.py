@@ -0,0 +1,276 @@
+"""
+OCR fallback for scanned PDFs.
+
+A page counts as scanned when its text layer has fewer than RESUME_OCR_MIN_CHARS characters but it contains
+images. The text of such pages is recognized locally with PyMuPDF's Tesseract integration, which is used only
+when Tesseract's language data can be found (an installed Tesseract, or TESSDATA_PREFIX). Pages are OCRed one
+task each, so a scanned resume is spread over the worker processes: utils.pipeline.process_batch submits them to
+its own process pool, and other callers use a process-wide pool of RESUME_OCR_WORKERS processes. Daemonic
+processes (the job workers started by worker.py) cannot start children, so they OCR pages inline; their jobs
+already run in parallel across worker processes and threads.
+
+Recognized text is cached in SQLite (RESUME_OCR_CACHE_PATH) under a hash of the page's content and image
+streams, so the same scan is only OCRed once. Set RESUME_OCR=0 to disable the fallback.
+"""
+
+
+import hashlib
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from utils.data_parser import PDF_MAX_CHARS, PDF_MAX_PAGES, open_pdf
+from utils.metrics import metrics
+from utils.spool import temporary_copy
+
+logger = logging.getLogger(__name__)
+
+OCR_ENABLED = os.getenv("RESUME_OCR", "1") != "0"
+OCR_MIN_CHARS = int(os.getenv("RESUME_OCR_MIN_CHARS", "50"))
+OCR_LANGUAGE = os.getenv("RESUME_OCR_LANGUAGE", "eng")
+OCR_DPI = int(os.getenv("RESUME_OCR_DPI", "300"))
+OCR_WORKERS = int(os.getenv("RESUME_OCR_WORKERS", "0")) or None
+DEFAULT_OCR_CACHE_PATH = os.getenv("RESUME_OCR_CACHE_PATH", os.path.join(".cache", "ocr_cache.sqlite3"))
+DEFAULT_OCR_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_OCR_CACHE_MAX_ENTRIES", "50000"))
+
+
+@lru_cache(maxsize=None)
+def tessdata():
+    """Tesseract language data directory for PyMuPDF, or None when OCR is not available."""
+    import fitz  # PyMuPDF
+
+    try:
+        return fitz.get_tessdata()
+    except AttributeError:
+        # PyMuPDF < 1.24 only looks at the environment
+        return os.getenv("TESSDATA_PREFIX")
+    except RuntimeError:
+        return None
+
+
+def ocr_available():
+    return OCR_ENABLED and tessdata() is not None
+
+
+def page_hash(doc, page):
+    """Cache key of one page: its content and image streams plus the OCR settings."""
+    digest = hashlib.sha256(f"{OCR_LANGUAGE}:{OCR_DPI}:{page.rotation}:{tuple(page.rect)}".encode("utf-8"))
+    for xref in page.get_contents():
+        digest.update(doc.xref_stream_raw(xref))
+    for image in page.get_images(full=True):
+        digest.update(doc.xref_stream_raw(image[0]) or b"")
+    return digest.hexdigest()
+
+
+class OcrCache:
+    """SQLite map from page hash to recognized text; safe to share between threads and processes."""
+
+    def __init__(self, path=DEFAULT_OCR_CACHE_PATH, max_entries=DEFAULT_OCR_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_pages ("
+            " key TEXT PRIMARY KEY,"
+            " text TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ocr_pages_created ON ocr_pages(created_at)")
+        self._conn.commit()
+
+    def get(self, key):
+        """Return the cached text for ``key`` or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM ocr_pages WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, text):
+        """Store the text of one page, dropping the oldest entries beyond ``max_entries``."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr_pages (key, text, created_at) VALUES (?, ?, ?)",
+                (key, text, time.time()),
+            )
+            overflow = self._conn.execute("SELECT COUNT(*) FROM ocr_pages").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM ocr_pages WHERE key IN"
+                    " (SELECT key FROM ocr_pages ORDER BY created_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ocr_pages").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache = None
+_default_pool = None
+_default_lock = threading.Lock()
+
+
+def get_default_ocr_cache():
+    """Return the process-wide OcrCache, creating it on first use."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = OcrCache()
+        return _default_cache
+
+
+def get_default_ocr_pool():
+    """Process pool for OCR outside process_batch, started on first use; None inside daemonic processes."""
+    global _default_pool
+    if multiprocessing.current_process().daemon:
+        return None
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = ProcessPoolExecutor(max_workers=OCR_WORKERS)
+        return _default_pool
+
+
+@dataclass
+class ScannedPdf:
+    """Text of a PDF's pages, with the scanned pages still waiting for OCR."""
+
+    texts: list = field(default_factory=list)
+    # page number -> page hash of each scanned page without a cached result
+    pending: dict = field(default_factory=dict)
+    max_chars: int = PDF_MAX_CHARS
+
+    def fill(self, page_no, text):
+        self.texts[page_no] = text
+        self.pending.pop(page_no, None)
+
+    def pages(self):
+        """The page texts, cut at ``max_chars`` like utils.data_parser.iter_pdf_pages."""
+        parts = []
+        remaining = self.max_chars or None
+        for text in self.texts:
+            if remaining is not None:
+                if len(text) >= remaining:
+                    parts.append(text[:remaining])
+                    break
+                remaining -= len(text)
+            parts.append(text)
+        return parts
+
+    def text(self):
+        return "\n".join(self.pages())
+
+
+_warned_unavailable = False
+
+
+def scan_pdf(source, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, use_cache=True):
+    """Read the text layer of a PDF and find the scanned pages that need OCR.
+
+    Scanned pages whose text is cached are filled in right away. Reading stops at ``max_pages`` pages, or once
+    the text layer alone exceeds ``max_chars``.
+
+    Parameters
+    - source: Raw PDF bytes, or a path to the PDF
+    - max_pages / max_chars: Extraction budget, see utils.data_parser.iter_pdf_pages (0 = no limit)
+    - use_cache: Look up scanned pages in the OCR cache
+
+    Returns
+    - ScannedPdf: ``pending`` is empty when nothing is left to recognize (or OCR is not available)
+    """
+    global _warned_unavailable
+    scan = ScannedPdf(max_chars=max_chars)
+    available = ocr_available()
+    cache = get_default_ocr_cache() if available and use_cache else None
+    chars = 0
+    with open_pdf(source) as doc:
+        for page_no, page in enumerate(doc):
+            if (max_pages and page_no >= max_pages) or (max_chars and chars >= max_chars):
+                break
+            text = page.get_text("text")
+            if len(text.strip()) < OCR_MIN_CHARS and page.get_images():
+                metrics.inc("ocr_scanned_pages_total")
+                if not available:
+                    if not _warned_unavailable:
+                        _warned_unavailable = True
+                        logger.warning("Scanned PDF page found but OCR is not available (install Tesseract or "
+                                       "set TESSDATA_PREFIX)")
+                else:
+                    key = page_hash(doc, page)
+                    cached = cache.get(key) if cache is not None else None
+                    if cached is None:
+                        scan.pending[page_no] = key
+                    else:
+                        metrics.inc("ocr_cache_hits_total")
+                        text = cached
+            chars += len(text)
+            scan.texts.append(text)
+    return scan
+
+
+def ocr_page(source, page_no, key=None):
+    """Recognize the text of one PDF page; runs in a worker process.
+
+    Parameters
+    - source: Raw PDF bytes, or a path to the PDF
+    - page_no: Zero-based page number
+    - key: Page hash from scan_pdf; the result is cached under it when given
+
+    Returns
+    - str: The page text
+    """
+    with open_pdf(source) as doc:
+        page = doc[page_no]
+        textpage = page.get_textpage_ocr(language=OCR_LANGUAGE, dpi=OCR_DPI, full=True, tessdata=tessdata())
+        text = page.get_text("text", textpage=textpage)
+    if key is not None:
+        get_default_ocr_cache().set(key, text)
+    return text
+
+
+def spool_pdf(source, stack):
+    """A path for ``source`` that stays valid until ``stack`` closes, so OCR tasks do not each pickle the bytes."""
+    if not isinstance(source, (bytes, bytearray, memoryview)):
+        return source
+    return stack.enter_context(temporary_copy(lambda out: out.write(source), ".pdf"))
+
+
+def recognize(source, scan, executor=None):
+    """OCR the pending pages of ``scan`` in place, one task per page.
+
+    Parameters
+    - source: The PDF ``scan`` was read from
+    - scan: ScannedPdf from scan_pdf
+    - executor: Executor for the pages; None uses the process-wide OCR pool, or runs the pages inline for a single
+      page or inside a daemonic process
+    """
+    if not scan.pending:
+        return scan
+    pages = sorted(scan.pending.items())
+    if executor is None and len(pages) > 1:
+        executor = get_default_ocr_pool()
+    with metrics.span("ocr_seconds", pages=len(pages)), ExitStack() as stack:
+        if executor is None:
+            texts = [ocr_page(source, *page) for page in pages]
+        else:
+            path = spool_pdf(source, stack)
+            texts = list(executor.map(ocr_page, [path] * len(pages), *zip(*pages)))
+    for (page_no, _), text in zip(pages, texts):
+        scan.fill(page_no, text)
+    metrics.inc("ocr_pages_total", len(pages))
+    return scan
@@ -0,0 +1,420 @@
+"""
+Batch processing engine for converting many uploaded resumes at once.
+
+Each file goes through extract -> compact -> parse_json -> validate -> render (DOCX or PDF). Extraction and rendering are
+CPU-bound and run in a process pool, while the LLM calls are network-bound and run on a bounded thread pool.
+Files move to the next stage as soon as their previous stage finishes, so a batch takes roughly as long as its slowest files.
+Inputs may be bytes or paths (utils.spool), and extraction only starts while the process memory budget allows.
+Scanned PDF pages are OCRed as separate tasks in the same process pool (utils.ocr), and files that yield no text
+fail before the LLM call.
+"""
+
+
+import os
+import time
+from collections import deque
+from contextlib import ExitStack
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from utils.data_parser import NoTextError, extract_pages_from_file
+from utils.ocr import OCR_ENABLED, ScannedPdf, ocr_page, scan_pdf, spool_pdf
+from utils.text_compactor import PROMPT_TOKEN_BUDGET, CompactionStats, compact_text
+from utils.llm import parse_json, parse_json_stream
+from utils.sectioning import parse_json_sectioned
+from utils.pre_extractor import parse_json_assisted
+from utils.schema import coerce_section, normalize_resume, validate_resume
+from utils.dedup import DEDUP_ENABLED, get_default_index, reuse_near_duplicate
+from utils.json_stream import SectionEvent
+from utils.metrics import metrics
+from utils.spool import get_default_budget, source_size
+
+DEFAULT_LLM_CONCURRENCY = int(os.getenv("RESUME_LLM_CONCURRENCY", "4"))
+# Files with less extracted text than this fail with NoTextError instead of being sent to the LLM
+MIN_TEXT_CHARS = int(os.getenv("RESUME_MIN_TEXT_CHARS", "20"))
+
+# "full": one call with the full schema prompt; "sectioned": concurrent section-level calls (utils.sectioning);
+# "rules": local pre-extraction, LLM only for low-confidence fields (utils.pre_extractor)
+PARSE_MODES = ("full", "sectioned", "rules")
+
+# "docx": python-docx (src.resume_builder); "xml": direct WordprocessingML writer (src.docx_writer), which
+# produces the same package many times faster for bulk runs
+RENDER_BACKENDS = ("docx", "xml")
+RENDER_BACKEND = os.getenv("RESUME_RENDER_BACKEND", "docx")
+
+# File formats a resume can be rendered to; "pdf" draws the same layout directly with PyMuPDF (src.pdf_builder)
+OUTPUT_FORMATS = ("docx", "pdf")
+MIME_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+}
+
+
+@dataclass
+class BatchResult:
+    index: int
+    file_name: str
+    data: dict = None
+    resume_bytes: bytes = None
+    error: Exception = None
+    compaction: CompactionStats = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.resume_bytes is not None
+
+
+def render_resume(data, backend=None, output_format="docx"):
+    """Render resume data to ``output_format`` bytes; DOCX uses ``backend`` (default RENDER_BACKEND).
+
+    Renderers are imported on first use.
+    """
+    if output_format == "pdf":
+        from src.pdf_builder import render_resume_pdf
+
+        return render_resume_pdf(data)
+    if output_format != "docx":
+        raise ValueError(f"Unknown output format {output_format!r}; expected one of {OUTPUT_FORMATS}")
+    backend = backend or RENDER_BACKEND
+    if backend == "xml":
+        from src.docx_writer import render_resume_xml
+
+        return render_resume_xml(data)
+    if backend != "docx":
+        raise ValueError(f"Unknown render backend {backend!r}; expected one of {RENDER_BACKENDS}")
+    from src.resume_builder import resume_builder
+
+    return resume_builder(data)
+
+
+def warm_up(llm=True):
+    """Pay one-off startup costs before the first file arrives.
+
+    Imports PyMuPDF and python-docx, builds the cached DOCX skeleton and PDF page templates, opens the result
+    cache and, with
+    ``llm``, creates the LLM backend and its client. Worker processes call this once at start.
+    """
+    with metrics.span("warm_up_seconds"):
+        import fitz  # noqa: F401  PyMuPDF
+        from src.pdf_builder import warm_up as warm_up_pdf
+        from src.resume_builder import new_resume_document
+        from utils.cache import get_default_cache
+        from utils.llm import get_backend
+
+        new_resume_document()
+        if RENDER_BACKEND == "xml":
+            from src.docx_writer import warm_up as warm_up_writer
+
+            warm_up_writer()
+        warm_up_pdf()
+        get_default_cache()
+        if llm:
+            get_backend().warm_up()
+
+
+def _file_ext(file_name):
+    return os.path.splitext(file_name)[1].lower().lstrip('.')
+
+
+def compact_prompt_text(text, token_budget=PROMPT_TOKEN_BUDGET):
+    """Compact extracted text (or page texts) for the LLM prompt, refusing text too short to hold a resume.
+
+    Returns
+    - tuple[str, CompactionStats]
+
+    Raises
+    - NoTextError: When the text has fewer than MIN_TEXT_CHARS non-blank characters
+    """
+    if sum(len(page.strip()) for page in ([text] if isinstance(text, str) else text)) < MIN_TEXT_CHARS:
+        metrics.inc("files_no_text_total")
+        raise NoTextError("No text could be extracted; scanned PDFs need OCR (Tesseract, see utils.ocr)")
+    return compact_text(text, token_budget=token_budget)
+
+
+def extract_prompt_text(file_bytes, ext, token_budget=PROMPT_TOKEN_BUDGET):
+    """Extract text from one file (bytes or a path) and compact it for the LLM prompt.
+
+    Returns
+    - tuple[str, CompactionStats]
+    """
+    return compact_prompt_text(extract_pages_from_file(file_bytes, ext), token_budget)
+
+
+def scan_prompt_text(file_bytes, ext, token_budget=PROMPT_TOKEN_BUDGET):
+    """First stage of process_batch: like extract_prompt_text, but scanned PDF pages are left for OCR tasks.
+
+    Returns
+    - tuple[str, CompactionStats] | tuple[ScannedPdf, None]: The latter while pages still need OCR
+    """
+    if ext != "pdf" or not OCR_ENABLED:
+        return extract_prompt_text(file_bytes, ext, token_budget)
+    scan = scan_pdf(file_bytes)
+    if scan.pending:
+        return scan, None
+    return compact_prompt_text(scan.pages(), token_budget)
+
+
+def _timed_call(fn, *args):
+    """Run ``fn`` (possibly in a worker process) and return its result with the elapsed seconds."""
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, time.perf_counter() - start
+
+
+def parse_resume(text, system_prompt, parse_mode="full", use_cache=True):
+    """Run the LLM stage for one file and return a validated, complete resume dict.
+
+    Fields the validator cannot repair are re-requested from the LLM on their own (utils.schema). With
+    ``use_cache``, near-duplicates of earlier resumes reuse their result and only re-parse the changed
+    sections (utils.dedup).
+    """
+    index = get_default_index() if use_cache and DEDUP_ENABLED else None
+    raw = reuse_near_duplicate(text, index, use_cache=use_cache) if index is not None else None
+    if raw is None:
+        if parse_mode == "sectioned":
+            raw = parse_json_sectioned(text, use_cache=use_cache)
+        elif parse_mode == "rules":
+            raw = parse_json_assisted(text, use_cache=use_cache)
+        else:
+            raw = parse_json(system_prompt, text, use_cache=use_cache)
+    data = normalize_resume(raw, text, use_cache=use_cache)
+    if index is not None:
+        index.add(text, data)
+    return data
+
+
+def process_batch(files, system_prompt, llm_concurrency=DEFAULT_LLM_CONCURRENCY, cpu_workers=None,
+                  use_cache=True, progress=None, token_budget=PROMPT_TOKEN_BUDGET, parse_mode="full",
+                  output_format="docx"):
+    """Run the full pipeline for several files concurrently.
+
+    Parameters
+    - files: Sequence of (file_name, source) tuples in upload order, where source is the file's bytes or a path
+      (paths are sent to worker processes instead of the content)
+    - system_prompt: Prompt passed to parse_json
+    - llm_concurrency: Maximum number of LLM calls in flight
+    - cpu_workers: Process pool size for extraction/rendering. None uses os.cpu_count(), 0 runs them on threads
+    - use_cache: Forwarded to parse_json
+    - token_budget: Optional prompt budget in estimated tokens, see utils.text_compactor
+    - parse_mode: One of PARSE_MODES; ``system_prompt`` is only used by "full"
+    - output_format: One of OUTPUT_FORMATS; ``resume_bytes`` of the results hold a file in this format
+    - progress: Optional callback progress(result, stage) called from the calling thread, where stage is
+      one of "extracted", "parsed", "rendered" or "failed" ("extracted" comes after OCR of scanned pages)
+
+    Returns
+    - list[BatchResult]: One result per input file, in upload order
+    """
+    if parse_mode not in PARSE_MODES:
+        raise ValueError(f"Unknown parse_mode {parse_mode!r}, expected one of {PARSE_MODES}")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {output_format!r}; expected one of {OUTPUT_FORMATS}")
+    files = list(files)
+    results = [BatchResult(index=i, file_name=name) for i, (name, _) in enumerate(files)]
+    if not files:
+        return results
+
+    def notify(result, stage):
+        if progress is not None:
+            progress(result, stage)
+
+    if cpu_workers == 0 or len(files) == 1:
+        cpu_pool = ThreadPoolExecutor(max_workers=max(1, min(len(files), os.cpu_count() or 1)))
+    else:
+        cpu_pool = ProcessPoolExecutor(max_workers=min(len(files), cpu_workers or os.cpu_count() or 1))
+    llm_pool = ThreadPoolExecutor(max_workers=max(1, llm_concurrency))
+
+    pending = {}
+    started = {}
+    # Inputs wait here until the memory budget admits them; reserved[i] is released once file i is extracted
+    budget = get_default_budget()
+    waiting = deque(range(len(files)))
+    sizes = [source_size(source) for _, source in files]
+    reserved = {}
+
+    def submit_extractions():
+        while waiting:
+            i = waiting[0]
+            if pending and not budget.try_acquire(sizes[i]):
+                return
+            if not pending:
+                budget.acquire(sizes[i])
+            waiting.popleft()
+            reserved[i] = sizes[i]
+            name, source = files[i]
+            started[i] = time.perf_counter()
+            fut = cpu_pool.submit(_timed_call, scan_prompt_text, source, _file_ext(name), token_budget)
+            pending[fut] = (i, "extracted")
+
+    # Scanned PDFs waiting for OCR: i -> [ScannedPdf, extraction seconds so far, ExitStack owning the spooled
+    # copy of the PDF]; page_of maps OCR futures to pages
+    scans = {}
+    page_of = {}
+
+    def advance_extraction(fut, i, stage, value):
+        """Turn a finished extraction or OCR task into prompt text, or return None while pages are pending."""
+        if stage == "ocr":
+            text, elapsed = value
+            scan = scans[i]
+            scan[0].fill(page_of.pop(fut), text)
+            scan[1] += elapsed
+            metrics.observe("ocr_seconds", elapsed, file=results[i].file_name)
+            if scan[0].pending:
+                return None
+            del scans[i]
+            scan[2].close()
+            return compact_prompt_text(scan[0].pages(), token_budget), scan[1]
+        (text, stats), elapsed = value
+        if not isinstance(text, ScannedPdf):
+            return (text, stats), elapsed
+        # One task per scanned page, queued behind the work already in the pool; byte inputs are spooled to a file
+        # once so the tasks send a path instead of the whole PDF each
+        scans[i] = [text, elapsed, ExitStack()]
+        path = spool_pdf(files[i][1], scans[i][2])
+        for page_no, key in text.pending.items():
+            nxt = cpu_pool.submit(_timed_call, ocr_page, path, page_no, key)
+            pending[nxt] = (i, "ocr")
+            page_of[nxt] = page_no
+        return None
+
+    try:
+        submit_extractions()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                i, stage = pending.pop(fut)
+                result = results[i]
+                if result.error is not None:
+                    # Remaining OCR pages of a file that already failed
+                    page_of.pop(fut, None)
+                    continue
+                try:
+                    value = fut.result()
+                    if stage in ("extracted", "ocr"):
+                        value = advance_extraction(fut, i, stage, value)
+                        if value is None:
+                            continue
+                        stage = "extracted"
+                except Exception as e:
+                    result.error = e
+                    if i in reserved:
+                        budget.release(reserved.pop(i))
+                    metrics.inc("files_failed_total")
+                    metrics.observe("file_seconds", time.perf_counter() - started[i], file=result.file_name,
+                                    status="failed", stage=stage)
+                    notify(result, "failed")
+                    continue
+
+                if stage == "extracted":
+                    budget.release(reserved.pop(i))
+                    (text, result.compaction), elapsed = value
+                    metrics.observe("extract_seconds", elapsed, file=result.file_name,
+                                    chars=result.compaction.chars_before)
+                    nxt = llm_pool.submit(parse_resume, text, system_prompt, parse_mode, use_cache)
+                    pending[nxt] = (i, "parsed")
+                elif stage == "parsed":
+                    result.data = value
+                    nxt = cpu_pool.submit(_timed_call, render_resume, value, None, output_format)
+                    pending[nxt] = (i, "rendered")
+                else:
+                    result.resume_bytes, elapsed = value
+                    metrics.observe("render_seconds", elapsed, file=result.file_name, size=len(result.resume_bytes))
+                    metrics.inc("files_processed_total")
+                    metrics.observe("file_seconds", time.perf_counter() - started[i], file=result.file_name,
+                                    status="ok")
+                notify(result, stage)
+            submit_extractions()
+    finally:
+        for fut in pending:
+            fut.cancel()
+        for size in reserved.values():
+            budget.release(size)
+        llm_pool.shutdown(wait=True)
+        cpu_pool.shutdown(wait=True)
+        for scan in scans.values():
+            scan[2].close()
+
+    return results
+
+
+def convert_file(file_name, file_bytes, system_prompt, parse_mode="full", use_cache=True,
+                 token_budget=PROMPT_TOKEN_BUDGET, output_format="docx"):
+    """Convert one file (bytes or a path) sequentially in the calling thread (used by the job workers).
+
+    Extraction waits for room in the process memory budget; the LLM and render stages do not hold it.
+
+    Returns
+    - BatchResult
+    """
+    result = BatchResult(index=0, file_name=file_name)
+    started = time.perf_counter()
+    try:
+        with get_default_budget().reserve(source_size(file_bytes)):
+            (text, result.compaction), elapsed = _timed_call(extract_prompt_text, file_bytes,
+                                                             _file_ext(file_name), token_budget)
+        metrics.observe("extract_seconds", elapsed, file=file_name, chars=result.compaction.chars_before)
+        result.data = parse_resume(text, system_prompt, parse_mode, use_cache)
+        result.resume_bytes, elapsed = _timed_call(render_resume, result.data, None, output_format)
+        metrics.observe("render_seconds", elapsed, file=file_name, size=len(result.resume_bytes))
+        metrics.inc("files_processed_total")
+        metrics.observe("file_seconds", time.perf_counter() - started, file=file_name, status="ok")
+    except Exception as e:
+        result.error = e
+        metrics.inc("files_failed_total")
+        metrics.observe("file_seconds", time.perf_counter() - started, file=file_name, status="failed")
+    return result
+
+
+def convert_streaming(file_name, file_bytes, system_prompt, on_section=None, use_cache=True,
+                      token_budget=PROMPT_TOKEN_BUDGET):
+    """Convert one file, rendering each section as soon as the streamed LLM output completes it.
+
+    Parameters
+    - file_name: Original file name (used for the extension)
+    - file_bytes: Raw file bytes or a path to the file
+    - system_prompt: Prompt passed to the LLM
+    - on_section: Optional callback on_section(event) for every utils.json_stream.SectionEvent
+    - use_cache: Forwarded to parse_json_stream
+    - token_budget: Optional prompt budget in estimated tokens
+
+    Returns
+    - BatchResult
+    """
+    result = BatchResult(index=0, file_name=file_name)
+    started = time.perf_counter()
+    try:
+        with get_default_budget().reserve(source_size(file_bytes)):
+            (text, result.compaction), elapsed = _timed_call(extract_prompt_text, file_bytes,
+                                                             _file_ext(file_name), token_budget)
+        metrics.observe("extract_seconds", elapsed, file=file_name, chars=result.compaction.chars_before)
+
+        from src.resume_builder import StreamingResumeBuilder
+
+        builder = StreamingResumeBuilder()
+        raw = None
+        for event in parse_json_stream(system_prompt, text, use_cache=use_cache):
+            if event.section == "__complete__":
+                raw = event.value
+                continue
+            event = SectionEvent(event.section, coerce_section(event.section, event.value, event.index),
+                                 event.index)
+            if event.index is not None and event.value is None:
+                continue
+            builder.feed(event)
+            if on_section is not None:
+                on_section(event)
+
+        _, invalid = validate_resume(raw)
+        result.data = normalize_resume(raw, text, use_cache=use_cache)
+        if invalid:
+            # Re-prompted fields may replace sections that were already rendered
+            result.resume_bytes, elapsed = _timed_call(render_resume, result.data)
+        else:
+            result.resume_bytes, elapsed = _timed_call(builder.finish, result.data)
+        metrics.observe("render_seconds", elapsed, file=file_name, size=len(result.resume_bytes))
+        metrics.inc("files_processed_total")
+        metrics.observe("file_seconds", time.perf_counter() - started, file=file_name, status="ok")
+    except Exception as e:
+        result.error = e
+        metrics.inc("files_failed_total")
+        metrics.observe("file_seconds", time.perf_counter() - started, file=file_name, status="failed")
+    return result
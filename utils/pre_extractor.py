@@ -0,0 +1,296 @@
+"""
+Deterministic rule-based pre-extraction of resume fields.
+
+Regexes and layout heuristics fill as much of the PromptHolder schema as they can, in microseconds, and give
+each top-level field a confidence in [0, 1]. parse_json_assisted then asks the LLM only for the fields below
+the confidence threshold, with a shorter prompt and only the relevant sections of the text, and skips the LLM
+entirely when every field is confident.
+"""
+
+
+import os
+import re
+
+from config.prompts import FIELD_SCHEMAS, PromptHolder
+from utils.llm import parse_json
+from utils.metrics import metrics
+from utils.sectioning import empty_resume, segment_resume
+
+CONFIDENCE_THRESHOLD = float(os.getenv("RESUME_RULES_CONFIDENCE", "0.85"))
+
+# Sections of segment_resume() that each top-level field is read from
+FIELD_SECTIONS = {
+    "name": ("header",),
+    "contact": ("header",),
+    "summary": ("header", "summary"),
+    "experience": ("experience",),
+    "education": ("education",),
+    "skills": ("skills",),
+    "certifications": ("certifications",),
+    "projects": ("projects",),
+    "awards": ("awards",),
+    "languages": ("languages",),
+}
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"(?<![\w/])\+?\d[\d\s().-]{7,}\d(?![\w/])")
+URL_RE = re.compile(r"(?:https?://|www\.)[^\s,;|()<>]+|(?:linkedin\.com|github\.com)/[^\s,;|()<>]+", re.IGNORECASE)
+# Digit runs PHONE_RE also matches that are not phone numbers: "2014 - 2018"
+YEAR_RANGE_RE = re.compile(r"\d{4}\s*[-–]\s*\d{4}")
+MIN_PHONE_DIGITS = 7
+NAME_RE = re.compile(r"^[A-Z][A-Za-z'.-]+(?:\s+[A-Z][A-Za-z'.-]*){1,3}$")
+# Document titles that often precede the name in the header
+TITLE_LINES = {"curriculum vitae", "resume", "résumé", "cv", "biodata", "bio data", "bio-data"}
+_MONTH = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})"
+DATE_RANGE_RE = re.compile(
+    rf"\(?\s*(?P<start>{_DATE})\s*(?:-|–|—|to)\s*(?P<end>{_DATE}|Present|Current|Now|Till Date|Today)\s*\)?",
+    re.IGNORECASE,
+)
+DEGREE_RE = re.compile(
+    r"\b(?:B\.?\s?Tech|M\.?\s?Tech|B\.?\s?E\b|M\.?\s?E\b|B\.?\s?Sc|M\.?\s?Sc|B\.?\s?A\b|M\.?\s?A\b|B\.?\s?Com|"
+    r"M\.?\s?Com|BCA|MCA|MBA|Ph\.?\s?D|Bachelor|Master|Diploma|Associate|B\.?S\b|M\.?S\b|Doctor)",
+    re.IGNORECASE,
+)
+# "?" is what some PDF fonts without a bullet glyph extract as
+_BULLET_PREFIX_RE = re.compile(r"^(?:[-*•▪●◦?]|\d+[.)])\s+")
+_TITLE_SPLIT_RE = re.compile(r"\s+(?:at|@)\s+|\s*\|\s*|\s+[-–—]\s+|,\s+")
+
+
+def _strip_bullet(line):
+    return _BULLET_PREFIX_RE.sub("", line).strip()
+
+
+def _is_bullet(line):
+    return bool(_BULLET_PREFIX_RE.match(line))
+
+
+def _list_items(text):
+    items = []
+    for line in text.splitlines():
+        line = _strip_bullet(line.strip())
+        if line:
+            items.append(line)
+    return items
+
+
+def find_phone(text):
+    """First PHONE_RE match with at least MIN_PHONE_DIGITS digits that is not a year range, or None."""
+    for match in PHONE_RE.finditer(text):
+        candidate = match.group(0)
+        if sum(ch.isdigit() for ch in candidate) >= MIN_PHONE_DIGITS and not YEAR_RANGE_RE.fullmatch(candidate):
+            return candidate
+    return None
+
+
+def is_title_line(line):
+    """Whether ``line`` is a document title such as "Curriculum Vitae" rather than part of the resume."""
+    return " ".join(re.sub(r"[^\w\s-]", " ", line.casefold()).split()) in TITLE_LINES
+
+
+def _extract_contact(header_lines, full_text):
+    email = EMAIL_RE.search(full_text)
+    phone = find_phone(full_text)
+    links = []
+    for url in URL_RE.findall(full_text):
+        url = url.rstrip(".,")
+        url = url if url.lower().startswith("http") else f"https://{url}"
+        if url not in links:
+            links.append(url)
+
+    location = None
+    for line in header_lines[1:4]:
+        for part in re.split(r"\s*[|•·]\s*", line):
+            part = part.strip()
+            if ("," in part and not EMAIL_RE.search(part) and not URL_RE.search(part)
+                    and not any(ch.isdigit() for ch in part) and len(part) <= 40):
+                location = part
+                break
+        if location:
+            break
+
+    contact = {
+        "email": email.group(0) if email else None,
+        "phone": " ".join(phone.split()) if phone else None,
+        "location": location,
+        "links": links,
+    }
+    # A missing email/phone is plausible but less certain than a found one
+    confidence = min(
+        0.99 if email else 0.7,
+        0.9 if phone else 0.7,
+        0.85 if location else 0.6,
+    )
+    return contact, confidence
+
+
+def _split_title_company(text):
+    parts = [p.strip(" ,|-") for p in _TITLE_SPLIT_RE.split(text, maxsplit=1) if p.strip(" ,|-")]
+    if len(parts) == 2:
+        return parts[0], parts[1]
+    return (parts[0] if parts else text.strip()), None
+
+
+def _extract_experience(text):
+    entries = []
+    unparsed = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        match = DATE_RANGE_RE.search(line)
+        if match and not _is_bullet(line):
+            title, company = _split_title_company((line[:match.start()] + line[match.end():]).strip(" ,|-–—()"))
+            entries.append({
+                "title": title,
+                "company": company,
+                "location": None,
+                "start_date": match.group("start"),
+                "end_date": match.group("end"),
+                "achievements": [],
+            })
+        elif entries and _is_bullet(line):
+            entries[-1]["achievements"].append(_strip_bullet(line))
+        else:
+            unparsed += 1
+    if not entries:
+        return [], 0.0
+    complete = all(e["company"] and e["achievements"] for e in entries)
+    # Free-form lines (wrapped bullets, descriptions, locations) mean the layout was not fully understood
+    confidence = 0.9 if complete and unparsed == 0 else 0.5
+    return entries, confidence
+
+
+def _extract_education(text):
+    entries = []
+    unparsed = 0
+    for line in _list_items(text):
+        match = DATE_RANGE_RE.search(line)
+        degree_match = DEGREE_RE.search(line)
+        if not degree_match:
+            unparsed += 1
+            continue
+        rest = (line[:match.start()] + line[match.end():]) if match else line
+        parts = [p.strip(" ,|-–—()") for p in re.split(r",\s+|\s*\|\s*|\s+[-–—]\s+", rest, maxsplit=1)]
+        entries.append({
+            "degree": parts[0] or None,
+            "institution": parts[1] if len(parts) > 1 and parts[1] else None,
+            "location": None,
+            "start_date": match.group("start") if match else None,
+            "end_date": match.group("end") if match else None,
+            "gpa": None,
+        })
+    if not entries:
+        return [], 0.0
+    confidence = 0.88 if unparsed == 0 and all(e["institution"] for e in entries) else 0.5
+    return entries, confidence
+
+
+def pre_extract(text):
+    """Fill the resume schema with local rules.
+
+    Parameters
+    - text: Extracted (ideally compacted) resume text
+
+    Returns
+    - tuple[dict, dict]: Schema-shaped data and a confidence in [0, 1] for each top-level key
+    """
+    sections = segment_resume(text)
+    header_lines = [line.strip() for line in sections.get("header", "").splitlines()
+                    if line.strip() and not is_title_line(line)]
+    # With several recognised headings, a missing section most likely means the resume has none
+    well_structured = len([name for name in sections if name != "header"]) >= 3
+    absent_confidence = 0.9 if well_structured else 0.3
+
+    data = empty_resume()
+    confidence = {}
+
+    if header_lines and NAME_RE.match(header_lines[0]):
+        data["name"] = header_lines[0]
+        confidence["name"] = 0.9
+    else:
+        data["name"] = header_lines[0] if header_lines else ""
+        confidence["name"] = 0.3
+
+    data["contact"], confidence["contact"] = _extract_contact(header_lines, text)
+
+    if "summary" in sections:
+        data["summary"] = " ".join(sections["summary"].split())
+        confidence["summary"] = 0.9
+    else:
+        # Header lines that are not name/contact details are probably an unlabeled summary
+        leftovers = [line for line in header_lines[1:]
+                     if not (EMAIL_RE.search(line) or find_phone(line) or URL_RE.search(line))
+                     and line != data["contact"]["location"]]
+        confidence["summary"] = 0.3 if leftovers else 0.85
+
+    if "experience" in sections:
+        data["experience"], confidence["experience"] = _extract_experience(sections["experience"])
+    else:
+        confidence["experience"] = 0.3
+
+    if "education" in sections:
+        data["education"], confidence["education"] = _extract_education(sections["education"])
+    else:
+        confidence["education"] = absent_confidence
+
+    if "skills" in sections:
+        # Splitting into technical/tools/soft needs judgement, so leave the final say to the LLM
+        items = [s.strip() for line in _list_items(sections["skills"]) for s in re.split(r"\s*[,;|]\s*", line)]
+        data["skills"]["technical"] = [s for s in items if s]
+        confidence["skills"] = 0.6
+    else:
+        confidence["skills"] = absent_confidence
+
+    for key in ("certifications", "awards", "languages"):
+        if key in sections:
+            data[key] = _list_items(sections[key])
+            confidence[key] = 0.88
+        else:
+            confidence[key] = absent_confidence
+
+    # Projects need free-text descriptions split out; only their absence is certain
+    confidence["projects"] = 0.0 if "projects" in sections else absent_confidence
+    return data, confidence
+
+
+def build_partial_prompt(keys):
+    """Schema prompt restricted to ``keys``."""
+    fields = "\n    ".join(FIELD_SCHEMAS[key] for key in keys)
+    return PromptHolder.PARTIAL_SCHEMA_PROMPT.format(fields=fields)
+
+
+def fields_source_text(keys, text):
+    """Return only the sections of ``text`` that the fields ``keys`` are read from.
+
+    Falls back to the whole text when one of the fields has no recognisable section.
+    """
+    sections = segment_resume(text)
+    if not all(any(name in sections for name in FIELD_SECTIONS[key]) for key in keys):
+        return text
+    parts = []
+    for name in dict.fromkeys(name for key in keys for name in FIELD_SECTIONS[key]):
+        if name in sections:
+            parts.append(sections[name] if name == "header" else f"{name.upper()}\n{sections[name]}")
+    return "\n\n".join(parts)
+
+
+def parse_json_assisted(extracted_resume_content, use_cache=True, backend=None, threshold=CONFIDENCE_THRESHOLD):
+    """Parse a resume with local rules first and the LLM only for the low-confidence fields.
+
+    Returns
+    - dict: Same shape as the STRUCTURE_SCHEMA_PROMPT output
+    """
+    data, confidence = pre_extract(extracted_resume_content)
+    missing = [key for key in FIELD_SCHEMAS if confidence.get(key, 0.0) < threshold]
+    metrics.inc("rule_fields_total", len(FIELD_SCHEMAS) - len(missing))
+    if not missing:
+        metrics.inc("llm_skipped_total")
+        return data
+
+    content = fields_source_text(missing, extracted_resume_content)
+    llm_data = parse_json(build_partial_prompt(missing), content, use_cache=use_cache, backend=backend)
+    for key in missing:
+        if key in llm_data:
+            data[key] = llm_data[key]
+    return data
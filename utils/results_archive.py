@@ -0,0 +1,100 @@
+"""
+Incremental zip archive of a batch's generated resumes.
+
+Finished DOCX/PDF files are appended to the archive one at a time as their jobs complete, so only one result is
+in memory at once. The archive lives in a SpooledTemporaryFile: small batches stay in memory and larger ones
+spill to a temporary file once RESUME_ZIP_SPOOL_BYTES is exceeded. The whole batch is then offered as a
+single download.
+"""
+
+
+import os
+import tempfile
+import zipfile
+
+DEFAULT_SPOOL_BYTES = int(os.getenv("RESUME_ZIP_SPOOL_BYTES", str(32 * 1024 * 1024)))
+
+
+def result_format(data):
+    """"pdf" or "docx", from the leading bytes of a rendered resume."""
+    return "pdf" if data[:5] == b"%PDF-" else "docx"
+
+
+def output_name(file_name, output_format="docx"):
+    """Download name for the standardized version of ``file_name``."""
+    stem = os.path.splitext(os.path.basename(file_name))[0]
+    return f"standard_{stem}.{output_format}"
+
+
+class StreamingZipWriter:
+    """Append-only zip archive backed by a spooled temporary file."""
+
+    def __init__(self, max_memory_bytes=DEFAULT_SPOOL_BYTES):
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory_bytes)
+        # DOCX files are already deflate-compressed zips and PDF streams are deflated; storing them avoids a
+        # second pointless pass
+        self._zip = zipfile.ZipFile(self._file, "w", compression=zipfile.ZIP_STORED)
+        self._names = set()
+        self.added = set()
+        self.finished = False
+
+    def add(self, name, data, key=None):
+        """Add one file, renaming it (name_2.docx, ...) if the name is taken; returns the name used."""
+        if self.finished:
+            raise RuntimeError("Archive is already finished")
+        stem, ext = os.path.splitext(name)
+        n = 1
+        while name in self._names:
+            n += 1
+            name = f"{stem}_{n}{ext}"
+        self._zip.writestr(name, data)
+        self._names.add(name)
+        self.added.add(key if key is not None else name)
+        return name
+
+    def __len__(self):
+        return len(self._names)
+
+    def finish(self):
+        """Write the central directory and return the archive as a file object positioned at the start."""
+        if not self.finished:
+            self._zip.close()
+            self.finished = True
+        self._file.seek(0)
+        return self._file
+
+    def close(self):
+        if not self.finished:
+            self._zip.close()
+            self.finished = True
+        self._file.close()
+
+
+def sync_batch_archive(queue, batch_id, writer=None, max_memory_bytes=DEFAULT_SPOOL_BYTES):
+    """Add the batch's newly finished results to ``writer`` and return it.
+
+    A new writer is created when ``writer`` is None, and the archive is rebuilt when a job finished after
+    the archive was already finished (e.g. a retried job).
+
+    Parameters
+    - queue: utils.jobs.JobQueue holding the results
+    - batch_id: Batch to archive
+    - writer: StreamingZipWriter from a previous call, or None
+
+    Returns
+    - StreamingZipWriter
+    """
+    done = queue.done_job_ids(batch_id)
+    if writer is not None and writer.finished and not writer.added.issuperset(done):
+        writer.close()
+        writer = None
+    if writer is None:
+        writer = StreamingZipWriter(max_memory_bytes)
+    for job_id in done:
+        if job_id in writer.added:
+            continue
+        row = queue.get_result(job_id)
+        if row is not None:
+            file_name, data = row
+            writer.add(output_name(file_name, result_format(data)), data, key=job_id)
+    return writer
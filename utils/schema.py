@@ -0,0 +1,349 @@
+"""
+Typed model, validation and normalization for the structured resume data.
+
+The LLM output is only loosely shaped like STRUCTURE_SCHEMA_PROMPT: ``contact`` may be null, ``skills`` a flat
+list, a list field a comma-separated string. The dataclasses below describe the schema, and one coercer
+per class is compiled from their annotations at import time. Coercion repairs the common deviations in a single
+pass and reports the top-level fields it could not repair; normalize_resume re-prompts the LLM for those fields
+only, so the renderer always receives a complete, predictable dict.
+"""
+
+
+import logging
+import re
+import typing
+from dataclasses import MISSING, asdict, dataclass, field, fields, is_dataclass
+
+from utils.llm import parse_json
+from utils.metrics import metrics
+from utils.pre_extractor import build_partial_prompt
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Contact:
+    email: typing.Optional[str] = None
+    phone: typing.Optional[str] = None
+    location: typing.Optional[str] = None
+    links: typing.List[str] = field(default_factory=list)
+
+
+@dataclass
+class ExperienceEntry:
+    title: str = ""
+    company: typing.Optional[str] = None
+    location: typing.Optional[str] = None
+    start_date: typing.Optional[str] = None
+    end_date: typing.Optional[str] = None
+    achievements: typing.List[str] = field(default_factory=list)
+
+
+@dataclass
+class EducationEntry:
+    degree: typing.Optional[str] = None
+    institution: typing.Optional[str] = None
+    location: typing.Optional[str] = None
+    start_date: typing.Optional[str] = None
+    end_date: typing.Optional[str] = None
+    gpa: typing.Optional[str] = None
+
+
+@dataclass
+class Skills:
+    technical: typing.List[str] = field(default_factory=list)
+    tools: typing.List[str] = field(default_factory=list)
+    soft: typing.List[str] = field(default_factory=list)
+
+
+@dataclass
+class Project:
+    name: str = ""
+    description: typing.Optional[str] = None
+    technologies: typing.List[str] = field(default_factory=list)
+
+
+@dataclass
+class Resume:
+    name: str = ""
+    contact: Contact = field(default_factory=Contact)
+    summary: typing.Optional[str] = None
+    experience: typing.List[ExperienceEntry] = field(default_factory=list)
+    education: typing.List[EducationEntry] = field(default_factory=list)
+    skills: Skills = field(default_factory=Skills)
+    certifications: typing.List[str] = field(default_factory=list)
+    projects: typing.List[Project] = field(default_factory=list)
+    awards: typing.List[str] = field(default_factory=list)
+    languages: typing.List[str] = field(default_factory=list)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+# Keys the LLM commonly uses instead of the schema names, per model class
+KEY_ALIASES = {
+    Resume: {"profile": "summary", "objective": "summary", "work_experience": "experience",
+             "employment": "experience", "certificates": "certifications", "honors": "awards"},
+    Contact: {"urls": "links", "mobile": "phone", "address": "location"},
+    ExperienceEntry: {"position": "title", "role": "title", "organization": "company", "employer": "company",
+                      "responsibilities": "achievements", "highlights": "achievements"},
+    EducationEntry: {"school": "institution", "university": "institution", "college": "institution"},
+    Project: {"tech_stack": "technologies", "title": "name"},
+}
+_SPLIT_RE = re.compile(r"\s*(?:\n|;|,|\|)\s*")
+_BULLET_RE = re.compile(r"^(?:[-*•▪●◦]|\d+[.)])\s+")
+_EMPTY = (None, "", [], {})
+
+
+class _Invalid(Exception):
+    """Raised by a coercer when a value cannot be repaired; ``args[0]``, if given, is a best-effort value."""
+
+
+def _coerce_str(value):
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, bool) or value is None:
+        raise _Invalid
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, list) and all(isinstance(v, (str, int, float)) for v in value):
+        return ", ".join(str(v).strip() for v in value if str(v).strip())
+    raise _Invalid
+
+
+def _required_str(value):
+    value = _coerce_str(value)
+    if not value:
+        raise _Invalid
+    return value
+
+
+def _optional_str(value):
+    if value is None:
+        return None
+    try:
+        return _coerce_str(value) or None
+    except _Invalid:
+        return None
+
+
+def _str_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        items = _SPLIT_RE.split(value)
+    elif isinstance(value, list):
+        items = value
+    elif isinstance(value, dict):
+        # e.g. {"Python": "expert"} or grouped lists; keep the textual content
+        items = []
+        for key, sub in value.items():
+            items.extend(sub if isinstance(sub, list) else [key])
+    else:
+        raise _Invalid
+    out = []
+    for item in items:
+        if isinstance(item, dict):
+            item = next((v for v in item.values() if isinstance(v, str) and v.strip()), None)
+        if item is None or isinstance(item, (list, dict)):
+            continue
+        item = _BULLET_RE.sub("", str(item).strip())
+        if item:
+            out.append(item)
+    return out
+
+
+def _links(value):
+    links = []
+    for link in _str_list(value):
+        link = link.rstrip(".,;)")
+        if "://" not in link and ("." in link and " " not in link):
+            link = f"https://{link}"
+        if link not in links:
+            links.append(link)
+    return links
+
+
+_FIELD_OVERRIDES = {
+    (Contact, "links"): _links,
+    (Resume, "name"): _required_str,
+    (ExperienceEntry, "title"): _required_str,
+}
+
+
+def _compile(cls):
+    """Build a coercer ``raw -> cls instance`` from the annotations of ``cls``; runs once per class."""
+    hints = typing.get_type_hints(cls)
+    plan = []
+    for f in fields(cls):
+        hint = hints[f.name]
+        origin = typing.get_origin(hint)
+        args = typing.get_args(hint)
+        coerce = _FIELD_OVERRIDES.get((cls, f.name))
+        if coerce is None:
+            if hint is str:
+                coerce = _coerce_str
+            elif origin is typing.Union:
+                coerce = _optional_str
+            elif origin is list and args[0] is str:
+                coerce = _str_list
+            elif origin is list:
+                coerce = _list_of(_compile(args[0]))
+            else:
+                coerce = _object(_compile(hint))
+        default = f.default_factory if f.default_factory is not MISSING else (lambda d=f.default: d)
+        plan.append((f.name, coerce, default))
+    plan = tuple(plan)
+    aliases = KEY_ALIASES.get(cls, {})
+
+    def coerce_instance(raw, invalid):
+        values = {}
+        for name, coerce, default in plan:
+            value = raw.get(name)
+            if value is None:
+                if coerce is _required_str:
+                    invalid.append(name)
+                values[name] = default()
+                continue
+            try:
+                values[name] = coerce(value)
+            except _Invalid as e:
+                invalid.append(name)
+                values[name] = e.args[0] if e.args else default()
+        return cls(**values)
+
+    def from_raw(raw, invalid=None):
+        if not isinstance(raw, dict):
+            raise _Invalid
+        for alias, name in aliases.items():
+            if raw.get(name) is None and raw.get(alias) is not None:
+                raw = {**raw, name: raw[alias]}
+        return coerce_instance(raw, invalid if invalid is not None else [])
+
+    from_raw.plan = {name: (coerce, default) for name, coerce, default in plan}
+    return from_raw
+
+
+def _list_of(item_coercer):
+    def coerce(value):
+        if isinstance(value, dict):
+            value = [value]
+        if not isinstance(value, list):
+            raise _Invalid
+        items = []
+        broken = False
+        for item in value:
+            if item in _EMPTY:
+                continue
+            invalid = []
+            try:
+                item = item_coercer(item, invalid)
+            except _Invalid:
+                broken = True
+                continue
+            # A missing required sub-field (e.g. an experience title) flags the field for the re-prompt, but the
+            # item keeps its other data (title "") rather than losing the company, dates and bullets
+            if invalid:
+                broken = True
+            items.append(item)
+        if broken:
+            # Keep the good items in case the re-prompt does not help
+            raise _Invalid(items)
+        return items
+    return coerce
+
+
+def _object(coercer):
+    def coerce(value):
+        if isinstance(value, (list, str)):
+            # A flat skills list, the most common deviation
+            value = {"technical": value}
+        invalid = []
+        instance = coercer(value, invalid)
+        if invalid:
+            raise _Invalid(instance)
+        return instance
+    return coerce
+
+
+_coerce_resume = _compile(Resume)
+
+
+def _plain(value):
+    if is_dataclass(value):
+        return asdict(value)
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def validate_resume(raw):
+    """Coerce LLM output into a Resume, repairing what can be repaired.
+
+    Parameters
+    - raw: Parsed JSON from the LLM (normally a dict)
+
+    Returns
+    - tuple[Resume, list[str]]: The resume (unrepairable fields set to their empty value) and the names of
+      the top-level fields that were invalid
+    """
+    invalid = []
+    try:
+        resume = _coerce_resume(raw, invalid)
+    except _Invalid:
+        return Resume(), [f.name for f in fields(Resume)]
+    return resume, invalid
+
+
+def coerce_section(section, value, index=None):
+    """Repair one top-level field (or one item of a list field when ``index`` is set) of a streamed resume.
+
+    Unknown sections are returned unchanged; unrepairable values become the field's empty value (None for
+    an item that is not an object). Items missing a required sub-field keep it empty.
+    """
+    section = KEY_ALIASES[Resume].get(section, section)
+    entry = _coerce_resume.plan.get(section)
+    if entry is None:
+        return value
+    coerce, default = entry
+    try:
+        if index is not None:
+            items = coerce([value])
+            return _plain(items[0]) if items else None
+        return _plain(coerce(value) if value is not None else default())
+    except _Invalid as e:
+        if index is not None:
+            items = e.args[0] if e.args else []
+            return _plain(items[0]) if items else None
+        return _plain(e.args[0] if e.args else default())
+
+
+def normalize_resume(raw, extracted_resume_content=None, use_cache=True, backend=None):
+    """Validate ``raw`` and re-prompt the LLM once for the invalid top-level fields only.
+
+    Parameters
+    - raw: Parsed JSON from the LLM
+    - extracted_resume_content: Text the data came from; without it invalid fields are left empty
+    - use_cache / backend: Forwarded to parse_json for the re-prompt
+
+    Returns
+    - dict: Complete resume dict in the STRUCTURE_SCHEMA_PROMPT shape
+    """
+    resume, invalid = validate_resume(raw)
+    if invalid:
+        metrics.inc("schema_invalid_fields_total", len(invalid))
+        logger.info("Invalid resume fields %s", invalid)
+    if invalid and extracted_resume_content:
+        metrics.inc("schema_reprompts_total")
+        try:
+            partial = parse_json(build_partial_prompt(invalid), extracted_resume_content,
+                                 use_cache=use_cache, backend=backend)
+        except Exception:
+            logger.exception("Re-prompt for invalid fields %s failed", invalid)
+            partial = None
+        if isinstance(partial, dict):
+            fixed, still_invalid = validate_resume({**resume.to_dict(), **partial})
+            for name in invalid:
+                if name not in still_invalid:
+                    setattr(resume, name, getattr(fixed, name))
+    return resume.to_dict()
@@ -0,0 +1,145 @@
+"""
+Section-level parallel extraction for long resumes.
+
+The text is split into sections (header, experience, education, skills, projects, other lists) using heading
+heuristics. Each group is sent to the LLM with a small section-specific prompt, all groups concurrently, and the
+partial answers are merged back into the STRUCTURE_SCHEMA_PROMPT shape. Output length per call shrinks, so
+latency is bounded by the largest section instead of the whole document.
+"""
+
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from config.prompts import PromptHolder
+from utils.llm import parse_json
+
+# Below this many characters a single full-schema call is cheaper than fanning out
+SECTIONED_MIN_CHARS = int(os.getenv("RESUME_SECTIONED_MIN_CHARS", "6000"))
+
+SECTION_ALIASES = {
+    "summary": ("summary", "profile", "professional summary", "career summary", "objective", "career objective",
+                "about me", "profile summary"),
+    "experience": ("experience", "work experience", "professional experience", "employment history",
+                   "work history", "career history", "employment", "relevant experience"),
+    "education": ("education", "academic background", "qualifications", "academic qualifications",
+                  "educational qualifications", "education and training"),
+    "skills": ("skills", "technical skills", "core competencies", "key skills", "skills and tools",
+               "technologies", "tools", "technical expertise", "competencies"),
+    "projects": ("projects", "key projects", "personal projects", "academic projects", "selected projects"),
+    "certifications": ("certifications", "certificates", "licenses", "licenses and certifications",
+                       "certifications and training", "courses"),
+    "awards": ("awards", "honors", "honours", "achievements", "awards and honors", "accomplishments"),
+    "languages": ("languages", "language skills"),
+}
+_ALIAS_TO_SECTION = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+# Also common as per-role subheadings ("Achievements:", "Tools:"); these only start a section when the line is
+# not indented and does not appear inside an experience or projects section
+SUBHEADING_ALIASES = {"achievements", "accomplishments", "tools", "technologies"}
+_SUBHEADING_PARENTS = ("experience", "projects")
+_HEADING_CLEAN_RE = re.compile(r"[^a-z ]+")
+
+# Which prompt handles which sections; "header" covers everything before the first recognised heading
+SECTION_GROUPS = (
+    ("header", ("header", "summary"), PromptHolder.HEADER_SECTION_PROMPT),
+    ("experience", ("experience",), PromptHolder.EXPERIENCE_SECTION_PROMPT),
+    ("education", ("education",), PromptHolder.EDUCATION_SECTION_PROMPT),
+    ("skills", ("skills",), PromptHolder.SKILLS_SECTION_PROMPT),
+    ("projects", ("projects",), PromptHolder.PROJECTS_SECTION_PROMPT),
+    ("lists", ("certifications", "awards", "languages"), PromptHolder.LISTS_SECTION_PROMPT),
+)
+
+
+def empty_resume():
+    """A resume dict with every schema key set to its empty value."""
+    return {
+        "name": "",
+        "contact": {"email": None, "phone": None, "location": None, "links": []},
+        "summary": None,
+        "experience": [],
+        "education": [],
+        "skills": {"technical": [], "tools": [], "soft": []},
+        "certifications": [],
+        "projects": [],
+        "awards": [],
+        "languages": [],
+    }
+
+
+def _heading_key(line):
+    if len(line) > 40:
+        return None
+    key = _HEADING_CLEAN_RE.sub(" ", line.lower().replace("&", " and "))
+    return " ".join(key.split())
+
+
+def heading_section(line, current=None):
+    """Return the canonical section name if ``line`` looks like a section heading, else None.
+
+    ``current`` is the section the line appears in; subheadings such as "Achievements:" inside an experience
+    section, or indented, are not headings.
+    """
+    key = _heading_key(line.strip())
+    if key in SUBHEADING_ALIASES and (line[:1].isspace() or current in _SUBHEADING_PARENTS):
+        return None
+    return _ALIAS_TO_SECTION.get(key)
+
+
+def segment_resume(text):
+    """Split resume text into {section name: text}. Unrecognised leading text is returned as ``header``."""
+    sections = {}
+    current = "header"
+    for line in text.splitlines():
+        name = heading_section(line, current)
+        if name is not None:
+            current = name
+            continue
+        sections.setdefault(current, []).append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items() if "\n".join(lines).strip()}
+
+
+def _merge(result, partial):
+    for key, value in (partial or {}).items():
+        if key not in result or value in (None, "", [], {}):
+            continue
+        if isinstance(result[key], list) and isinstance(value, list):
+            result[key].extend(value)
+        elif isinstance(result[key], dict) and isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                if sub_value not in (None, "", []):
+                    result[key][sub_key] = sub_value
+        else:
+            result[key] = value
+
+
+def parse_json_sectioned(extracted_resume_content, use_cache=True, backend=None, max_workers=6,
+                         min_chars=SECTIONED_MIN_CHARS):
+    """Parse a resume with concurrent section-level LLM calls and merge the results.
+
+    Falls back to a single parse_json call with the full schema prompt when the text is shorter than
+    ``min_chars`` or when fewer than two sections can be recognised.
+
+    Returns
+    - dict: Same shape as the STRUCTURE_SCHEMA_PROMPT output
+    """
+    sections = segment_resume(extracted_resume_content)
+    recognised = [name for name in sections if name != "header"]
+    if len(extracted_resume_content) < min_chars or len(recognised) < 2:
+        return parse_json(PromptHolder.STRUCTURE_SCHEMA_PROMPT, extracted_resume_content,
+                          use_cache=use_cache, backend=backend)
+
+    jobs = []
+    for _, members, prompt in SECTION_GROUPS:
+        group_text = "\n\n".join(sections[m] for m in members if m in sections)
+        if group_text:
+            jobs.append((prompt, group_text))
+
+    result = empty_resume()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+        futures = [pool.submit(parse_json, prompt, group_text, use_cache=use_cache, backend=backend)
+                   for prompt, group_text in jobs]
+        # Merge in group order so the output is deterministic
+        for fut in futures:
+            _merge(result, fut.result())
+    return result
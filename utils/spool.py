@@ -0,0 +1,146 @@
+"""
+Memory-bounded handling of uploaded files.
+
+A file source in the pipeline is either raw bytes or a path on disk. Uploads larger than RESUME_SPOOL_BYTES are
+copied to a temporary file in chunks (spooled) and passed around by path, so the extractors can memory-map or
+stream them instead of holding another full copy; paths are also what gets sent to worker processes instead of
+pickled bytes.
+
+MemoryBudget bounds how many bytes of input a process works on at once (RESUME_MEMORY_BUDGET_MB). Work that
+does not fit waits until earlier files are done, while a single file larger than the budget still runs on its
+own.
+"""
+
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.metrics import metrics
+
+SPOOL_THRESHOLD_BYTES = int(os.getenv("RESUME_SPOOL_BYTES", str(1024 * 1024)))
+MEMORY_BUDGET_BYTES = int(os.getenv("RESUME_MEMORY_BUDGET_MB", "256")) * 1024 * 1024
+SPOOL_DIR = os.getenv("RESUME_SPOOL_DIR") or None
+CHUNK_SIZE = 1024 * 1024
+
+
+class MemoryBudget:
+    """Counting budget of bytes in flight, shared by the threads of one process."""
+
+    def __init__(self, limit_bytes=MEMORY_BUDGET_BYTES):
+        self.limit_bytes = limit_bytes
+        self.used_bytes = 0
+        self._cond = threading.Condition()
+
+    def _fits(self, n):
+        # Something always runs: an oversized item is admitted once nothing else holds the budget
+        return self.used_bytes == 0 or self.used_bytes + n <= self.limit_bytes
+
+    def try_acquire(self, n):
+        """Take ``n`` bytes if they fit right now; returns whether they were taken."""
+        with self._cond:
+            if not self._fits(n):
+                return False
+            self.used_bytes += n
+            return True
+
+    def acquire(self, n):
+        """Take ``n`` bytes, waiting for other holders to release enough of the budget."""
+        with self._cond:
+            if not self._fits(n):
+                start = time.perf_counter()
+                self._cond.wait_for(lambda: self._fits(n))
+                metrics.observe("memory_budget_wait_seconds", time.perf_counter() - start, bytes=n)
+            self.used_bytes += n
+
+    def release(self, n):
+        with self._cond:
+            self.used_bytes = max(0, self.used_bytes - n)
+            self._cond.notify_all()
+
+    @contextmanager
+    def reserve(self, n):
+        """Hold ``n`` bytes of the budget for the duration of the block."""
+        self.acquire(n)
+        try:
+            yield
+        finally:
+            self.release(n)
+
+
+_default_budget = None
+_default_budget_lock = threading.Lock()
+
+
+def get_default_budget():
+    """Process-wide MemoryBudget, created on first use."""
+    global _default_budget
+    with _default_budget_lock:
+        if _default_budget is None:
+            _default_budget = MemoryBudget()
+        return _default_budget
+
+
+def source_size(source):
+    """Size in bytes of a file source (bytes or a path)."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return len(source)
+    return os.path.getsize(source)
+
+
+def stream_size(fileobj):
+    """Bytes left to read in a seekable file object, or None when it cannot seek."""
+    try:
+        position = fileobj.tell()
+        size = fileobj.seek(0, os.SEEK_END) - position
+        fileobj.seek(position)
+        return size
+    except (AttributeError, OSError):
+        return None
+
+
+@contextmanager
+def temporary_copy(write, suffix=""):
+    """Create a temporary file, fill it with ``write(out)`` and yield its path; the file is deleted on exit.
+
+    Parameters
+    - write: Callable receiving the binary file object to write to
+    - suffix: File name suffix of the temporary file (e.g. ".pdf")
+    """
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=SPOOL_DIR)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            write(out)
+        metrics.inc("uploads_spooled_total")
+        yield path
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+@contextmanager
+def spooled(fileobj, suffix="", threshold=SPOOL_THRESHOLD_BYTES):
+    """Turn a readable binary file object into a file source for the pipeline.
+
+    Small files are read into bytes; larger ones (or files of unknown size) are copied to a temporary file in
+    chunks, and the block receives its path. The temporary file is deleted when the block exits.
+
+    Parameters
+    - fileobj: Readable binary file object (e.g. an upload), read from its current position
+    - suffix: File name suffix of the temporary file (e.g. ".pdf")
+    - threshold: Largest size kept in memory
+
+    Yields
+    - bytes | str: Raw bytes or the path of the spooled copy
+    """
+    size = stream_size(fileobj)
+    if size is not None and size <= threshold:
+        yield fileobj.read()
+        return
+    with temporary_copy(lambda out: shutil.copyfileobj(fileobj, out, CHUNK_SIZE), suffix) as path:
+        yield path
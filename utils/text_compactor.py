@@ -0,0 +1,208 @@
+"""
+This module shrinks extracted resume text before it is sent to the LLM.
+
+It collapses whitespace, drops page numbers and lines repeated at the top or bottom of several pages (running
+headers/footers), strips decorative glyphs and can trim low-value sections to fit a token budget. LLM latency and cost scale
+with input tokens, so every character removed here is saved on each call.
+"""
+
+
+import os
+import re
+import unicodedata
+from dataclasses import dataclass
+
+# Optional prompt budget in estimated tokens; 0 disables trimming
+PROMPT_TOKEN_BUDGET = int(os.getenv("RESUME_PROMPT_TOKEN_BUDGET", "0"))
+
+# Rough average for English prose with Gemini/GPT style tokenizers
+CHARS_PER_TOKEN = 4
+
+# Sections dropped first (in this order) when the text is over budget
+LOW_VALUE_SECTIONS = (
+    "references",
+    "declaration",
+    "personal details",
+    "personal information",
+    "personal profile",
+    "hobbies",
+    "interests",
+    "hobbies and interests",
+    "extracurricular activities",
+    "extra-curricular activities",
+)
+
+_BULLET_GLYPHS = "•◦▪▫●○■□►▶➢➤✓✔❖◆◇·‣⁃∙"
+_BULLET_RE = re.compile(f"^[{re.escape(_BULLET_GLYPHS)}]+\\s*")
+_INLINE_GLYPH_RE = re.compile(f"[{re.escape(_BULLET_GLYPHS)}]")
+_SPACE_RE = re.compile("[ \t\u00a0\u2000-\u200a\u202f\u205f\u3000]+")
+_RULE_RE = re.compile(r"^[\s_\-=~*.·|]{3,}$")
+# "Page 2", "Page 2 of 3" and "2 of 3" are dropped anywhere; a bare "2" or "2/3" only as the first or last line
+# of a page
+_PAGE_LABEL_RE = re.compile(r"^(page\s*\d{1,3}(\s*(of|/)\s*\d{1,3})?|\d{1,3}\s+of\s+\d{1,3})$", re.IGNORECASE)
+_PAGE_NUMBER_RE = re.compile(r"^\d{1,3}(\s*/\s*\d{1,3})?$")
+_HEADING_RE = re.compile(r"^[A-Za-z&/\- ]{3,40}:?$")
+
+# Running headers/footers: the same line at the same position among the first/last EDGE_LINES lines of at least
+# MIN_REPEATS_TO_DROP pages (or of every page, for shorter documents)
+EDGE_LINES = 2
+MIN_REPEATS_TO_DROP = 3
+MAX_REPEATED_LINE_CHARS = 80
+
+
+@dataclass
+class CompactionStats:
+    chars_before: int
+    chars_after: int
+    tokens_before: int
+    tokens_after: int
+    dropped_lines: int = 0
+    dropped_sections: tuple = ()
+
+    @property
+    def saved_ratio(self):
+        return 1 - self.chars_after / self.chars_before if self.chars_before else 0.0
+
+    def as_dict(self):
+        return {
+            "chars_before": self.chars_before,
+            "chars_after": self.chars_after,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "dropped_lines": self.dropped_lines,
+            "dropped_sections": list(self.dropped_sections),
+        }
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for budgeting and reporting."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _is_noise_char(ch):
+    category = unicodedata.category(ch)
+    # Control, format (zero-width), private-use (icon fonts) and unassigned code points
+    return category in ("Cc", "Cf", "Co", "Cn") and ch not in "\n\t"
+
+
+def _clean_line(line):
+    line = "".join(ch for ch in line if not _is_noise_char(ch))
+    line = _BULLET_RE.sub("- ", line.strip())
+    line = _INLINE_GLYPH_RE.sub(" ", line)
+    return _SPACE_RE.sub(" ", line).strip()
+
+
+def _section_name(line):
+    if not _HEADING_RE.match(line):
+        return None
+    return line.rstrip(":").strip().lower()
+
+
+def _split_sections(lines):
+    """Split lines into (heading, lines) chunks; the first chunk has heading None."""
+    sections = [[None, []]]
+    for line in lines:
+        name = _section_name(line)
+        if name is not None and (line.isupper() or name in LOW_VALUE_SECTIONS):
+            sections.append([name, [line]])
+        else:
+            sections[-1][1].append(line)
+    return sections
+
+
+def _fit_budget(lines, token_budget):
+    dropped = []
+    text = "\n".join(lines)
+    if estimate_tokens(text) <= token_budget:
+        return text, dropped
+
+    sections = _split_sections(lines)
+    for low_value in LOW_VALUE_SECTIONS:
+        for section in sections:
+            if section[0] == low_value and section[1]:
+                section[1] = []
+                dropped.append(low_value)
+        text = "\n".join(line for _, chunk in sections for line in chunk)
+        if estimate_tokens(text) <= token_budget:
+            return text, dropped
+
+    # Still over budget: keep the head of the document, which holds contact details and recent roles
+    limit = token_budget * CHARS_PER_TOKEN
+    cut = text.rfind("\n", 0, limit)
+    return text[:cut if cut > 0 else limit], dropped
+
+
+def _edge_positions(lines):
+    """Map the indexes of the first/last EDGE_LINES non-blank lines of a page to their position from that edge."""
+    filled = [i for i, line in enumerate(lines) if line]
+    positions = {i: ("bottom", k) for k, i in enumerate(reversed(filled[-EDGE_LINES:]))}
+    positions.update({i: ("top", k) for k, i in enumerate(filled[:EDGE_LINES])})
+    return positions
+
+
+def compact_text(text, token_budget: int = PROMPT_TOKEN_BUDGET):
+    """Normalize and compact extracted resume text for the LLM prompt.
+
+    Parameters
+    - text: Raw output of extract_text_from_file, or a list of page texts (extract_pages_from_file). Running
+      headers/footers are only recognized across pages, so plain text keeps its repeated lines
+    - token_budget: Optional maximum number of estimated tokens (0/None for no limit)
+
+    Returns
+    - tuple[str, CompactionStats]: Compacted text and before/after measurements
+    """
+    pages = [page or "" for page in text] if isinstance(text, (list, tuple)) else [text or ""]
+    original = "\n".join(pages)
+    page_lines = [[_clean_line(line) for line in unicodedata.normalize("NFKC", page).splitlines()]
+                  for page in pages]
+    edges = [_edge_positions(lines) for lines in page_lines]
+
+    # Number of pages each short line appears on at a given position from the top / bottom edge
+    edge_counts = {}
+    for lines, edge in zip(page_lines, edges):
+        for i, position in edge.items():
+            if len(lines[i]) <= MAX_REPEATED_LINE_CHARS:
+                key = (lines[i], position)
+                edge_counts[key] = edge_counts.get(key, 0) + 1
+    min_repeats = max(2, min(MIN_REPEATS_TO_DROP, len(pages)))
+
+    kept = []
+    seen_repeated = set()
+    dropped_lines = 0
+    for lines, edge in zip(page_lines, edges):
+        for i, line in enumerate(lines):
+            if not line:
+                # Keep at most one blank line as a paragraph separator
+                if kept and kept[-1]:
+                    kept.append("")
+                continue
+            position = edge.get(i)
+            page_number = position is not None and position[1] == 0 and _PAGE_NUMBER_RE.match(line)
+            if _PAGE_LABEL_RE.match(line) or _RULE_RE.match(line) or page_number:
+                dropped_lines += 1
+                continue
+            if position is not None and edge_counts.get((line, position), 0) >= min_repeats:
+                # Running header/footer: keep the first occurrence only
+                if line in seen_repeated:
+                    dropped_lines += 1
+                    continue
+                seen_repeated.add(line)
+            kept.append(line)
+    while kept and not kept[-1]:
+        kept.pop()
+
+    dropped_sections = []
+    if token_budget:
+        compacted, dropped_sections = _fit_budget(kept, token_budget)
+    else:
+        compacted = "\n".join(kept)
+
+    stats = CompactionStats(
+        chars_before=len(original),
+        chars_after=len(compacted),
+        tokens_before=estimate_tokens(original),
+        tokens_after=estimate_tokens(compacted),
+        dropped_lines=dropped_lines,
+        dropped_sections=tuple(dropped_sections),
+    )
+    return compacted, stats
@@ -1,72 +1,269 @@
 """
 This module contains utility functions for manipulating XML elements in Word documents.
 It provides functions to set cell background colors, borders, margins, and add headers and bullet points
+
+Formatting is defined once per document as named styles (character styles for runs, paragraph styles for
+bullets, a table style for bordered boxes) that the helpers reference by id instead of repeating the font,
+size and color on every run. Property fragments that do not depend on the content (shading, borders, margins,
+paragraph properties) are built once per process and deep-copied into each document.
 """
 
 
+import copy
 import json
+import threading
+import weakref
+from functools import lru_cache
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
+from docx.styles.style import StyleFactory
+from docx.text.parfmt import ParagraphFormat
 
 
 BLUE = RGBColor(0, 102, 204)
 WHITE = RGBColor(0xFF, 0xFF, 0xFF)
 BLACK = RGBColor(0, 0, 0)
 
-def set_cell_background(cell, color):
+# Style ids already defined in each document's styles part, keyed by the document part
+_defined_styles = weakref.WeakKeyDictionary()
+_defined_styles_lock = threading.Lock()
+# Fully defined <w:style> elements by style name, built once per process
+_style_templates = {}
+
+
+@lru_cache(maxsize=None)
+def _hex(color):
+    return f'{color[0]:02X}{color[1]:02X}{color[2]:02X}'
+
+
+def _style_template(name, style_type, define):
+    template = _style_templates.get(name)
+    if template is None:
+        template = OxmlElement('w:style')
+        template.type = style_type
+        template.customStyle = True
+        template.styleId = style_id(name)
+        template.name_val = name
+        define(StyleFactory(template))
+        _style_templates[name] = template
+    return template
+
+
+def _ensure_style(obj, name, style_type, define):
+    """Return the id of style ``name`` in the document of ``obj``, adding it on first use.
+
+    ``obj`` is anything attached to the document (Document, _Cell, Paragraph, ...); ``define(style)`` sets
+    the formatting of a new style and only runs the first time ``name`` is needed in this process.
+    """
+    part = obj.part
+    with _defined_styles_lock:
+        known = _defined_styles.setdefault(part, set())
+    sid = style_id(name)
+    if sid in known:
+        return sid
+    styles = part.styles.element
+    # Documents deep-copied from a skeleton already carry the skeleton's styles
+    if styles.get_by_id(sid) is None:
+        styles.append(copy.deepcopy(_style_template(name, style_type, define)))
+    with _defined_styles_lock:
+        known.add(sid)
+    return sid
+
+
+def style_id(name):
+    """Style id Word derives from a style name."""
+    return name.replace(' ', '')
+
+
+def character_style_name(font_name=None, size=None, color=None, bold=False, italic=False, underline=False):
+    parts = [font_name, f'{size:g}pt' if size else None, 'Bold' if bold else None,
+             'Italic' if italic else None, 'Underline' if underline else None, _hex(color) if color else None]
+    return ' '.join(['Resume'] + [part for part in parts if part])
+
+
+def bullet_style_name(font_name='Roboto', size=None, color=None, space_before=0, space_after=0):
+    parts = [font_name, f'{size:g}pt' if size else None, _hex(color) if color else None,
+             f'{space_before:g}-{space_after:g}']
+    return ' '.join(['Resume Bullet'] + [part for part in parts if part])
+
+
+def box_table_style_name(color=BLACK, size_pt=1):
+    return f'Resume Box {size_pt:g}pt {_hex(color)}'
+
+
+def character_style(obj, font_name=None, size=None, color=None, bold=False, italic=False, underline=False):
+    """Id of the character style with the given run formatting, defining it on first use."""
+    name = character_style_name(font_name, size, color, bold, italic, underline)
+
+    def define(style):
+        if font_name:
+            style.font.name = font_name
+        if size:
+            style.font.size = Pt(size)
+        if color:
+            style.font.color.rgb = RGBColor(*color)
+        style.font.bold = bold or None
+        style.font.italic = italic or None
+        style.font.underline = underline or None
+
+    return _ensure_style(obj, name, WD_STYLE_TYPE.CHARACTER, define)
+
+
+def bullet_style(obj, font_name='Roboto', size=None, color=None, space_before=0, space_after=0):
+    """Id of a 'List Bullet'-based paragraph style carrying the run font and the vertical spacing."""
+    name = bullet_style_name(font_name, size, color, space_before, space_after)
+
+    def define(style):
+        style.element.basedOn_val = 'ListBullet'
+        style.paragraph_format.space_before = Pt(space_before)
+        style.paragraph_format.space_after = Pt(space_after)
+        style.font.name = font_name
+        if size:
+            style.font.size = Pt(size)
+        if color:
+            style.font.color.rgb = RGBColor(*color)
+
+    return _ensure_style(obj, name, WD_STYLE_TYPE.PARAGRAPH, define)
+
+
+def box_table_style(obj, color=BLACK, size_pt=1):
+    """Id of a table style drawing a single border of ``color`` around every cell."""
+    name = box_table_style_name(color, size_pt)
+
+    def define(style):
+        style.element.basedOn_val = 'TableNormal'
+        tbl_pr = OxmlElement('w:tblPr')
+        tbl_pr.append(copy.deepcopy(_borders_fragment('w:tblBorders', _hex(color), size_pt)))
+        style.element.append(tbl_pr)
+
+    return _ensure_style(obj, name, WD_STYLE_TYPE.TABLE, define)
+
+
+@lru_cache(maxsize=None)
+def run_properties(style_id):
+    """Cached ``w:rPr`` referencing a character style; deep-copy before inserting it into a document."""
+    r = OxmlElement('w:r')
+    r.get_or_add_rPr().style = style_id
+    return r.rPr
+
+
+@lru_cache(maxsize=None)
+def paragraph_properties(style_id=None, align=None, space_before=None, space_after=None, left_indent=None,
+                          right_indent=None, first_line_indent=None):
+    """Cached ``w:pPr`` with the given formatting; deep-copy before inserting it into a document."""
+    p = OxmlElement('w:p')
+    if style_id:
+        p.style = style_id
+    fmt = ParagraphFormat(p)
+    for attr, value in (('alignment', align), ('space_before', space_before), ('space_after', space_after),
+                        ('left_indent', left_indent), ('right_indent', right_indent),
+                        ('first_line_indent', first_line_indent)):
+        if value is not None:
+            setattr(fmt, attr, value)
+    return p.pPr
+
+
+def add_styled_paragraph(parent_obj, runs=(), **paragraph_format):
+    """Add a paragraph of ``(text, character_style_id)`` runs; keyword arguments are cached paragraph properties.
+
+    Parameters
+    - parent_obj: Document or _Cell to append to
+    - runs: Iterable of (text, style_id) pairs; style_id may be None for unformatted runs
+    - paragraph_format: style_id, align, space_before, space_after, left_indent, right_indent, first_line_indent
+
+    Returns
+    - Paragraph
+    """
+    paragraph = parent_obj.add_paragraph()
+    if paragraph_format:
+        paragraph._p.insert(0, copy.deepcopy(paragraph_properties(**paragraph_format)))
+    for text, style_id in runs:
+        r = paragraph._p.add_r()
+        if style_id:
+            r.append(copy.deepcopy(run_properties(style_id)))
+        if text:
+            r.text = text
+    return paragraph
+
+
+@lru_cache(maxsize=None)
+def _shading_fragment(fill):
     shading_elm = OxmlElement('w:shd')
     shading_elm.set(qn('w:val'), 'clear')
-    shading_elm.set(qn('w:fill'), f'{color[0]:02x}{color[1]:02x}{color[2]:02x}')
-    cell._tc.get_or_add_tcPr().append(shading_elm)
+    shading_elm.set(qn('w:fill'), fill)
+    return shading_elm
 
-def set_cell_borders(cell, color, size_pt=1):
-    tc_pr = cell._tc.get_or_add_tcPr()
-    tc_borders = OxmlElement('w:tcBorders')
+
+@lru_cache(maxsize=None)
+def _borders_fragment(tag, color_hex, size_pt):
+    borders = OxmlElement(tag)
     for border_name in ('top', 'bottom', 'left', 'right'):
         border_el = OxmlElement(f'w:{border_name}')
         border_el.set(qn('w:val'), 'single')
         border_el.set(qn('w:sz'), str(int(size_pt * 8)))
-        border_el.set(qn('w:color'), f'{color[0]:02x}{color[1]:02x}{color[2]:02x}')
-        tc_borders.append(border_el)
-    tc_pr.append(tc_borders)
+        border_el.set(qn('w:color'), color_hex)
+        borders.append(border_el)
+    return borders
 
-def set_cell_margins(cell, top=0, start=0, bottom=0, end=0):
-    tcPr = cell._tc.get_or_add_tcPr()
+
+@lru_cache(maxsize=None)
+def _margins_fragment(top, start, bottom, end):
     tcMar = OxmlElement('w:tcMar')
     for m, v in [("top", top), ("start", start), ("bottom", bottom), ("end", end)]:
         mar = OxmlElement(f'w:{m}')
         mar.set(qn('w:w'), str(v * 20))
         mar.set(qn('w:type'), 'dxa')
         tcMar.append(mar)
-    tcPr.append(tcMar)
+    return tcMar
+
+
+def set_cell_background(cell, color):
+    cell._tc.get_or_add_tcPr().append(copy.deepcopy(_shading_fragment(_hex(color))))
+
+def set_cell_borders(cell, color, size_pt=1):
+    cell._tc.get_or_add_tcPr().append(copy.deepcopy(_borders_fragment('w:tcBorders', _hex(color), size_pt)))
+
+def set_cell_margins(cell, top=0, start=0, bottom=0, end=0):
+    cell._tc.get_or_add_tcPr().append(copy.deepcopy(_margins_fragment(top, start, bottom, end)))
+
+def set_table_box_style(table, color=BLACK, size_pt=1):
+    """Border every cell of ``table`` through the shared box table style."""
+    table._tbl.tblPr.style = box_table_style(table, color, size_pt)
+
+# Formatting shared by the python-docx helpers below and the direct-XML writer in src.docx_writer
+HEADER_SPACE_AFTER = Pt(2)
+BULLET_INDENT = Inches(0.75)
+EXPERIENCE_TITLE_RUN = dict(font_name='Aptos', size=11, bold=True, italic=True)
+EXPERIENCE_COMPANY_RUN = dict(font_name='Aptos', size=10, bold=True, italic=True)
+EXPERIENCE_DATE_RUN = dict(font_name='Aptos', size=11, bold=True)
+EXPERIENCE_TITLE_PARAGRAPH = dict(left_indent=Pt(0), first_line_indent=Pt(0))
+EXPERIENCE_DATE_PARAGRAPH = dict(align=WD_ALIGN_PARAGRAPH.LEFT)
+SEPARATOR_RUN = dict(size=3.5, color=WHITE, bold=True)
+SEPARATOR_PARAGRAPH = dict(align=WD_ALIGN_PARAGRAPH.CENTER, right_indent=Inches(0.1))
+
+
+def header_run_format(color, size, is_bold=True, font_name='Aptos'):
+    return dict(font_name=font_name, size=size, color=color, bold=is_bold, underline=True)
+
+def bullet_format(color=None, font_name='Roboto'):
+    return dict(font_name=font_name, color=color)
 
 def add_header(parent_obj, text, color, size, is_bold=True, align=WD_ALIGN_PARAGRAPH.LEFT, font_name='Aptos'):
-    header = parent_obj.add_paragraph()
-    run = header.add_run(text.upper())
-    run.font.color.rgb = color
-    run.font.size = Pt(size)
-    run.bold = is_bold
-    run.font.name = font_name
-    run.underline = True
-    header.alignment = align
-    header.paragraph_format.space_after = Pt(2)
-    return header
+    style_id = character_style(parent_obj, **header_run_format(color, size, is_bold, font_name))
+    return add_styled_paragraph(parent_obj, [(text.upper(), style_id)], align=align, space_after=HEADER_SPACE_AFTER)
 
 def add_bullet_points(parent_obj, items, color=None, font_name='Roboto'):
+    style_id = bullet_style(parent_obj, **bullet_format(color, font_name))
     for item in items:
-        p = parent_obj.add_paragraph(style='List Bullet')
-        run = p.add_run(item.replace('\n', ' '))
-        run.font.name = font_name
-        p.paragraph_format.space_before = Pt(0)
-        p.paragraph_format.space_after = Pt(0)
-        p.paragraph_format.left_indent = Inches(0.75)
-        if color:
-            run.font.color.rgb = color
+        add_styled_paragraph(parent_obj, [(item.replace('\n', ' '), None)], style_id=style_id,
+                             left_indent=BULLET_INDENT)
 
-def add_experience_entry(parent_obj, exp):
+def add_experience_table(parent_obj):
+    """Add the two-column title/date table of an experience entry; returns (title_cell, date_cell)."""
     exp_table = parent_obj.add_table(rows=1, cols=2)
     exp_table.autofit = True
 
@@ -74,40 +271,34 @@ def add_experience_entry(parent_obj, exp):
     date_cell = exp_table.cell(0, 1)
     title_cell.width = Inches(3.5)
     date_cell.width = Inches(2.5)
+    return title_cell, date_cell
 
-    title_p = title_cell.add_paragraph()
-    title_run = title_p.add_run(f'{exp.get("title", "")}')
-    title_p.paragraph_format.left_indent = Pt(0)
-    title_p.paragraph_format.first_line_indent = Pt(0)
-    title_run.bold = True
-    title_run.font.size = Pt(11)
-    title_run.font.name = 'Aptos'
-    title_run.italic = True
-
-    company_run = title_p.add_run(f' at {exp.get("company", "")}')
-    company_run.font.size = Pt(10)
-    company_run.font.name = 'Aptos'
-    company_run.italic = True
-    company_run.bold = True
+def add_experience_entry(parent_obj, exp):
+    title_cell, date_cell = add_experience_table(parent_obj)
+
+    title_style = character_style(parent_obj, **EXPERIENCE_TITLE_RUN)
+    company_style = character_style(parent_obj, **EXPERIENCE_COMPANY_RUN)
+    add_styled_paragraph(
+        title_cell,
+        [(f'{exp.get("title", "")}', title_style), (f' at {exp.get("company", "")}', company_style)],
+        **EXPERIENCE_TITLE_PARAGRAPH,
+    )
     # title_p.paragraph_format.space_after = Pt(0)
 
-    date_p = date_cell.add_paragraph()
-    date_run = date_p.add_run(f'({exp.get("start_date", "")} - {exp.get("end_date", "")})')
-    date_run.font.size = Pt(11)
-    date_run.font.name = 'Aptos'
-    date_run.bold = True
-    date_p.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    date_style = character_style(parent_obj, **EXPERIENCE_DATE_RUN)
+    add_styled_paragraph(
+        date_cell,
+        [(f'({exp.get("start_date", "")} - {exp.get("end_date", "")})', date_style)],
+        **EXPERIENCE_DATE_PARAGRAPH,
+    )
     # date_p.paragraph_format.space_after = Pt(0)
 
     add_bullet_points(parent_obj, exp.get("achievements", []))
     # parent_obj.add_paragraph().paragraph_format.space_after = Pt(12)
 
+def separator_text(width_ratio=3):
+    return "_" * int(40 * width_ratio)
+
 def add_sidebar_separator(cell, width_ratio=3):
-    p = cell.add_paragraph()
-    total_spaces = int(40 * width_ratio)
-    line_run = p.add_run("_" * total_spaces)
-    line_run.font.size = Pt(3.5)
-    line_run.font.color.rgb = RGBColor(255, 255, 255)
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    line_run.bold = True
-    p.paragraph_format.right_indent = Inches(0.1)
\ No newline at end of file
+    style_id = character_style(cell, **SEPARATOR_RUN)
+    return add_styled_paragraph(cell, [(separator_text(width_ratio), style_id)], **SEPARATOR_PARAGRAPH)
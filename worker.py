@@ -0,0 +1,61 @@
+"""
+Start background workers for the resume job queue.
+
+Example:
+    python worker.py --processes 4 --threads 4
+    python worker.py --queue /var/lib/resume/jobs.sqlite3 --burst
+
+The queue is a SQLite database in WAL mode, which needs shared memory between its users: the app and all workers
+must run on the same host, with the queue file on a local disk (not NFS/SMB or another network filesystem).
+"""
+
+
+import argparse
+import logging
+import multiprocessing
+import sys
+
+from utils.jobs import DEFAULT_QUEUE_PATH, run_worker
+
+
+def start_workers(path=DEFAULT_QUEUE_PATH, processes=2, threads=4, poll_interval=0.5, burst=False):
+    """Start ``processes`` daemon worker processes and return them."""
+    workers = []
+    for _ in range(processes):
+        proc = multiprocessing.Process(
+            target=run_worker,
+            kwargs={"path": path, "threads": threads, "poll_interval": poll_interval, "burst": burst},
+            daemon=True,
+        )
+        proc.start()
+        workers.append(proc)
+    return workers
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Process queued resume conversions.")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_PATH, help="Job queue database file")
+    parser.add_argument("--processes", type=int, default=multiprocessing.cpu_count(),
+                        help="Number of worker processes")
+    parser.add_argument("--threads", type=int, default=4, help="Jobs processed concurrently per process")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between polls of an empty queue")
+    parser.add_argument("--burst", action="store_true", help="Exit once the queue is empty")
+    parser.add_argument("--log-level", default="INFO")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    workers = start_workers(args.queue, max(1, args.processes), args.threads, args.poll_interval, args.burst)
+    try:
+        for proc in workers:
+            proc.join()
+    except KeyboardInterrupt:
+        for proc in workers:
+            proc.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())